@@ -1,3 +1,5 @@
+import numpy as np
+
 from typing import Optional
 from gymnasium.core import ObsType
 
@@ -22,7 +24,7 @@ class HumanPlayer(Player):
         self._turn += 1
 
         state = TicTacToeBoard(board)
-        actions = state.get_actions()
+        actions = np.flatnonzero(state.get_action_mask()).tolist()
 
         if not actions:
             # Case: There is no valid actions to take anymore
@@ -50,7 +52,7 @@ class HumanPlayer(Player):
             self._turn += 1
 
             state = TicTacToeBoard(board)
-            actions = state.get_actions()
+            actions = np.flatnonzero(state.get_action_mask()).tolist()
 
             if not actions:
                 # Case: There is no valid actions to take anymore
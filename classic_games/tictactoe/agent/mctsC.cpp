@@ -0,0 +1,369 @@
+#include "mctsC.h"
+#include <iostream>
+#include <algorithm>
+#include <cmath>
+#include <functional>
+#include <limits>
+#include <thread>
+#include <utility>
+
+MCTSC::MCTSC(int your_symbol, int enemy_symbol, int tiles_to_win, uint64_t iterations, double exploration, bool reuse_tree, size_t max_nodes, int num_threads, uint64_t seed) : remaining(0) {
+    if (iterations < 1 || max_nodes < 1 || num_threads < 1) {
+        // Case: Invalid parameters
+        std::cerr << "#ERROR_MCTS: iterations, max_nodes and num_threads should be higher or equal to 1!";
+        std::abort();
+    }
+    this->your_symbol = your_symbol;
+    this->enemy_symbol = enemy_symbol;
+    this->tiles_to_win = tiles_to_win;
+    this->iterations = iterations;
+    this->exploration = exploration;
+    this->reuse_tree = reuse_tree;
+    this->max_nodes = max_nodes;
+    this->num_threads = num_threads;
+    this->workers.resize(num_threads);
+    for (int i = 0; i < num_threads; i++) {
+        // Each thread has its own sequence of random numbers
+        this->workers[i].index = i;
+        this->workers[i].random = seed + 0x9e3779b97f4a7c15ULL * static_cast<uint64_t>(i);
+    }
+}
+
+uint64_t MCTSC::next_random(uint64_t& state) {
+    uint64_t z = (state += 0x9e3779b97f4a7c15ULL);
+    z = (z ^ (z >> 30)) * 0xbf58476d1ce4e5b9ULL;
+    z = (z ^ (z >> 27)) * 0x94d049bb133111ebULL;
+    return z ^ (z >> 31);
+}
+
+int MCTSC::random_index(Worker& worker, int n) {
+    // Multiply the upper 32 bits with n (faster than modulo and without bias for small n)
+    return static_cast<int>(((next_random(worker.random) >> 32) * static_cast<uint64_t>(n)) >> 32);
+}
+
+int MCTSC::select(Worker& worker, int node) {
+    double log_visits = std::log(static_cast<double>(worker.nodes[node].visits));
+    double best_score = -std::numeric_limits<double>::infinity();
+    int best_child = -1;
+    for (int child = worker.nodes[node].first_child; child >= 0; child = worker.nodes[child].next_sibling) {
+        const Node& current = worker.nodes[child];
+        double visits = static_cast<double>(current.visits);
+        double score = current.value / visits + this->exploration * std::sqrt(log_visits / visits);
+        if (score > best_score) {
+            // Case: Higher upper confidence bound
+            best_score = score;
+            best_child = child;
+        }
+    }
+    return best_child;
+}
+
+int MCTSC::expand(Worker& worker, TicTacToeBoardC& state, int node) {
+    // Mark the actions of all expanded children
+    for (int child = worker.nodes[node].first_child; child >= 0; child = worker.nodes[child].next_sibling) {
+        worker.expanded[worker.nodes[child].action] = 1;
+    }
+
+    // Choose a random action, that is not expanded yet
+    int* actions = worker.actions.data();
+    int count = state.get_actions(actions);
+    int index = random_index(worker, count - worker.nodes[node].num_children);
+    int action = -1;
+    for (int i = 0; i < count; i++) {
+        if (!worker.expanded[actions[i]] && index-- == 0) {
+            action = actions[i];
+            break;
+        }
+    }
+    for (int child = worker.nodes[node].first_child; child >= 0; child = worker.nodes[child].next_sibling) {
+        worker.expanded[worker.nodes[child].action] = 0;
+    }
+
+    // Add the child at the front of the list
+    Node new_node;
+    new_node.action = action;
+    new_node.next_sibling = worker.nodes[node].first_child;
+    int child = static_cast<int>(worker.nodes.size());
+    worker.nodes.push_back(new_node);
+    worker.nodes[node].first_child = child;
+    worker.nodes[node].num_children++;
+    return child;
+}
+
+float MCTSC::playout(Worker& worker, TicTacToeBoardC& state) {
+    int* actions = worker.actions.data();
+    int count = state.get_actions(actions);
+    int moves = 0;
+    while (!state.check_terminated()) {
+        bool your_turn = state.get_current_player();
+        int threats = your_turn ? state.get_immediate_winning_moves() : state.get_immediate_blocking_moves();
+        int other_threats = your_turn ? state.get_immediate_blocking_moves() : state.get_immediate_winning_moves();
+        int index = -1;
+        if (threats > 0) {
+            // Case: Current player wins with the next turn
+            for (int i = 0; i < count && index < 0; i++) {
+                index = state.is_winning_action(actions[i]) ? i : -1;
+            }
+        } else if (other_threats > 0) {
+            // Case: Current player has to block the win of the other player
+            for (int i = 0; i < count && index < 0; i++) {
+                index = state.is_blocking_action(actions[i]) ? i : -1;
+            }
+        }
+        if (index < 0) {
+            // Case: Random action
+            index = random_index(worker, count);
+        }
+
+        // Remove the action from the empty tiles (swap with the last one)
+        int action = actions[index];
+        actions[index] = actions[--count];
+        state.push(action);
+        moves++;
+    }
+
+    float reward = (state.get_reward() + 1.0f) * 0.5f;
+    for (int i = 0; i < moves; i++) {
+        state.pop();
+    }
+    return reward;
+}
+
+void MCTSC::iterate(Worker& worker, TicTacToeBoardC& state) {
+    // Selection and expansion (your player makes the turn at the root)
+    worker.path.clear();
+    worker.path.push_back(0);
+    int node = 0;
+    while (!state.check_terminated()) {
+        if (worker.nodes[node].num_children < state.num_actions()) {
+            // Case: State has actions, that are not expanded yet
+            if (worker.nodes.size() < this->max_nodes) {
+                node = this->expand(worker, state, node);
+                state.push(worker.nodes[node].action);
+                worker.path.push_back(node);
+            }
+            break;
+        }
+        node = this->select(worker, node);
+        state.push(worker.nodes[node].action);
+        worker.path.push_back(node);
+    }
+
+    // Playout (terminated states are evaluated directly)
+    float reward = state.check_terminated() ? (state.get_reward() + 1.0f) * 0.5f : this->playout(worker, state);
+
+    // Backpropagation (states at odd depths are reached with an action of your player)
+    for (size_t i = 0; i < worker.path.size(); i++) {
+        Node& current = worker.nodes[worker.path[i]];
+        current.visits++;
+        current.value += i % 2 == 1 ? reward : 1.0f - reward;
+    }
+    for (size_t i = 1; i < worker.path.size(); i++) {
+        state.pop();
+    }
+}
+
+void MCTSC::search(Worker& worker, TicTacToeBoardC state, bool time_budget) {
+    // Memory is only allocated if the size of the board changes
+    size_t tiles = static_cast<size_t>(state.row() * state.col());
+    if (worker.actions.size() != tiles) {
+        // Case: New size of the board
+        worker.actions.assign(tiles, 0);
+        worker.expanded.assign(tiles, 0);
+    }
+    if (worker.nodes.empty()) {
+        // Case: New tree
+        worker.nodes.emplace_back();
+    }
+    worker.iterations = 0;
+
+    while (this->remaining.fetch_sub(1, std::memory_order_relaxed) > 0) {
+        // The first iteration of the main thread is always done, so that there is always an action
+        bool first_iteration = worker.index == 0 && worker.iterations == 0;
+        if (time_budget && !first_iteration && worker.iterations % 16 == 0 && std::chrono::steady_clock::now() >= this->deadline) {
+            // Case: Time budget is exceeded (check the clock only every 16 iterations)
+            break;
+        }
+        this->iterate(worker, state);
+        worker.iterations++;
+    }
+}
+
+void MCTSC::reroot(Worker& worker, int root) {
+    // Copy the subtree in breadth-first order, so that the memory of other states is released
+    std::vector<Node> nodes;
+    nodes.push_back(worker.nodes[root]);
+    nodes[0].next_sibling = -1;
+    for (size_t i = 0; i < nodes.size(); i++) {
+        int old_child = nodes[i].first_child;
+        int last = -1;
+        while (old_child >= 0) {
+            Node child = worker.nodes[old_child];
+            old_child = child.next_sibling;
+            child.next_sibling = -1;
+            int index = static_cast<int>(nodes.size());
+            nodes.push_back(child);
+            if (last < 0) {
+                nodes[i].first_child = index;
+            } else {
+                nodes[last].next_sibling = index;
+            }
+            last = index;
+        }
+    }
+    worker.nodes.swap(nodes);
+}
+
+void MCTSC::update_root(const int32_t* board, int rows, int cols) {
+    int tiles = rows * cols;
+    if (!this->reuse_tree || rows != this->rows || cols != this->cols || this->root_board.empty()) {
+        // Case: Start with new trees
+        this->remove_trees();
+        this->root_board.assign(board, board + tiles);
+        this->rows = rows;
+        this->cols = cols;
+        return;
+    }
+
+    // Find the actions between the last root board and the given board
+    int your_action = -1;
+    int enemy_action = -1;
+    bool valid = true;
+    for (int tile = 0; tile < tiles && valid; tile++) {
+        if (this->root_board[tile] == board[tile]) {
+            continue;
+        } else if (this->root_board[tile] == 0 && board[tile] == this->your_symbol && your_action < 0) {
+            // Case: Action of your player
+            your_action = tile;
+        } else if (this->root_board[tile] == 0 && board[tile] == this->enemy_symbol && enemy_action < 0) {
+            // Case: Action of enemy player
+            enemy_action = tile;
+        } else {
+            valid = false;
+        }
+    }
+    if (valid && your_action < 0 && enemy_action < 0) {
+        // Case: Same board (continue the search with the same trees)
+        return;
+    }
+    if (!valid || your_action < 0 || enemy_action < 0) {
+        // Case: Board is not reached with a single action of each player
+        this->remove_trees();
+        this->root_board.assign(board, board + tiles);
+        return;
+    }
+
+    for (Worker& worker : this->workers) {
+        // Follow your action and the enemy action from the root
+        int node = worker.nodes.empty() ? -1 : 0;
+        for (int action : {your_action, enemy_action}) {
+            int child = node >= 0 ? worker.nodes[node].first_child : -1;
+            while (child >= 0 && worker.nodes[child].action != action) {
+                child = worker.nodes[child].next_sibling;
+            }
+            node = child;
+        }
+        if (node >= 0) {
+            // Case: State is in the tree
+            this->reroot(worker, node);
+        } else {
+            worker.nodes.clear();
+        }
+    }
+    this->root_board.assign(board, board + tiles);
+}
+
+int MCTSC::get_best_action(const int32_t* board, int rows, int cols, double time_budget_ms) {
+    std::lock_guard<std::mutex> lock(this->search_mutex);
+
+    TicTacToeBoardC state = TicTacToeBoardC(
+        board,
+        rows,
+        cols,
+        this->tiles_to_win,
+        this->your_symbol,
+        this->enemy_symbol,
+        true
+    );
+    this->last_iterations = 0;
+    if (state.check_terminated()) {
+        // Case: No action possible
+        return -1;
+    }
+    this->update_root(board, rows, cols);
+
+    if (time_budget_ms >= 0) {
+        // Case: Search with time budget
+        std::chrono::duration<double, std::milli> time_budget(time_budget_ms);
+        this->deadline = std::chrono::steady_clock::now() + std::chrono::duration_cast<std::chrono::steady_clock::duration>(time_budget);
+    }
+    uint64_t max_iterations = static_cast<uint64_t>(std::numeric_limits<int64_t>::max());
+    this->remaining.store(static_cast<int64_t>(std::min(this->iterations, max_iterations)));
+
+    // Start the helper threads (each thread searches on its own copy of the board)
+    std::vector<std::thread> threads;
+    for (int i = 1; i < this->num_threads; i++) {
+        threads.emplace_back(&MCTSC::search, this, std::ref(this->workers[i]), state, time_budget_ms >= 0);
+    }
+    this->search(this->workers[0], state, time_budget_ms >= 0);
+    for (std::thread& thread : threads) {
+        thread.join();
+    }
+
+    // Sum up the visits of each action at the root
+    int tiles = rows * cols;
+    std::vector<uint64_t> visits(tiles, 0);
+    for (const Worker& worker : this->workers) {
+        this->last_iterations += worker.iterations;
+        if (!worker.nodes.empty()) {
+            for (int child = worker.nodes[0].first_child; child >= 0; child = worker.nodes[child].next_sibling) {
+                visits[worker.nodes[child].action] += worker.nodes[child].visits;
+            }
+        }
+    }
+
+    // Most visited action (the first possible action, if no action was visited)
+    int best_action = -1;
+    for (int action = 0; action < tiles; action++) {
+        if (board[action] == 0 && (best_action < 0 || visits[action] > visits[best_action])) {
+            best_action = action;
+        }
+    }
+    return best_action;
+}
+
+void MCTSC::remove_trees() {
+    for (Worker& worker : this->workers) {
+        worker.nodes.clear();
+    }
+    this->root_board.clear();
+}
+
+void MCTSC::clear() {
+    std::lock_guard<std::mutex> lock(this->search_mutex);
+    this->remove_trees();
+}
+
+uint64_t MCTSC::get_iterations() {
+    return this->last_iterations;
+}
+
+uint64_t MCTSC::get_root_visits() {
+    uint64_t visits = 0;
+    for (const Worker& worker : this->workers) {
+        visits += worker.nodes.empty() ? 0 : worker.nodes[0].visits;
+    }
+    return visits;
+}
+
+size_t MCTSC::get_tree_size() {
+    size_t size = 0;
+    for (const Worker& worker : this->workers) {
+        size += worker.nodes.size();
+    }
+    return size;
+}
+
+int MCTSC::get_num_threads() {
+    return this->num_threads;
+}
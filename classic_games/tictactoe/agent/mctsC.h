@@ -0,0 +1,233 @@
+#ifndef MCTS_H
+#define MCTS_H
+
+#include "../model/boardC.h"
+#include <atomic>
+#include <chrono>
+#include <cstdint>
+#include <mutex>
+#include <vector>
+
+/**
+ * @brief Monte Carlo Tree Search with the UCT selection (upper confidence bounds applied to trees).
+ *
+ * Each iteration selects a path through the tree, expands a single new state, plays the game until the end
+ * (playout) and updates the values of all states on the path. Playouts take winning actions and block
+ * immediate wins of the other player, otherwise they choose random actions.
+ *
+ * With several threads, each thread builds its own tree (root parallelization) and the visits of all
+ * actions at the root are summed up. If the next board is reached from the last searched board with
+ * your action and one enemy action, the subtree of that state is reused (tree reuse).
+ *
+ * Thread safety: Concurrent calls of get_best_action() on the same object are serialized.
+ */
+class MCTSC {
+    private:
+        /**
+         * @brief State of the tree. Children of a state are stored as a linked list.
+         */
+        struct Node {
+            /* index of the first child (-1 if there is no child) */
+            int first_child = -1;
+            /* index of the next sibling (-1 if there is no sibling) */
+            int next_sibling = -1;
+            /* action, which leads from the parent to this state */
+            int action = -1;
+            /* number of expanded children */
+            int num_children = 0;
+            /* number of iterations through this state */
+            uint32_t visits = 0;
+            /* sum of the rewards for the player, who made the action (win 1, draw 0.5, loss 0) */
+            float value = 0.0f;
+        };
+
+        /**
+         * @brief State of the search of a single thread.
+         */
+        struct Worker {
+            /* index of the thread (0 for the main thread) */
+            int index = 0;
+            /* states of the tree (the first node is the root) */
+            std::vector<Node> nodes;
+            /* state of the random number generator */
+            uint64_t random = 0;
+            /* number of iterations of the current search */
+            uint64_t iterations = 0;
+            /* indices of the nodes on the selected path */
+            std::vector<int> path;
+            /* empty tiles during the playout */
+            std::vector<int> actions;
+            /* marks the actions of the expanded children (tiles entries) */
+            std::vector<uint8_t> expanded;
+        };
+
+        /* lock of the current search (only one search per object at the same time) */
+        std::mutex search_mutex;
+        int your_symbol;
+        int enemy_symbol;
+        int tiles_to_win;
+        /* maximal number of iterations per search (of all threads) */
+        uint64_t iterations = 1000;
+        /* weight of the exploration term of the UCT formula */
+        double exploration = 1.4;
+        /* reuse the subtree of the next state */
+        bool reuse_tree = true;
+        /* maximal number of states of the tree per thread (no expansions if the tree is full) */
+        size_t max_nodes = 1 << 22;
+        /* number of threads of the search */
+        int num_threads = 1;
+        /* search state of each thread (the first worker belongs to the main thread) */
+        std::vector<Worker> workers;
+        /* root board of the trees (empty if there are no trees) */
+        std::vector<int32_t> root_board;
+        /* number of rows of the root board */
+        int rows = 0;
+        /* number of columns of the root board */
+        int cols = 0;
+        /* number of iterations, that the threads can still take */
+        std::atomic<int64_t> remaining;
+        /* point in time, where the current search has to stop */
+        std::chrono::steady_clock::time_point deadline;
+        /* number of iterations of the last search (of all threads) */
+        uint64_t last_iterations = 0;
+
+        /**
+         * @brief Returns the next pseudo-random number of the splitmix64 generator.
+         *
+         * @param state state of the generator (updated in-place)
+         * @return uint64_t pseudo-random number
+         */
+        static uint64_t next_random(uint64_t& state);
+
+        /**
+         * @brief Returns a pseudo-random number between 0 (inclusive) and n (exclusive).
+         *
+         * @param worker search state of the current thread
+         * @param n number of possible values
+         * @return int pseudo-random number
+         */
+        static int random_index(Worker& worker, int n);
+
+        /**
+         * @brief Runs the iterations of a single thread until no iteration remains or the deadline is exceeded.
+         *
+         * @param worker search state of the current thread
+         * @param state current state (copy of the thread)
+         * @param time_budget the search has a deadline
+         */
+        void search(Worker& worker, TicTacToeBoardC state, bool time_budget);
+
+        /**
+         * @brief Runs a single iteration (selection, expansion, playout and backpropagation).
+         *
+         * @param worker search state of the current thread
+         * @param state current state (moves are done and undone in-place)
+         */
+        void iterate(Worker& worker, TicTacToeBoardC& state);
+
+        /**
+         * @brief Returns the child with the highest upper confidence bound (UCT).
+         *
+         * @param worker search state of the current thread
+         * @param node index of a fully expanded state
+         * @return int index of the selected child
+         */
+        int select(Worker& worker, int node);
+
+        /**
+         * @brief Adds a child with a random action, that is not expanded yet.
+         *
+         * @param worker search state of the current thread
+         * @param state current state of the node
+         * @param node index of the state
+         * @return int index of the new child
+         */
+        int expand(Worker& worker, TicTacToeBoardC& state, int node);
+
+        /**
+         * @brief Plays the game until the end and undoes all moves of the playout afterwards.
+         * Winning actions are taken first, then actions that block a win of the other player, otherwise random actions.
+         *
+         * @param worker search state of the current thread
+         * @param state current state
+         * @return float reward for your player (win 1, draw 0.5, loss 0)
+         */
+        float playout(Worker& worker, TicTacToeBoardC& state);
+
+        /**
+         * @brief Replaces the tree of the worker by the subtree of the given state (the given state becomes the root).
+         *
+         * @param worker search state of the current thread
+         * @param root index of the new root
+         */
+        void reroot(Worker& worker, int root);
+
+        /**
+         * @brief Moves the root of all trees to the given board, if the board is reached from the last root board
+         * with your action and one enemy action, otherwise all trees are removed.
+         *
+         * @param board contiguous (row-major) matrix of the current state
+         * @param rows number of rows of the board
+         * @param cols number of columns of the board
+         */
+        void update_root(const int32_t* board, int rows, int cols);
+
+        /**
+         * @brief Removes the trees of all threads (without the lock of the search).
+         */
+        void remove_trees();
+
+    public:
+        /**
+         * @brief Construct a new MCTSC object
+         *
+         * @param your_symbol symbol of your player
+         * @param enemy_symbol symbol of enemy player
+         * @param tiles_to_win number of tiles to place in row, column, diagonal, anti-diagonal to win the game
+         * @param iterations maximal number of iterations per search (of all threads)
+         * @param exploration weight of the exploration term of the UCT formula
+         * @param reuse_tree reuse the subtree of the next state
+         * @param max_nodes maximal number of states of the tree per thread
+         * @param num_threads number of threads of the search (1 for a single-threaded search)
+         * @param seed seed of the random number generators
+         */
+        MCTSC(int your_symbol, int enemy_symbol, int tiles_to_win, uint64_t iterations, double exploration, bool reuse_tree, size_t max_nodes, int num_threads, uint64_t seed);
+
+        /**
+         * @brief Returns the best action from the given state (the most visited action at the root).
+         * The search stops after the given number of iterations or when the time budget is exceeded.
+         *
+         * @param board contiguous (row-major) matrix of the current state, where your player makes the next turn
+         * @param rows number of rows of the board
+         * @param cols number of columns of the board
+         * @param time_budget_ms time budget in milliseconds (negative for no time budget)
+         * @return int best action with the given state (-1 if there is no action)
+         */
+        int get_best_action(const int32_t* board, int rows, int cols, double time_budget_ms);
+
+        /**
+         * @brief Removes the trees of all threads.
+         */
+        void clear();
+
+        /**
+         * @return uint64_t number of iterations of the last search of get_best_action() (of all threads)
+         */
+        uint64_t get_iterations();
+
+        /**
+         * @return uint64_t number of visits of the root after the last search (of all threads, including reused visits)
+         */
+        uint64_t get_root_visits();
+
+        /**
+         * @return size_t number of states in the trees (of all threads)
+         */
+        size_t get_tree_size();
+
+        /**
+         * @return int number of threads of the search
+         */
+        int get_num_threads();
+};
+#endif
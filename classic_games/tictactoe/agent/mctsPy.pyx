@@ -0,0 +1,122 @@
+# distutils: language = c++
+# distutils: sources = ./classic_games/tictactoe/agent/mctsC.cpp ./classic_games/tictactoe/model/boardC.cpp ./classic_games/tictactoe/model/layoutC.cpp
+
+from libc.stdint cimport int32_t, uint64_t
+from typing import Optional
+import random
+import numpy as np
+
+cdef extern from "mctsC.h" nogil:
+    cdef cppclass MCTSC:
+        MCTSC(int, int, int, uint64_t, double, bint, size_t, int, uint64_t)
+        int get_best_action(const int32_t* board, int rows, int cols, double time_budget_ms)
+        void clear()
+        uint64_t get_iterations()
+        uint64_t get_root_visits()
+        size_t get_tree_size()
+        int get_num_threads()
+
+
+cdef class MCTS:
+    """
+    Monte Carlo Tree Search (UCT), where the tree and the playouts run in C++.
+
+    The search stops after the given number of iterations or when the time budget is exceeded.
+    With several threads, each thread builds its own tree and the visits of the actions at the root
+    are summed up. With tree reuse, the subtree of the next board is kept, if the next board is reached
+    with the last best action (or any other action of your player) and a single enemy action.
+
+    Thread safety: The search runs without the GIL. Concurrent calls of get_best_action() on the same
+    instance are safe, but run one after another.
+    """
+    cdef MCTSC* obj
+    cdef bint limited
+
+    def __cinit__(self):
+        self.obj = NULL
+
+    def __init__(self, int your_symbol = 1, int enemy_symbol = -1, int tiles_to_win = 3, iterations: Optional[int] = 1000, double exploration = 1.4, bint reuse_tree = True, size_t max_nodes = 2**22, int num_threads = 1, seed: Optional[int] = None):
+        assert iterations is None or iterations >= 1, "#ERROR_MCTSPY: iterations should be higher or equal to 1!"
+        assert exploration >= 0, "#ERROR_MCTSPY: exploration should be higher or equal to 0!"
+        assert max_nodes >= 1, "#ERROR_MCTSPY: max_nodes should be higher or equal to 1!"
+        assert num_threads >= 1, "#ERROR_MCTSPY: num_threads should be higher or equal to 1!"
+        cdef uint64_t max_iterations = np.iinfo(np.uint64).max if iterations is None else iterations
+        cdef uint64_t random_seed = random.getrandbits(64) if seed is None else seed & 0xFFFFFFFFFFFFFFFF
+        del self.obj
+        self.obj = new MCTSC(your_symbol, enemy_symbol, tiles_to_win, max_iterations, exploration, reuse_tree, max_nodes, num_threads, random_seed)
+        self.limited = iterations is not None
+
+    def __dealloc__(self):
+        del self.obj
+
+    def get_best_action(self, board, time_budget_ms: Optional[float] = None) -> int:
+        """
+        Returns the most visited action at the root after the search from the given state.
+        The GIL is released during the search.
+
+        Args:
+            board (ObsType): current state
+            time_budget_ms (Optional[float]): time budget in milliseconds. Defaults to None (no time budget)
+
+        Returns:
+            int: best action with the given state (-1 if the game is already over)
+        """
+        cdef const int32_t[:, ::1] tiles = np.ascontiguousarray(board, dtype=np.int32)
+        cdef double budget = -1.0
+        cdef int action
+        if time_budget_ms is not None:
+            assert time_budget_ms >= 0, "#ERROR_MCTSPY: time_budget_ms should be higher or equal to 0!"
+            budget = time_budget_ms
+        else:
+            assert self.limited, "#ERROR_MCTSPY: time_budget_ms should be given without a limit of the iterations!"
+        with nogil:
+            action = self.obj.get_best_action(&tiles[0, 0], tiles.shape[0], tiles.shape[1], budget)
+        return action
+
+    def clear(self):
+        """
+        Removes the trees of all threads, so that the next search starts from scratch.
+        """
+        with nogil:
+            self.obj.clear()
+
+    @property
+    def iterations(self) -> int:
+        """
+        Returns the number of iterations of the last search of get_best_action() (of all threads).
+
+        Returns:
+            int: number of iterations
+        """
+        return self.obj.get_iterations()
+
+    @property
+    def root_visits(self) -> int:
+        """
+        Returns the number of visits of the root after the last search of get_best_action()
+        (of all threads). With tree reuse, it includes the visits of the previous searches.
+
+        Returns:
+            int: number of visits of the root
+        """
+        return self.obj.get_root_visits()
+
+    @property
+    def tree_size(self) -> int:
+        """
+        Returns the number of states in the trees (of all threads).
+
+        Returns:
+            int: number of states
+        """
+        return self.obj.get_tree_size()
+
+    @property
+    def num_threads(self) -> int:
+        """
+        Returns the number of threads of the search.
+
+        Returns:
+            int: number of threads
+        """
+        return self.obj.get_num_threads()
@@ -0,0 +1,82 @@
+from typing import Optional
+from gymnasium.core import ObsType
+
+from classic_games.tictactoe.agent.abstract_player import Player
+from classic_games.tictactoe.agent.mcts import MCTS
+from classic_games.tictactoe.agent.threat_search import ThreatSearch
+
+
+class MCTSPlayer(Player):
+    """
+    Represents a player which uses Monte Carlo Tree Search (UCT)
+    to decide the next action. The strength of the player scales
+    with the number of iterations (or the time budget) per move.
+    """
+
+    def __init__(
+            self,
+            your_symbol: int,
+            enemy_symbol: int,
+            tiles_to_win: int,
+            player_name: str = "MCTS Player",
+            seed: Optional[int] = None,
+            iterations: Optional[int] = 1000,
+            time_budget_ms: Optional[float] = None,
+            exploration: float = 1.4,
+            reuse_tree: bool = True,
+            num_threads: int = 1,
+            threat_search: bool = False,
+    ):
+        assert iterations is not None or time_budget_ms is not None, "#ERROR_MCTSPLAYER: iterations or time_budget_ms should be given!"
+        super().__init__(your_symbol, enemy_symbol, tiles_to_win, player_name, seed)
+        self._time_budget_ms = time_budget_ms
+        self._mctsC = MCTS(
+            your_symbol=your_symbol,
+            enemy_symbol=enemy_symbol,
+            tiles_to_win=tiles_to_win,
+            iterations=iterations,
+            exploration=exploration,
+            reuse_tree=reuse_tree,
+            num_threads=num_threads,
+            seed=seed,
+        )
+        self._threat_search = ThreatSearch(
+            your_symbol=your_symbol,
+            enemy_symbol=enemy_symbol,
+            tiles_to_win=tiles_to_win,
+        ) if threat_search else None
+
+    def reset(self, seed: Optional[int] = None):
+        super().reset(seed)
+        # Trees of the last game are not needed anymore
+        self._mctsC.clear()
+
+    def _get_action(self, board: ObsType) -> int:
+        if self._threat_search is not None:
+            # Forced wins and defenses are found without the full search
+            action = self._threat_search.get_forced_action(board)
+            if action >= 0:
+                return action
+        return self._mctsC.get_best_action(board, self._time_budget_ms)
+
+    def start(self, board: ObsType) -> int:
+        # Update turn
+        self._turn += 1
+
+        # Get the (best) action from monte carlo tree search
+        action = self._get_action(board)
+        return action
+
+    def act(self, board: ObsType) -> int:
+        if self._turn == 0:
+            return self.start(board)
+        else:
+            # Update turn
+            self._turn += 1
+
+            # Get the (best) action from monte carlo tree search
+            action = self._get_action(board)
+            return action
+
+    def end(self, board: ObsType) -> int:
+        pass
@@ -1,149 +1,479 @@
 #include "min_maxC.h"
-#include "../model/boardC.h"
 #include <iostream>
+#include <algorithm>
+#include <cmath>
+#include <functional>
+#include <thread>
 
-void MiniMaxC::reset() {
-    this->your_start = true;
-    this->depth = 0;
-    this->alpha = -std::numeric_limits<float>::infinity();
-    this->beta = std::numeric_limits<float>::infinity();
+/* priorities of the actions for the move ordering (higher priorities are searched first) */
+#define ORDER_CACHE_ACTION (int64_t(4) << 50)
+#define ORDER_WINNING_ACTION (int64_t(3) << 50)
+#define ORDER_BLOCKING_ACTION (int64_t(2) << 50)
+#define ORDER_KILLER_ACTION (int64_t(1) << 50)
+
+void MiniMaxC::init(int your_symbol, int enemy_symbol, int tiles_to_win, int max_depth, bool move_ordering, int num_threads) {
+    this->your_symbol = your_symbol;
+    this->enemy_symbol = enemy_symbol;
+    this->tiles_to_win = tiles_to_win;
+    this->max_depth = max_depth;
+    this->move_ordering = move_ordering;
+    this->num_threads = num_threads;
+    this->workers.resize(num_threads);
+    for (int i = 0; i < num_threads; i++) {
+        this->workers[i].index = i;
+    }
 }
 
-std::tuple<float, int> MiniMaxC::minimax(std::vector<std::vector<int>> board) {
-    TicTacToeBoardC state = TicTacToeBoardC(
-        board, 
-        this->tiles_to_win, 
-        this->your_symbol, 
-        this->enemy_symbol, 
-        this->your_start
-    );
+float MiniMaxC::evaluate(TicTacToeBoardC& state) {
+    // Open lines of your player count positive (weight 4^(count - 1))
+    float score = 0.0f;
+    float weight = 1.0f;
+    for (int count = 1; count < this->tiles_to_win; count++) {
+        score += weight * (state.get_your_open_lines(count) - state.get_enemy_open_lines(count));
+        weight *= 4.0f;
+    }
+    int threats = state.get_immediate_winning_moves();
+    int other_threats = state.get_immediate_blocking_moves();
+    if (!state.get_current_player()) {
+        // Case: Enemy player makes the next turn
+        score = -score;
+        std::swap(threats, other_threats);
+    }
+
+    if (threats > 0) {
+        // Case: Current player wins with the next turn
+        score += weight;
+    } else if (other_threats > 1) {
+        // Case: Current player cannot block all threats of the other player
+        score -= weight;
+    }
+
+    // Squash the score below the value of all wins and losses
+    float tiles = static_cast<float>(state.row() * state.col());
+    return (tiles - 1.0f) * score / (std::fabs(score) + weight);
+}
+
+float MiniMaxC::to_cache_value(float value, int depth, int tiles) {
+    if (value >= tiles) {
+        // Case: Win in (2 * tiles - value) plies from the root
+        return value + depth;
+    } else if (value <= -tiles) {
+        // Case: Loss in (2 * tiles + value) plies from the root
+        return value - depth;
+    }
+    return value;
+}
+
+float MiniMaxC::from_cache_value(float value, int depth, int tiles) {
+    if (value >= tiles) {
+        // Case: Win in (2 * tiles - value) plies from the state
+        return value - depth;
+    } else if (value <= -tiles) {
+        // Case: Loss in (2 * tiles + value) plies from the state
+        return value + depth;
+    }
+    return value;
+}
+
+bool MiniMaxC::is_stopped(Worker& worker) {
+    if (!worker.stopped && worker.index > 0 && this->finished.load(std::memory_order_relaxed)) {
+        // Case: Main thread does not need the helper thread anymore
+        worker.stopped = true;
+    }
+    if (!worker.stopped && worker.has_deadline && worker.nodes >= worker.next_check) {
+        // Case: Check the clock only every 1024 nodes
+        worker.stopped = std::chrono::steady_clock::now() >= this->deadline;
+        worker.next_check = worker.nodes + 1024;
+    }
+    return worker.stopped;
+}
+
+float MiniMaxC::negamax(Worker& worker, TicTacToeBoardC& state, int depth, float alpha, float beta, int& best_action) {
+    worker.nodes++;
+    worker.max_depth = std::max(worker.max_depth, depth);
+    best_action = -1;
     if (state.check_terminated()) {
         // Case: Terminated state reached
-        // Return the reward of the current state
-        float reward = state.get_reward() * (2 * (state.row() * state.col()) - this->depth);
-        return std::make_tuple(reward, -1);
-    } else if (this->depth == this->max_depth) {
+        // Return the reward of the current state (for the current player)
+        float color = state.get_current_player() ? 1.0f : -1.0f;
+        return color * state.get_reward() * (2 * (state.row() * state.col()) - depth);
+    } else if (depth == worker.depth_limit) {
         // Case: Max depth is reached
-        // Use features as rewards
-        float reward = 0.0;
-        if (this->your_start) {
-            reward = - this->depth;
-        } else {
-            reward = + this->depth;
+        // Use the features of the state as value
+        return this->evaluate(state);
+    }
+
+    // Equivalent states (under rotation and reflection) share the same entry
+    int tiles = state.row() * state.col();
+    int symmetry = 0;
+    uint64_t key = state.get_canonical_hash_key(&symmetry);
+    // Values only depend on the number of plies until the maximal depth or the end of the game
+    int draft = std::min(worker.depth_limit - depth, state.num_actions());
+
+    MiniMaxEntryC entry;
+    int cache_action = -1;
+    if (this->cache->probe(key, entry) || (this->book && this->book->probe(key, entry))) {
+        // Case: State was already evaluated (or solved in the opening book)
+        // The best action is searched first (also for other depths)
+        worker.cache_hits++;
+        cache_action = 0 <= entry.action && entry.action < tiles ? state.inverse_transform_action(entry.action, symmetry) : -1;
+        float value = from_cache_value(entry.value, depth, tiles);
+        // The root is always searched, so that the first best action is returned
+        if (depth > 0 && entry.depth == draft && (
+            entry.bound == MiniMaxBoundC::EXACT ||
+            (entry.bound == MiniMaxBoundC::LOWER && value >= beta) ||
+            (entry.bound == MiniMaxBoundC::UPPER && value <= alpha))) {
+            // Case: State was already evaluated with the same depth
+            best_action = cache_action;
+            return value;
+        }
+    }
+
+    bool root = depth == 0;
+    // The values of all actions at the root are exact, if the action values are needed
+    bool exact_root = root && worker.index == 0 && this->action_values != nullptr;
+    float best_value = -std::numeric_limits<float>::infinity();
+    float cur_alpha = alpha;
+    int child_action = -1;
+
+    int count = this->order_actions(worker, state, depth, cache_action);
+    const int* actions = &worker.actions[depth * tiles];
+    for (int i = 0; i < count; i++) {
+        int action = actions[i];
+
+        float child_alpha = alpha;
+        if (exact_root) {
+            // Case: Each action is searched with the full window
+            child_alpha = -std::numeric_limits<float>::infinity();
+        } else if (root && best_action >= 0 && action < best_action) {
+            // Case: Actions before the best action (in row-major order) also need to show equal rewards
+            child_alpha = std::nextafter(best_value, -std::numeric_limits<float>::infinity());
+        }
+
+        // Go to the successor state with the given action and back
+        state.push(action);
+        float value = -this->negamax(worker, state, depth + 1, -beta, -child_alpha, child_action);
+        state.pop();
+
+        if (this->is_stopped(worker)) {
+            // Case: Time budget is exceeded (result is incomplete)
+            return best_value;
+        }
+        if (exact_root) {
+            worker.root_values[action] = value;
+        }
+        if (value > best_value || (root && value == best_value && action < best_action)) {
+            // Case: Better action (or the same reward with an earlier action at the root)
+            best_value = value;
+            best_action = action;
         }
-        /*
-        TODO: Fix the features
-        if (this->your_start) {
-            reward = state.get_immediate_winning_moves() - state.get_immediate_blocking_moves() - this->depth;
-        } else {
-            reward = state.get_immediate_winning_moves() - state.get_immediate_blocking_moves() + this->depth;
+        if (best_value >= beta) {
+            // Case: Other player avoids this state
+            worker.cutoffs++;
+            this->update_heuristics(worker, state, depth, action);
+            break;
         }
-        */
-        return std::make_tuple(reward, -1);
-    } else if (this->your_start) {
-        // Case: Max player makes a turn
-        return this->max(board);
+        alpha = std::max(alpha, best_value);
+    }
+
+    // Safe the result in the transposition table
+    MiniMaxEntryC new_entry;
+    new_entry.value = to_cache_value(best_value, depth, tiles);
+    if (best_value <= cur_alpha) {
+        // Case: Search failed low (value is an upper bound)
+        new_entry.bound = MiniMaxBoundC::UPPER;
+    } else if (best_value >= beta) {
+        // Case: Search failed high (value is a lower bound)
+        new_entry.bound = MiniMaxBoundC::LOWER;
     } else {
-        // Case: Min player makes a turn
-        return this->min(board);
+        new_entry.bound = MiniMaxBoundC::EXACT;
     }
+    new_entry.depth = static_cast<int16_t>(draft);
+    new_entry.action = static_cast<int16_t>(best_action >= 0 ? state.transform_action(best_action, symmetry) : -1);
+    this->cache->store(key, new_entry);
+    return best_value;
 }
 
-std::tuple<float, int> MiniMaxC::max(std::vector<std::vector<int>> board) {
-    TicTacToeBoardC state = TicTacToeBoardC(
-        board, 
-        this->tiles_to_win, 
-        this->your_symbol, 
-        this->enemy_symbol, 
-        true
-    );
-    std::tuple<float, int> best_v = std::make_tuple(-std::numeric_limits<float>::infinity(), -1);
-    int cur_depth = this->depth;
-    float cur_alpha = this->alpha;
-
-    std::vector<std::vector<std::vector<int>>> successors = state.get_successors();
-    std::vector<int> actions = state.get_actions();
-    for (size_t i = 0; i < successors.size(); i++) {
-        // Get the successor state with the given action
-        std::vector<std::vector<int>> successor = successors[i];
-        int action = actions[i];
+int MiniMaxC::order_actions(Worker& worker, TicTacToeBoardC& state, int depth, int cache_action) {
+    int tiles = state.row() * state.col();
+    int* actions = &worker.actions[depth * tiles];
+    int64_t* priorities = &worker.priorities[depth * tiles];
+    int count = state.get_actions(actions);
+    if (this->move_ordering) {
+        // Case: Search the most promising actions first
+        const int* killers = &worker.killers[2 * depth];
+        const int64_t* history = &worker.history[(state.get_current_player() ? 0 : 1) * tiles];
+        for (int i = 0; i < count; i++) {
+            int action = actions[i];
+            int64_t priority = 0;
+            if (action == cache_action) {
+                // Case: Best action of the transposition table
+                priority = ORDER_CACHE_ACTION;
+            } else if (state.is_winning_action(action)) {
+                // Case: Action wins the game
+                priority = ORDER_WINNING_ACTION;
+            } else if (state.is_blocking_action(action)) {
+                // Case: Action prevents the win of the other player
+                priority = ORDER_BLOCKING_ACTION;
+            } else if (action == killers[0] || action == killers[1]) {
+                // Case: Action caused a cutoff in a sibling state
+                priority = ORDER_KILLER_ACTION + (action == killers[0]);
+            } else {
+                // Case: Actions that caused many cutoffs (history), then actions on many lines (e.g. center)
+                priority = history[action] * 64 + state.get_action_lines(action);
+            }
+
+            // Insert the action (stable, so that equal priorities stay in row-major order)
+            int j = i;
+            while (j > 0 && priorities[j - 1] < priority) {
+                actions[j] = actions[j - 1];
+                priorities[j] = priorities[j - 1];
+                j--;
+            }
+            actions[j] = action;
+            priorities[j] = priority;
+        }
+    }
+    if (depth == 0 && worker.index > 0 && count > 0) {
+        // Case: Helper threads start with different actions at the root
+        std::rotate(actions, actions + worker.index % count, actions + count);
+    }
+    return count;
+}
 
-        // Update the parameters
-        this->depth = cur_depth + 1;
-        this->your_start = false;
+void MiniMaxC::update_heuristics(Worker& worker, TicTacToeBoardC& state, int depth, int action) {
+    int tiles = state.row() * state.col();
+    int draft = std::min(worker.depth_limit - depth, state.num_actions());
+    int* killers = &worker.killers[2 * depth];
+    if (killers[0] != action) {
+        killers[1] = killers[0];
+        killers[0] = action;
+    }
+    worker.history[(state.get_current_player() ? 0 : 1) * tiles + action] += static_cast<int64_t>(draft) * draft;
+}
+
+int MiniMaxC::search(Worker& worker, TicTacToeBoardC state, bool time_budget) {
+    // Prepare the buffers of the move ordering (one slice per depth)
+    // Memory is only allocated if the size of the board changes
+    int tiles = state.row() * state.col();
+    if (worker.history.size() != static_cast<size_t>(2 * tiles)) {
+        // Case: New size of the board
+        worker.actions.assign((tiles + 1) * tiles, 0);
+        worker.priorities.assign((tiles + 1) * tiles, 0);
+        worker.killers.assign(2 * (tiles + 1), -1);
+        worker.history.assign(2 * tiles, 0);
+    } else {
+        std::fill(worker.killers.begin(), worker.killers.end(), -1);
+        std::fill(worker.history.begin(), worker.history.end(), 0);
+    }
+    worker.nodes = 0;
+    worker.cutoffs = 0;
+    worker.cache_hits = 0;
+    worker.max_depth = 0;
+    worker.value = 0.0f;
+    worker.root_values.assign(tiles, std::numeric_limits<float>::quiet_NaN());
+    worker.stopped = false;
+    worker.has_deadline = false;
+
+    int best_action = -1;
+    float alpha = -std::numeric_limits<float>::infinity();
+    float beta = std::numeric_limits<float>::infinity();
+    if (!time_budget && worker.index == 0) {
+        // Case: No time budget
+        // Perform the minimax algorithm (with alpha-beta pruning) on a single board
+        worker.depth_limit = this->max_depth;
+        worker.value = this->negamax(worker, state, 0, alpha, beta, best_action);
+        this->completed_depth = std::min(this->max_depth, state.num_actions());
+        if (this->action_values != nullptr) {
+            std::copy(worker.root_values.begin(), worker.root_values.end(), this->action_values);
+        }
+        return best_action;
+    }
 
-        std::tuple<float, int> v = this->minimax(successor);
-        if (std::get<0>(v) > std::get<0>(best_v)) {
-            best_v = std::make_tuple(std::get<0>(v), action);
+    // Perform the minimax algorithm with increasing depths until the time budget is exceeded
+    // (helper threads also deepen without a time budget, until the main thread is finished)
+    int final_depth = std::max(1, std::min(this->max_depth, state.num_actions()));
+    for (int depth = 1; depth <= final_depth; depth++) {
+        worker.stopped = false;
+        worker.depth_limit = depth;
+        // The first depth of the main thread is always completed, so that there is always an action
+        worker.has_deadline = time_budget && (depth > 1 || worker.index > 0);
+        worker.next_check = worker.nodes;
+        int depth_action = -1;
+        float value = this->negamax(worker, state, 0, alpha, beta, depth_action);
+        if (worker.stopped) {
+            // Case: Time budget is exceeded
+            // Use the result of the last completed depth
+            break;
+        }
+        best_action = depth_action;
+        worker.value = value;
+        if (worker.index == 0) {
+            this->completed_depth = depth;
+            if (this->action_values != nullptr) {
+                // Case: Values of the completed depth replace the values of the last depth
+                std::copy(worker.root_values.begin(), worker.root_values.end(), this->action_values);
+            }
         }
-        if (std::get<0>(best_v) >= this->beta) {
-            this->alpha = cur_alpha;
-            return best_v;
+    }
+    worker.has_deadline = false;
+    return best_action;
+}
+
+void MiniMaxC::principal_variation(TicTacToeBoardC state, int best_action, std::vector<int>& pv) {
+    int tiles = state.row() * state.col();
+    int action = best_action;
+    pv.clear();
+    while (action >= 0 && static_cast<int>(pv.size()) < this->completed_depth) {
+        pv.push_back(action);
+        state.push(action);
+        if (state.check_terminated()) {
+            // Case: End of the game
+            break;
+        }
+
+        // Best action of the next state (in canonical form)
+        int symmetry = 0;
+        uint64_t key = state.get_canonical_hash_key(&symmetry);
+        MiniMaxEntryC entry;
+        if (!(this->cache->probe(key, entry) || (this->book && this->book->probe(key, entry))) || entry.action < 0 || entry.action >= tiles) {
+            // Case: State (or its best action) is not stored
+            break;
+        }
+        action = state.inverse_transform_action(entry.action, symmetry);
+        if (state.get_current()[action] != 0) {
+            // Case: Entry belongs to another state (collision of the hashes)
+            break;
+        }
+    }
+}
+
+int MiniMaxC::get_best_action(const int32_t* board, int rows, int cols, double time_budget_ms, MiniMaxStatsC* stats) {
+    std::lock_guard<std::mutex> lock(this->search_mutex);
+    return this->search_root(board, rows, cols, time_budget_ms, stats);
+}
+
+void MiniMaxC::get_best_actions(const int32_t* boards, int count, int rows, int cols, double time_budget_ms, int num_workers, int32_t* actions) {
+    std::lock_guard<std::mutex> lock(this->search_mutex);
+    num_workers = std::max(1, std::min(num_workers, count));
+    while (static_cast<int>(this->pool.size()) < num_workers) {
+        // Case: Pool needs more copies (search states are kept for the next batch)
+        this->pool.emplace_back(new MiniMaxC(*this, 1));
+    }
+
+    // Each worker takes the next state, until all states are searched
+    std::atomic<int> next(0);
+    int tiles = rows * cols;
+    auto run = [&](MiniMaxC* minimax) {
+        minimax->book = this->book;
+        for (int i = next.fetch_add(1); i < count; i = next.fetch_add(1)) {
+            actions[i] = static_cast<int32_t>(minimax->get_best_action(boards + static_cast<size_t>(i) * tiles, rows, cols, time_budget_ms));
         }
-        this->alpha = std::max(this->alpha, std::get<0>(best_v));
+    };
+    std::vector<std::thread> threads;
+    for (int i = 1; i < num_workers; i++) {
+        threads.emplace_back(run, this->pool[i].get());
     }
-    this->alpha = cur_alpha;
-    return best_v;
+    run(this->pool[0].get());
+    for (std::thread& thread : threads) {
+        thread.join();
+    }
+}
+
+int MiniMaxC::get_action_values(const int32_t* board, int rows, int cols, double time_budget_ms, float* values) {
+    std::lock_guard<std::mutex> lock(this->search_mutex);
+    std::fill(values, values + rows * cols, std::numeric_limits<float>::quiet_NaN());
+    this->action_values = values;
+    int best_action = this->search_root(board, rows, cols, time_budget_ms, nullptr);
+    this->action_values = nullptr;
+    return best_action;
 }
 
+int MiniMaxC::search_root(const int32_t* board, int rows, int cols, double time_budget_ms, MiniMaxStatsC* stats) {
+    std::chrono::steady_clock::time_point start = std::chrono::steady_clock::now();
 
-std::tuple<float, int> MiniMaxC::min(std::vector<std::vector<int>> board) {
+    // The single board of the whole search (actions are done and undone in-place)
     TicTacToeBoardC state = TicTacToeBoardC(
-        board, 
+        board,
+        rows,
+        cols,
         this->tiles_to_win,
-        this->your_symbol, 
-        this->enemy_symbol, 
-        false
+        this->your_symbol,
+        this->enemy_symbol,
+        true
     );
-    std::tuple<float, int> best_v = std::make_tuple(std::numeric_limits<float>::infinity(), -1);
-    int cur_depth = this->depth;
-    float cur_beta = this->beta;
-
-    std::vector<std::vector<std::vector<int>>> successors = state.get_successors();
-    std::vector<int> actions = state.get_actions();
-    for (size_t i = 0; i < successors.size(); i++) {
-        // Get the successor state with the given action
-        std::vector<std::vector<int>> successor = successors[i];
-        int action = actions[i];
 
-        // Update the parameters
-        this->depth = cur_depth + 1;
-        this->your_start = true;
+    if (time_budget_ms >= 0) {
+        // Case: Search with time budget
+        std::chrono::duration<double, std::milli> time_budget(time_budget_ms);
+        this->deadline = std::chrono::steady_clock::now() + std::chrono::duration_cast<std::chrono::steady_clock::duration>(time_budget);
+    }
+    this->completed_depth = 0;
+    this->finished.store(false);
+
+    // Start the helper threads (each thread searches on its own copy of the board)
+    std::vector<std::thread> threads;
+    for (int i = 1; i < this->num_threads; i++) {
+        threads.emplace_back(&MiniMaxC::search, this, std::ref(this->workers[i]), state, time_budget_ms >= 0);
+    }
 
-        std::tuple<float, int> v = this->minimax(successor);
-        if (std::get<0>(v) < std::get<0>(best_v)) {
-            best_v = std::make_tuple(std::get<0>(v), action);
-        }
-        if (std::get<0>(best_v) <= this->alpha) {
-            this->beta = cur_beta;
-            return best_v;
+    int best_action = this->search(this->workers[0], state, time_budget_ms >= 0);
+
+    // Stop the helper threads
+    this->finished.store(true);
+    for (std::thread& thread : threads) {
+        thread.join();
+    }
+    this->nodes = 0;
+    for (const Worker& worker : this->workers) {
+        this->nodes += worker.nodes;
+    }
+
+    if (stats != nullptr) {
+        // Case: Statistics of the search are needed
+        stats->elapsed_ms = std::chrono::duration<double, std::milli>(std::chrono::steady_clock::now() - start).count();
+        stats->value = this->workers[0].value;
+        stats->nodes = this->nodes;
+        stats->cutoffs = 0;
+        stats->cache_hits = 0;
+        stats->max_depth = 0;
+        for (const Worker& worker : this->workers) {
+            stats->cutoffs += worker.cutoffs;
+            stats->cache_hits += worker.cache_hits;
+            stats->max_depth = std::max(stats->max_depth, worker.max_depth);
         }
-        this->beta = std::min(this->beta, std::get<0>(best_v));
+        stats->completed_depth = this->completed_depth;
+        this->principal_variation(state, best_action, stats->pv);
     }
-    this->beta = cur_beta;
-    return best_v;
+    return best_action;
 }
 
-int MiniMaxC::get_best_action(std::vector<std::vector<int>> board) {
-    if (this->cache.count(board) > 0) {
-        // Case: Board state was already evaluated
-        std::tuple<float, int> result = this->cache[board];
-        float reward = std::get<0>(result);
-        int action = std::get<1>(result);
-        return action;
-    }
+int MiniMaxC::get_completed_depth() {
+    return this->completed_depth;
+}
 
-    // Reset the parameters
-    this->reset();
+uint64_t MiniMaxC::get_nodes() {
+    return this->nodes;
+}
+
+int MiniMaxC::get_num_threads() {
+    return this->num_threads;
+}
 
-    // Perform the minimax algorithm (with alpha-beta pruning)
-    std::tuple<float, int> result = this->minimax(board);
-    
-    // Safe the results in the cache
-    this->cache[board] = result;
+void MiniMaxC::set_book(const uint64_t* records, size_t size) {
+    std::lock_guard<std::mutex> lock(this->search_mutex);
+    if (records == nullptr) {
+        // Case: Remove the book
+        this->book.reset();
+    } else {
+        this->book = std::make_shared<OpeningBookC>(records, size);
+    }
+}
+
+OpeningBookC* MiniMaxC::get_book() {
+    return this->book.get();
+}
 
-    // Return the action
-    float reward = std::get<0>(result);
-    int action = std::get<1>(result);
-    return action;
+TranspositionTableC& MiniMaxC::get_cache() {
+    return *this->cache;
 }
@@ -1,57 +1,232 @@
 #ifndef MINMAX_H
 #define MINMAX_H
 
-#include "../../util/hasher.h"
+#include "../model/boardC.h"
+#include "opening_bookC.h"
+#include "transposition_tableC.h"
+#include <atomic>
+#include <chrono>
 #include <vector>
-#include <tuple>
-#include <unordered_map>
 #include <limits>
+#include <memory>
+#include <mutex>
 
+/**
+ * @brief Statistics of a single search of MiniMaxC::get_best_action().
+ */
+struct MiniMaxStatsC {
+    /* value of the root for your player (wins are higher or equal to the number of tiles) */
+    float value = 0.0f;
+    /* number of visited states (of all threads) */
+    uint64_t nodes = 0;
+    /* number of states, where an action caused a beta cutoff (of all threads) */
+    uint64_t cutoffs = 0;
+    /* number of states, that were found in the transposition table or opening book (of all threads) */
+    uint64_t cache_hits = 0;
+    /* maximal number of moves from the root to a visited state (of all threads) */
+    int max_depth = 0;
+    /* maximal depth of the last completed search */
+    int completed_depth = 0;
+    /* duration of the search in milliseconds */
+    double elapsed_ms = 0.0;
+    /* best actions of both players from the root (principal variation) */
+    std::vector<int> pv;
+};
+
+/**
+ * @brief MiniMax algorithm with alpha-beta pruning, a transposition table and iterative deepening.
+ *
+ * With several threads, the search runs in parallel with Lazy SMP: Helper threads search the same state
+ * (with a different order of the actions at the root) and share their results over the transposition table.
+ * Only the search of the main thread decides the best action, so the result is the same as with a single thread.
+ *
+ * Thread safety: Concurrent calls of get_best_action() on the same object are serialized. For concurrent searches,
+ * each thread should use its own copy, which shares the (lock-free) transposition table with the original object.
+ */
 class MiniMaxC {
     private:
-        std::unordered_map<std::vector<std::vector<int>>, std::tuple<float, int>, decltype(&Hasher::matrix_hash)> cache;
-        bool your_start = true;
-        int depth = 0;
-        float alpha = -std::numeric_limits<float>::infinity();
-        float beta = std::numeric_limits<float>::infinity();
+        /**
+         * @brief State of the search of a single thread.
+         */
+        struct Worker {
+            /* index of the thread (0 for the main thread) */
+            int index = 0;
+            /* maximal depth of the current search (smaller than max_depth for iterative deepening) */
+            int depth_limit = 0;
+            /* number of visited states of the current search */
+            uint64_t nodes = 0;
+            /* number of beta cutoffs of the current search */
+            uint64_t cutoffs = 0;
+            /* number of states of the current search, that were found in the transposition table or opening book */
+            uint64_t cache_hits = 0;
+            /* maximal number of moves from the root to a visited state of the current search */
+            int max_depth = 0;
+            /* value of the root of the last completed depth */
+            float value = 0.0f;
+            /* value of each action at the root of the current depth (only used for the action values) */
+            std::vector<float> root_values;
+            /* number of visited states, after which the clock is checked the next time */
+            uint64_t next_check = 0;
+            /* the current search has a deadline */
+            bool has_deadline = false;
+            /* the current search was interrupted by the deadline (or the main thread) */
+            bool stopped = false;
+            /* actions of each depth (tiles entries per depth, allocated once per board size) */
+            std::vector<int> actions;
+            /* priorities of the actions of each depth (tiles entries per depth) */
+            std::vector<int64_t> priorities;
+            /* last two actions of each depth, that caused a cutoff (killer heuristic) */
+            std::vector<int> killers;
+            /* sum of the squared depths of all cutoffs of each player and action (history heuristic) */
+            std::vector<int64_t> history;
+        };
+
+        /* transposition table of already evaluated states, where states (canonical zobrist hashes) and actions are in canonical form (shared by all copies) */
+        std::shared_ptr<TranspositionTableC> cache;
+        /* read-only table of already solved states, which is used if the state is not in the cache (shared by all copies) */
+        std::shared_ptr<OpeningBookC> book;
+        /* lock of the current search (only one search per object at the same time) */
+        std::mutex search_mutex;
         int your_symbol;
         int enemy_symbol;
         int tiles_to_win;
         int max_depth = std::numeric_limits<int>::infinity();
+        /* number of threads of the search */
+        int num_threads = 1;
+        /* search state of each thread (the first worker belongs to the main thread) */
+        std::vector<Worker> workers;
+        /* number of visited states of the last search (of all threads) */
+        uint64_t nodes = 0;
+        /* point in time, where the current search has to stop */
+        std::chrono::steady_clock::time_point deadline;
+        /* the main thread has finished the current search (helper threads should stop) */
+        std::atomic<bool> finished;
+        /* maximal depth of the last completed search */
+        int completed_depth = 0;
+        /* use heuristics to search the most promising actions first */
+        bool move_ordering = true;
+        /* value of each action at the root of the last completed depth (output of the current search, nullptr if not needed) */
+        float* action_values = nullptr;
+        /* single-threaded copies, which search the boards of get_best_actions() in parallel (created on demand) */
+        std::vector<std::unique_ptr<MiniMaxC>> pool;
+
+        /**
+         * @brief Checks if the deadline of the current search is exceeded or the helper thread is no longer needed.
+         * 
+         * @param worker search state of the current thread
+         * @return true if the search should stop, otherwise false
+         */
+        bool is_stopped(Worker& worker);
+
+        /**
+         * @brief Runs the (iterative deepening) search of a single thread.
+         * 
+         * @param worker search state of the current thread
+         * @param state current state (copy of the thread)
+         * @param time_budget the search has a time budget (iterative deepening), otherwise a single search with max_depth is done
+         * @return int best action of the last completed depth
+         */
+        int search(Worker& worker, TicTacToeBoardC state, bool time_budget);
+
+        /**
+         * @brief Evaluates a non-terminated state at the maximal depth with the open lines and threats of both players.
+         * Open lines with more tiles have a higher weight, and a threat of the current player (or two threats
+         * of the other player) almost decides the game.
+         * 
+         * @param state current state
+         * @return float value of the state for the current player (between -(tiles - 1) and tiles - 1, so below all wins)
+         */
+        float evaluate(TicTacToeBoardC& state);
+
+        /**
+         * @brief Converts a value of the search into a value of the cache. 
+         * Wins and losses depend on the depth of the state, so they are stored relative to the state.
+         * 
+         * @param value value of the state (relative to the root)
+         * @param depth depth of the state
+         * @param tiles number of tiles of the board
+         * @return float value of the state (relative to the state)
+         */
+        static float to_cache_value(float value, int depth, int tiles);
+
+        /**
+         * @brief Converts a value of the cache back into a value of the search (inverse of to_cache_value()).
+         * 
+         * @param value value of the state (relative to the state)
+         * @param depth depth of the state
+         * @param tiles number of tiles of the board
+         * @return float value of the state (relative to the root)
+         */
+        static float from_cache_value(float value, int depth, int tiles);
 
         /**
-         * @brief Resets the parameters of the minimax-search
+         * @brief The Minimax algorithm with alpha-beta pruning in negamax form, where the value of a state
+         * is always seen from the player, who makes the next turn. If the state is non-terminated then 
+         * look up the transposition table or go deeper in the tree.
+         * 
+         * @param worker search state of the current thread
+         * @param state current state (moves are done and undone in-place)
+         * @param depth number of moves from the root to the current state
+         * @param alpha lower bound of the value, that the current player can already reach
+         * @param beta upper bound of the value, that the other player allows
+         * @param best_action best action of the current state (output, -1 if there is no action)
+         * @return float value of the current state for the current player
+         */
+        float negamax(Worker& worker, TicTacToeBoardC& state, int depth, float alpha, float beta, int& best_action);
+
+        /**
+         * @brief Writes the possible actions of the given state into the buffer of the given depth.
+         * The actions are sorted by (...)
+         *      1. best action from the transposition table
+         *      2. actions that win the game
+         *      3. actions that block a win of the other player
+         *      4. killer actions (cutoffs in sibling states)
+         *      5. history of cutoffs, then number of lines through the tile
+         * Helper threads rotate the actions at the root, so that they start with different actions.
+         * 
+         * @param worker search state of the current thread
+         * @param state current state
+         * @param depth number of moves from the root to the current state
+         * @param cache_action best action from the transposition table (-1 if there is no best action)
+         * @return int number of actions
          */
-        void reset();
+        int order_actions(Worker& worker, TicTacToeBoardC& state, int depth, int cache_action);
 
         /**
-         * @brief The upper part from the Minimax algorithm, where we return the (reward, action) 
-         * pair of a given state. If the state is non-terminated then go deeper in the tree.
+         * @brief Updates the killer and history heuristic after an action caused a cutoff.
          * 
-         * @param board current state
-         * @return std::tuple<float, int> (reward, action) pair of the current state
+         * @param worker search state of the current thread
+         * @param state current state
+         * @param depth number of moves from the root to the current state
+         * @param action action that caused the cutoff
          */
-        std::tuple<float, int> minimax(std::vector<std::vector<int>> board);
+        void update_heuristics(Worker& worker, TicTacToeBoardC& state, int depth, int action);
 
         /**
-         * @brief The max-part of the Minimax algorithm. It returns 
-         * the (reward, action) pair of a given state, so that 
-         * we maximize our reward.
+         * @brief Runs the search of all threads from the given state (the lock of the search should be held).
          * 
-         * @param board current state
-         * @return std::tuple<float, int> (reward, action) pair which maximizes our reward from the given state
+         * @param board contiguous (row-major) matrix of the current state, where your player makes the next turn
+         * @param rows number of rows of the board
+         * @param cols number of columns of the board
+         * @param time_budget_ms time budget in milliseconds (negative for no time budget)
+         * @param stats statistics of the search (output, nullptr if the statistics are not needed)
+         * @return int best action of the last completed depth with the given state
          */
-        std::tuple<float, int> max(std::vector<std::vector<int>> board);
+        int search_root(const int32_t* board, int rows, int cols, double time_budget_ms, MiniMaxStatsC* stats);
 
         /**
-         * @brief The min-part of the Minimax algorithm. It returns 
-         * the (reward, action) pair of a given state, so that 
-         * we minimize our reward.
+         * @brief Follows the best actions of the transposition table (and opening book) from the root.
          * 
-         * @param board current state
-         * @return std::tuple<float, int> (reward, action) pair which minimize our reward from the given state
+         * @param state root state (copy)
+         * @param best_action best action of the root
+         * @param pv best actions of both players (output, at most completed_depth actions)
          */
-        std::tuple<float, int> min(std::vector<std::vector<int>> board);
+        void principal_variation(TicTacToeBoardC state, int best_action, std::vector<int>& pv);
+
+        /**
+         * @brief Sets up the parameters and the search state of each thread.
+         */
+        void init(int your_symbol, int enemy_symbol, int tiles_to_win, int max_depth, bool move_ordering, int num_threads);
 
     public:
         /**
@@ -61,25 +236,123 @@ class MiniMaxC {
          * @param enemy_symbol symbol of enemy player
          * @param tiles_to_win number of tiles to place in row, column, diagonal, anti-diagonal to win the game
          * @param max_depth maximal depth for the minimax algorithm
+         * @param cache_size maximal number of entries in the transposition table
+         * @param move_ordering use heuristics to search the most promising actions first
+         * @param num_threads number of threads of the search (1 for a single-threaded search)
          */
-        MiniMaxC(int your_symbol, int enemy_symbol, int tiles_to_win, int max_depth) {
-            this->cache = std::unordered_map<std::vector<std::vector<int>>, std::tuple<float, int>, decltype(&Hasher::matrix_hash)>(10, Hasher::matrix_hash);
-            this->your_start = true;
-            this->depth = 0;
-            this->alpha = -std::numeric_limits<float>::infinity();
-            this->beta = std::numeric_limits<float>::infinity();
-            this->your_symbol = your_symbol;
-            this->enemy_symbol = enemy_symbol;
-            this->tiles_to_win = tiles_to_win;
-            this->max_depth = max_depth;
+        MiniMaxC(int your_symbol, int enemy_symbol, int tiles_to_win, int max_depth, size_t cache_size, bool move_ordering, int num_threads) : cache(std::make_shared<TranspositionTableC>(cache_size)), finished(false) {
+            this->init(your_symbol, enemy_symbol, tiles_to_win, max_depth, move_ordering, num_threads);
+        }
+
+        /**
+         * @brief Construct a new MiniMaxC Object, where the transposition table lives in external memory
+         * (e.g. shared memory, so that several processes share their evaluated states).
+         *
+         * @param your_symbol symbol of your player
+         * @param enemy_symbol symbol of enemy player
+         * @param tiles_to_win number of tiles to place in row, column, diagonal, anti-diagonal to win the game
+         * @param max_depth maximal depth for the minimax algorithm
+         * @param cache_memory zero-initialized or already used memory of the transposition table (should live as long as the object)
+         * @param cache_bytes size of the memory of the transposition table
+         * @param move_ordering use heuristics to search the most promising actions first
+         * @param num_threads number of threads of the search (1 for a single-threaded search)
+         */
+        MiniMaxC(int your_symbol, int enemy_symbol, int tiles_to_win, int max_depth, void* cache_memory, size_t cache_bytes, bool move_ordering, int num_threads) : cache(std::make_shared<TranspositionTableC>(cache_memory, cache_bytes)), finished(false) {
+            this->init(your_symbol, enemy_symbol, tiles_to_win, max_depth, move_ordering, num_threads);
+        }
+
+        /**
+         * @brief Construct a new MiniMaxC Object with the same parameters as the given object.
+         * Both objects share the same transposition table (and opening book), but have their own search state.
+         *
+         * @param other object to copy
+         */
+        MiniMaxC(const MiniMaxC& other) : cache(other.cache), book(other.book), finished(false) {
+            this->init(other.your_symbol, other.enemy_symbol, other.tiles_to_win, other.max_depth, other.move_ordering, other.num_threads);
+        }
+
+        /**
+         * @brief Construct a new MiniMaxC Object with the same parameters as the given object, but another number of threads.
+         * Both objects share the same transposition table (and opening book), but have their own search state.
+         *
+         * @param other object to copy
+         * @param num_threads number of threads of the search (1 for a single-threaded search)
+         */
+        MiniMaxC(const MiniMaxC& other, int num_threads) : cache(other.cache), book(other.book), finished(false) {
+            this->init(other.your_symbol, other.enemy_symbol, other.tiles_to_win, other.max_depth, other.move_ordering, num_threads);
         }
 
         /**
          * @brief Returns the best action from the given state, according to the MiniMax algorithm.
+         * With a time budget, the depth is increased until the time budget is exceeded (iterative deepening).
+         * 
+         * @param board contiguous (row-major) matrix of the current state, where your player makes the next turn
+         * @param rows number of rows of the board
+         * @param cols number of columns of the board
+         * @param time_budget_ms time budget in milliseconds (negative for no time budget)
+         * @param stats statistics of the search (output, nullptr if the statistics are not needed)
+         * @return int best action of the last completed depth with the given state
+         */
+        int get_best_action(const int32_t* board, int rows, int cols, double time_budget_ms, MiniMaxStatsC* stats = nullptr);
+
+        /**
+         * @brief Writes the best action of each given state, where the states are searched in parallel by a pool of
+         * single-threaded copies (each state with a single thread), that share the transposition table.
+         * 
+         * @param boards contiguous (row-major) matrices of count states, where your player makes the next turn
+         * @param count number of states
+         * @param rows number of rows of the boards
+         * @param cols number of columns of the boards
+         * @param time_budget_ms time budget per state in milliseconds (negative for no time budget)
+         * @param num_workers number of states, that are searched at the same time
+         * @param actions buffer for count best actions (output, -1 for terminated states)
+         */
+        void get_best_actions(const int32_t* boards, int count, int rows, int cols, double time_budget_ms, int num_workers, int32_t* actions);
+
+        /**
+         * @brief Writes the value of each action from the given state, where each action at the root is searched
+         * with the full window (so that all values are exact). All actions share the same search and transposition table.
          * 
-         * @param board current state
-         * @return int best action with the given state
+         * @param board contiguous (row-major) matrix of the current state, where your player makes the next turn
+         * @param rows number of rows of the board
+         * @param cols number of columns of the board
+         * @param time_budget_ms time budget in milliseconds (negative for no time budget)
+         * @param values buffer for rows * cols values for your player (output, NaN for impossible actions)
+         * @return int best action of the last completed depth with the given state
+         */
+        int get_action_values(const int32_t* board, int rows, int cols, double time_budget_ms, float* values);
+
+        /**
+         * @return int maximal depth of the last completed search of get_best_action()
+         */
+        int get_completed_depth();
+
+        /**
+         * @return uint64_t number of visited states of the last search of get_best_action() (of all threads)
+         */
+        uint64_t get_nodes();
+
+        /**
+         * @return int number of threads of the search
+         */
+        int get_num_threads();
+
+        /**
+         * @brief Sets the opening book of already solved states, which is used if a state is not in the cache.
+         *
+         * @param records records of all states sorted by the hash (should live as long as the book is used), nullptr to remove the book
+         * @param size number of records
+         */
+        void set_book(const uint64_t* records, size_t size);
+
+        /**
+         * @return OpeningBookC* opening book of already solved states (nullptr if there is no book)
+         */
+        OpeningBookC* get_book();
+
+        /**
+         * @return TranspositionTableC& transposition table of already evaluated states
          */
-        int get_best_action(std::vector<std::vector<int>> board);
+        TranspositionTableC& get_cache();
 };
 #endif
\ No newline at end of file
@@ -1,33 +1,396 @@
 # distutils: language = c++
-# distutils: sources = ./classic_games/tictactoe/agent/min_maxC.cpp ./classic_games/tictactoe/model/boardC.cpp ./classic_games/util/hasher.cpp
+# distutils: sources = ./classic_games/tictactoe/agent/min_maxC.cpp ./classic_games/tictactoe/agent/opening_bookC.cpp ./classic_games/tictactoe/agent/transposition_tableC.cpp ./classic_games/tictactoe/model/boardC.cpp ./classic_games/tictactoe/model/layoutC.cpp
 
+from libc.stdint cimport int32_t, uint8_t, uint64_t
 from libcpp.vector cimport vector
+from multiprocessing.shared_memory import SharedMemory
+from typing import Optional
+import mmap
+import struct
+import sys
 import numpy as np
 
-cdef extern from "min_maxC.h":
+from classic_games.tictactoe.agent.search_stats import SearchStats
+
+# Header of an opening book file (magic, version, tiles_to_win, number of records, reserved)
+BOOK_HEADER = struct.Struct("<8sIIQQ")
+BOOK_MAGIC = b"TTTBOOK\0"
+BOOK_VERSION = 1
+
+cdef extern from "transposition_tableC.h" nogil:
+    cdef cppclass TranspositionTableC:
+        void clear()
+        size_t get_size()
+        size_t get_capacity()
+        uint64_t get_hits()
+        uint64_t get_misses()
+        uint64_t get_evictions()
+        size_t get_bytes()
+        size_t export_entries(uint64_t* keys, uint64_t* data, size_t capacity)
+        @staticmethod
+        size_t required_bytes(size_t capacity)
+
+cdef extern from "opening_bookC.h" nogil:
+    cdef cppclass OpeningBookC:
+        size_t get_size()
+        uint64_t get_hits()
+
+cdef extern from "min_maxC.h" nogil:
+    cdef cppclass MiniMaxStatsC:
+        float value
+        uint64_t nodes
+        uint64_t cutoffs
+        uint64_t cache_hits
+        int max_depth
+        int completed_depth
+        double elapsed_ms
+        vector[int] pv
+
     cdef cppclass MiniMaxC:        
-        MiniMaxC(int, int, int, int)
-        int get_best_action(vector[vector[int]] board)
+        MiniMaxC(int, int, int, int, size_t, bint, int)
+        MiniMaxC(int, int, int, int, void*, size_t, bint, int)
+        MiniMaxC(const MiniMaxC&)
+        int get_best_action(const int32_t* board, int rows, int cols, double time_budget_ms, MiniMaxStatsC* stats)
+        void get_best_actions(const int32_t* boards, int count, int rows, int cols, double time_budget_ms, int num_workers, int32_t* actions)
+        int get_action_values(const int32_t* board, int rows, int cols, double time_budget_ms, float* values)
+        int get_completed_depth()
+        uint64_t get_nodes()
+        int get_num_threads()
+        void set_book(const uint64_t* records, size_t size)
+        OpeningBookC* get_book()
+        TranspositionTableC& get_cache()
 
 
 cdef class MiniMax:
+    """
+    MiniMax algorithm with alpha-beta pruning, a transposition table (cache) and iterative deepening.
+
+    Thread safety: The search runs without the GIL. Concurrent calls of get_best_action() on the same
+    instance are safe, but run one after another. For concurrent searches, each thread should use its
+    own instance from clone(), which shares the (lock-free) cache with this instance.
+
+    Several processes can share the cache over shared memory: One process creates the memory with
+    create_shared_cache() and the instances of all processes attach to it with shared_cache=<name>.
+    """
     cdef MiniMaxC* obj
+    cdef int tiles_to_win
+    # shared memory of the cache (None for a private cache)
+    cdef object shared_memory
+    # records of the opening book (keeps the memory-mapped file open)
+    cdef object book
+
+    def __cinit__(self):
+        self.obj = NULL
 
-    def __cinit__(self, int your_symbol = 1, int enemy_symbol = -1, int tiles_to_win = 3, int max_depth = np.iinfo(np.int32).max):
+    def __init__(self, int your_symbol = 1, int enemy_symbol = -1, int tiles_to_win = 3, int max_depth = np.iinfo(np.int32).max, size_t cache_size = 2**16, bint move_ordering = True, int num_threads = 1, shared_cache: Optional[str] = None):
         assert max_depth >= 1, "#ERROR_MINMAXPY: max_depth should be higher or equal to 1!"
-        self.obj = new MiniMaxC(your_symbol, enemy_symbol, tiles_to_win, max_depth)
+        assert cache_size >= 2, "#ERROR_MINMAXPY: cache_size should be higher or equal to 2!"
+        assert num_threads >= 1, "#ERROR_MINMAXPY: num_threads should be higher or equal to 1!"
+        cdef uint8_t[::1] memory
+        del self.obj
+        self.obj = NULL
+        self.shared_memory = None
+        if shared_cache is None:
+            # Case: Private cache with cache_size entries
+            self.obj = new MiniMaxC(your_symbol, enemy_symbol, tiles_to_win, max_depth, cache_size, move_ordering, num_threads)
+        else:
+            # Case: Cache lives in the shared memory with the given name (cache_size is ignored)
+            if sys.version_info >= (3, 13):
+                # Case: Only the process, which created the shared memory, should remove it
+                self.shared_memory = SharedMemory(name=shared_cache, track=False)
+            else:
+                self.shared_memory = SharedMemory(name=shared_cache)
+            memory = self.shared_memory.buf
+            assert memory.shape[0] >= TranspositionTableC.required_bytes(2), "#ERROR_MINMAXPY: shared memory is too small!"
+            self.obj = new MiniMaxC(your_symbol, enemy_symbol, tiles_to_win, max_depth, &memory[0], memory.shape[0], move_ordering, num_threads)
+        self.tiles_to_win = tiles_to_win
+        self.book = None
     
     def __dealloc__(self):
         del self.obj
 
-    def get_best_action(self, vector[vector[int]] board) -> int:
+    @staticmethod
+    def create_shared_cache(size_t cache_size = 2**16) -> SharedMemory:
+        """
+        Creates the (empty) shared memory for a cache, which can be shared by several processes
+        with MiniMax(..., shared_cache=memory.name). The creator should keep the shared memory,
+        until all processes are finished, and then remove it with close() and unlink().
+
+        Args:
+            cache_size (int): maximal number of entries in the cache. Defaults to 2**16
+
+        Returns:
+            SharedMemory: shared memory of the cache
+        """
+        assert cache_size >= 2, "#ERROR_MINMAXPY: cache_size should be higher or equal to 2!"
+        return SharedMemory(create=True, size=TranspositionTableC.required_bytes(cache_size))
+
+    def clone(self) -> MiniMax:
+        """
+        Returns a new instance with the same parameters, which shares the cache with this instance.
+        The clone has its own search state, so that both instances can search at the same time.
+
+        Returns:
+            MiniMax: clone of this instance
+        """
+        cdef MiniMax clone = MiniMax.__new__(MiniMax)
+        clone.obj = new MiniMaxC(self.obj[0])
+        clone.tiles_to_win = self.tiles_to_win
+        clone.shared_memory = self.shared_memory
+        clone.book = self.book
+        return clone
+
+    def get_best_action(self, board, time_budget_ms: Optional[float] = None, bint return_stats = False):
         """
         Returns the best action from the given state, according to the MiniMax algorithm.
 
+        With a time budget, the search runs with increasing depths (up to max_depth) and returns
+        the best action of the last completed depth, when the time budget is exceeded.
+
+        With several threads, helper threads search the same state and share their results over the
+        cache (Lazy SMP), while the main thread decides the best action. The GIL is released during the search.
+
+        The statistics of the search are only collected into a SearchStats, if return_stats is True.
+
         Args:
             board (ObsType): current state
+            time_budget_ms (Optional[float]): time budget in milliseconds. Defaults to None (no time budget)
+            return_stats (bool): return the statistics of the search. Defaults to False
+
+        Returns:
+            int | tuple[int, SearchStats]: best action with the given state (and the statistics of the search)
+        """
+        cdef const int32_t[:, ::1] tiles = np.ascontiguousarray(board, dtype=np.int32)
+        cdef double budget = -1.0
+        cdef int action
+        cdef MiniMaxStatsC stats
+        cdef MiniMaxStatsC* stats_ptr = &stats if return_stats else NULL
+        if time_budget_ms is not None:
+            assert time_budget_ms >= 0, "#ERROR_MINMAXPY: time_budget_ms should be higher or equal to 0!"
+            budget = time_budget_ms
+        with nogil:
+            action = self.obj.get_best_action(&tiles[0, 0], tiles.shape[0], tiles.shape[1], budget, stats_ptr)
+        if not return_stats:
+            return action
+        return action, SearchStats(
+            action=action,
+            value=stats.value,
+            nodes=stats.nodes,
+            cutoffs=stats.cutoffs,
+            cache_hits=stats.cache_hits,
+            max_depth=stats.max_depth,
+            completed_depth=stats.completed_depth,
+            elapsed_ms=stats.elapsed_ms,
+            pv=list(stats.pv),
+        )
+
+    def get_best_actions(self, boards, time_budget_ms: Optional[float] = None, num_workers: Optional[int] = None) -> np.ndarray:
+        """
+        Returns the best action of each given state. The states are converted in a single pass and searched
+        in parallel by a pool of single-threaded clones, which share the cache. The GIL is released during the searches.
+
+        Args:
+            boards (np.ndarray): current states with shape (N, rows, cols)
+            time_budget_ms (Optional[float]): time budget per state in milliseconds. Defaults to None (no time budget)
+            num_workers (Optional[int]): number of states, that are searched at the same time. Defaults to None (num_threads)
+
+        Returns:
+            np.ndarray: best actions with shape (N,) (-1 for terminated states)
+        """
+        cdef const int32_t[:, :, ::1] tiles = np.ascontiguousarray(boards, dtype=np.int32)
+        actions = np.empty(tiles.shape[0], dtype=np.int32)
+        cdef int32_t[::1] action_buffer = actions
+        cdef double budget = -1.0
+        cdef int workers = self.obj.get_num_threads() if num_workers is None else num_workers
+        assert workers >= 1, "#ERROR_MINMAXPY: num_workers should be higher or equal to 1!"
+        if time_budget_ms is not None:
+            assert time_budget_ms >= 0, "#ERROR_MINMAXPY: time_budget_ms should be higher or equal to 0!"
+            budget = time_budget_ms
+        if tiles.shape[0] == 0:
+            # Case: No states
+            return actions
+        with nogil:
+            self.obj.get_best_actions(&tiles[0, 0, 0], tiles.shape[0], tiles.shape[1], tiles.shape[2], budget, workers, &action_buffer[0])
+        return actions
+
+    def get_action_values(self, board, time_budget_ms: Optional[float] = None) -> np.ndarray:
+        """
+        Returns the value of each action from the given state for your player, computed in a single search.
+        Each action at the root is searched with the full window, so that all values are exact (not only the
+        value of the best action), while all actions share the same cache. The GIL is released during the search.
+
+        Wins are higher or equal to the number of tiles (earlier wins are higher), losses are lower or equal to
+        the negative number of tiles and draws are 0. With a maximal depth (or a time budget), the other values
+        are the evaluations of the last completed depth.
+
+        Args:
+            board (ObsType): current state
+            time_budget_ms (Optional[float]): time budget in milliseconds. Defaults to None (no time budget)
+
+        Returns:
+            np.ndarray: values of all actions with shape (rows * cols,) (NaN for impossible actions)
+        """
+        cdef const int32_t[:, ::1] tiles = np.ascontiguousarray(board, dtype=np.int32)
+        values = np.empty(tiles.shape[0] * tiles.shape[1], dtype=np.float32)
+        cdef float[::1] value_buffer = values
+        cdef double budget = -1.0
+        if time_budget_ms is not None:
+            assert time_budget_ms >= 0, "#ERROR_MINMAXPY: time_budget_ms should be higher or equal to 0!"
+            budget = time_budget_ms
+        with nogil:
+            self.obj.get_action_values(&tiles[0, 0], tiles.shape[0], tiles.shape[1], budget, &value_buffer[0])
+        return values
+
+    @property
+    def completed_depth(self) -> int:
+        """
+        Returns the maximal depth of the last completed search of get_best_action().
+
+        Returns:
+            int: maximal completed depth
+        """
+        return self.obj.get_completed_depth()
+
+    @property
+    def nodes(self) -> int:
+        """
+        Returns the number of visited states of the last search of get_best_action() (of all threads).
+
+        Returns:
+            int: number of visited states
+        """
+        return self.obj.get_nodes()
+
+    @property
+    def num_threads(self) -> int:
+        """
+        Returns the number of threads of the search.
+
+        Returns:
+            int: number of threads
+        """
+        return self.obj.get_num_threads()
+
+    def get_cache_stats(self) -> dict[str, int]:
+        """
+        Returns the statistics of the transposition table (cache).
+
+        Returns:
+            dict[str, int]: (...)
+                - size: number of stored entries
+                - capacity: maximal number of stored entries
+                - hits: number of successful lookups
+                - misses: number of unsuccessful lookups
+                - evictions: number of entries, that were replaced by entries of other states
+                - bytes: memory usage of the transposition table
+        """
+        cdef TranspositionTableC* cache = &self.obj.get_cache()
+        cdef size_t size
+        with nogil:
+            size = cache.get_size()
+        return {
+            "size": size,
+            "capacity": cache.get_capacity(),
+            "hits": cache.get_hits(),
+            "misses": cache.get_misses(),
+            "evictions": cache.get_evictions(),
+            "bytes": cache.get_bytes(),
+        }
+
+    def clear_cache(self):
+        """
+        Removes all entries of the transposition table (cache) and resets its statistics.
+        The cache should not be cleared, while a clone (or another process with the shared cache) is searching.
+        """
+        with nogil:
+            self.obj.get_cache().clear()
+
+    def save_book(self, path: str) -> int:
+        """
+        Writes all states of the cache (and of the current opening book) into an opening book file.
+        Each state is stored with its canonical zobrist hash, its value and its best action.
+
+        Args:
+            path (str): path of the opening book file
+
+        Returns:
+            int: number of stored states
+        """
+        cdef TranspositionTableC* cache = &self.obj.get_cache()
+        cdef size_t size
+        cdef size_t count = 0
+        with nogil:
+            size = cache.get_size()
+        keys = np.empty(size, dtype=np.uint64)
+        data = np.empty(size, dtype=np.uint64)
+        cdef uint64_t[::1] key_buffer = keys
+        cdef uint64_t[::1] data_buffer = data
+        if size > 0:
+            # Case: C++ writes the entries directly into the arrays
+            with nogil:
+                count = cache.export_entries(&key_buffer[0], &data_buffer[0], size)
+        records = np.stack((keys[:count], data[:count]), axis=1)
+        if self.book is not None:
+            # Case: States of the cache replace the states of the current book
+            records = np.concatenate((records, self.book.reshape(-1, 2)))
+
+        # Records are sorted by the hash (binary search)
+        _, indices = np.unique(records[:, 0], return_index=True)
+        records = np.ascontiguousarray(records[indices], dtype="<u8")
+        with open(path, "wb") as file:
+            file.write(BOOK_HEADER.pack(BOOK_MAGIC, BOOK_VERSION, self.tiles_to_win, records.shape[0], 0))
+            file.write(records.tobytes())
+        return records.shape[0]
+
+    def load_book(self, path: str):
+        """
+        Opens an opening book file (see save_book()) with mmap. States, which are not in the cache,
+        are looked up in the book, so that already solved states are not searched again.
+        The memory of the book is shared by all clones (and all processes, that open the same file).
+
+        Args:
+            path (str): path of the opening book file
+        """
+        with open(path, "rb") as file:
+            header = file.read(BOOK_HEADER.size)
+            assert len(header) == BOOK_HEADER.size, "#ERROR_MINMAXPY: opening book is too small!"
+            magic, version, tiles_to_win, count, _ = BOOK_HEADER.unpack(header)
+            assert magic == BOOK_MAGIC, "#ERROR_MINMAXPY: file is not an opening book!"
+            assert version == BOOK_VERSION, "#ERROR_MINMAXPY: version of the opening book is not supported!"
+            assert tiles_to_win == self.tiles_to_win, "#ERROR_MINMAXPY: opening book has different tiles_to_win!"
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        assert len(buffer) >= BOOK_HEADER.size + 16 * count, "#ERROR_MINMAXPY: opening book is truncated!"
+
+        # Records are used directly from the memory-mapped file (without copy)
+        records = np.frombuffer(buffer, dtype="<u8", count=2 * count, offset=BOOK_HEADER.size)
+        cdef const uint64_t[::1] record_buffer = records
+        cdef size_t size = count
+        if size == 0:
+            # Case: Empty book
+            self.close_book()
+            return
+        with nogil:
+            self.obj.set_book(&record_buffer[0], size)
+        self.book = records
+
+    def close_book(self):
+        """
+        Removes the opening book. The file stays open, until all clones with the book are removed.
+        """
+        with nogil:
+            self.obj.set_book(NULL, 0)
+        self.book = None
+
+    def get_book_stats(self) -> dict[str, int]:
+        """
+        Returns the statistics of the opening book.
 
         Returns:
-            int: best action with the given state
+            dict[str, int]: (...)
+                - size: number of stored states (0 if there is no book)
+                - hits: number of successful lookups
         """
-        return self.obj.get_best_action(board)
\ No newline at end of file
+        cdef OpeningBookC* book = self.obj.get_book()
+        if book == NULL:
+            return {"size": 0, "hits": 0}
+        return {"size": book.get_size(), "hits": book.get_hits()}
@@ -4,6 +4,7 @@ import numpy as np
 
 from classic_games.tictactoe.agent.abstract_player import Player
 from classic_games.tictactoe.agent.min_max import MiniMax
+from classic_games.tictactoe.agent.threat_search import ThreatSearch
 
 
 class MinMaxPlayer(Player):
@@ -20,21 +21,47 @@ class MinMaxPlayer(Player):
             player_name: str = "MinMax Player",
             seed: Optional[int] = None,
             max_depth: int = np.iinfo(np.int32).max,
+            cache_size: int = 2**16,
+            time_budget_ms: Optional[float] = None,
+            num_threads: int = 1,
+            book_path: Optional[str] = None,
+            shared_cache: Optional[str] = None,
+            threat_search: bool = False,
     ):
         super().__init__(your_symbol, enemy_symbol, tiles_to_win, player_name, seed)
+        self._time_budget_ms = time_budget_ms
         self._minimaxC = MiniMax(
             your_symbol=your_symbol,
             enemy_symbol=enemy_symbol,
             tiles_to_win=tiles_to_win,
-            max_depth=max_depth
+            max_depth=max_depth,
+            cache_size=cache_size,
+            num_threads=num_threads,
+            shared_cache=shared_cache,
         )
+        if book_path is not None:
+            # Case: Already solved states are looked up in the opening book
+            self._minimaxC.load_book(book_path)
+        self._threat_search = ThreatSearch(
+            your_symbol=your_symbol,
+            enemy_symbol=enemy_symbol,
+            tiles_to_win=tiles_to_win,
+        ) if threat_search else None
+
+    def _get_action(self, board: ObsType) -> int:
+        if self._threat_search is not None:
+            # Forced wins and defenses are found without the full search
+            action = self._threat_search.get_forced_action(board)
+            if action >= 0:
+                return action
+        return self._minimaxC.get_best_action(board, self._time_budget_ms)
 
     def start(self, board: ObsType) -> int:
         # Update turn
         self._turn += 1
 
         # Get the (best) action from minimax algorithm
-        action = self._minimaxC.get_best_action(board)
+        action = self._get_action(board)
         return action
 
     def act(self, board: ObsType) -> int:
@@ -45,7 +72,7 @@ class MinMaxPlayer(Player):
             self._turn += 1
 
             # Get the (best) action from minimax algorithm
-            action = self._minimaxC.get_best_action(board)
+            action = self._get_action(board)
             return action
 
     def end(self, board: ObsType) -> int:
@@ -0,0 +1,34 @@
+#include "opening_bookC.h"
+
+OpeningBookC::OpeningBookC(const uint64_t* records, size_t size) : hits(0) {
+    this->records = records;
+    this->size = size;
+}
+
+bool OpeningBookC::probe(uint64_t key, MiniMaxEntryC& entry) {
+    size_t low = 0;
+    size_t high = this->size;
+    while (low < high) {
+        size_t middle = low + (high - low) / 2;
+        uint64_t middle_key = this->records[2 * middle];
+        if (middle_key < key) {
+            low = middle + 1;
+        } else if (middle_key > key) {
+            high = middle;
+        } else {
+            // Case: State is in the book
+            entry = TranspositionTableC::unpack(this->records[2 * middle + 1]);
+            this->hits.fetch_add(1, std::memory_order_relaxed);
+            return true;
+        }
+    }
+    return false;
+}
+
+size_t OpeningBookC::get_size() {
+    return this->size;
+}
+
+uint64_t OpeningBookC::get_hits() {
+    return this->hits;
+}
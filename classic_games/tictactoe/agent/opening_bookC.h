@@ -0,0 +1,53 @@
+#ifndef OPENINGBOOK_H
+#define OPENINGBOOK_H
+
+#include "transposition_tableC.h"
+#include <atomic>
+#include <cstddef>
+#include <cstdint>
+
+/**
+ * @brief Read-only table of already solved states (e.g. from a memory-mapped file).
+ *
+ * The book does not own its memory. It consists of records with two 64-bit words (zobrist hash of the
+ * canonical state and the packed entry, see TranspositionTableC::pack()), which are sorted by the hash.
+ * The book can be shared by several threads.
+ */
+class OpeningBookC {
+    private:
+        /* records of all states (two words per record) */
+        const uint64_t* records;
+        /* number of records */
+        size_t size;
+        /* number of successful lookups */
+        std::atomic<uint64_t> hits;
+
+    public:
+        /**
+         * @brief Construct a new OpeningBookC object
+         *
+         * @param records records of all states sorted by the hash (should live as long as the book)
+         * @param size number of records
+         */
+        OpeningBookC(const uint64_t* records, size_t size);
+
+        /**
+         * @brief Looks up the entry of the given state (binary search).
+         *
+         * @param key zobrist hash of the state
+         * @param entry entry of the state (output)
+         * @return true if the state is in the book, otherwise false
+         */
+        bool probe(uint64_t key, MiniMaxEntryC& entry);
+
+        /**
+         * @return size_t number of stored states
+         */
+        size_t get_size();
+
+        /**
+         * @return uint64_t number of successful lookups
+         */
+        uint64_t get_hits();
+};
+#endif
@@ -0,0 +1,338 @@
+#include "proof_numberC.h"
+#include <algorithm>
+#include <iostream>
+
+/* keys of the two searches (the same state has different proof numbers in both searches) */
+static const uint64_t WIN_SEARCH_KEY = 0x5851F42D4C957F2DULL;
+static const uint64_t LOSS_SEARCH_KEY = 0x14057B7EF767814FULL;
+
+/* number of buckets of an empty transposition table (the table grows up to the memory limit) */
+static const uint64_t INITIAL_BUCKETS = 1024;
+
+ProofNumberSolverC::ProofNumberSolverC(int your_symbol, int enemy_symbol, int tiles_to_win, size_t memory_limit) {
+    if (memory_limit < 4 * sizeof(Entry)) {
+        // Case: Transposition table has no bucket
+        std::cerr << "#ERROR_PROOFNUMBER: memory_limit should be higher or equal to " << 4 * sizeof(Entry) << " bytes!";
+        std::abort();
+    }
+    this->your_symbol = your_symbol;
+    this->enemy_symbol = enemy_symbol;
+    this->tiles_to_win = tiles_to_win;
+
+    // Number of buckets is the highest power of two, that fits into the memory limit
+    uint64_t buckets = 1;
+    while (2 * buckets * 4 * sizeof(Entry) <= memory_limit) {
+        buckets *= 2;
+    }
+    this->max_buckets = buckets;
+    this->table.assign(4 * std::min(buckets, INITIAL_BUCKETS), Entry{0, 0, 0, 0});
+    this->mask = this->table.size() / 4 - 1;
+    this->progress_nodes.store(0);
+    this->progress_proof.store(0);
+    this->progress_disproof.store(0);
+    this->progress_phase.store(0);
+}
+
+bool ProofNumberSolverC::probe(uint64_t key, uint32_t& proof, uint32_t& disproof) {
+    Entry* bucket = &this->table[4 * (key & this->mask)];
+    for (int i = 0; i < 4; i++) {
+        if (bucket[i].work != 0 && bucket[i].key == key) {
+            // Case: State is found
+            proof = bucket[i].proof;
+            disproof = bucket[i].disproof;
+            this->cache_hits++;
+            return true;
+        }
+    }
+    return false;
+}
+
+void ProofNumberSolverC::grow() {
+    // Each bucket splits into two buckets of the doubled table, so no entry is lost
+    std::vector<Entry> old_table(2 * this->table.size(), Entry{0, 0, 0, 0});
+    old_table.swap(this->table);
+    this->mask = this->table.size() / 4 - 1;
+    for (const Entry& entry : old_table) {
+        if (entry.work != 0) {
+            Entry* bucket = &this->table[4 * (entry.key & this->mask)];
+            int i = 0;
+            while (bucket[i].work != 0) {
+                i++;
+            }
+            bucket[i] = entry;
+        }
+    }
+}
+
+void ProofNumberSolverC::store(uint64_t key, uint32_t proof, uint32_t disproof, uint64_t work) {
+    if (4 * this->size >= 3 * this->table.size() && this->table.size() < 4 * this->max_buckets) {
+        // Case: Table is filled by three quarters (and can still grow)
+        this->grow();
+    }
+    Entry* bucket = &this->table[4 * (key & this->mask)];
+    Entry* replace = nullptr;
+    for (int i = 0; i < 4; i++) {
+        if (bucket[i].work != 0 && bucket[i].key == key) {
+            // Case: State is already stored (work of all expansions is summed up)
+            bucket[i].proof = proof;
+            bucket[i].disproof = disproof;
+            bucket[i].work = static_cast<uint32_t>(std::min<uint64_t>(bucket[i].work + work, UINT32_MAX));
+            return;
+        }
+        if (replace == nullptr || bucket[i].work < replace->work) {
+            replace = &bucket[i];
+        }
+    }
+    if (replace->work == 0) {
+        // Case: Empty entry
+        this->size++;
+    } else if (this->table.size() < 4 * this->max_buckets) {
+        // Case: Bucket is full (but the table can still grow)
+        this->grow();
+        this->store(key, proof, disproof, work);
+        return;
+    } else {
+        // Case: Entry with the smallest amount of work is replaced
+        this->evictions++;
+    }
+    *replace = Entry{key, proof, disproof, static_cast<uint32_t>(std::clamp<uint64_t>(work, 1, UINT32_MAX))};
+}
+
+bool ProofNumberSolverC::is_stopped() {
+    if (!this->stopped && this->nodes >= this->max_nodes) {
+        // Case: Number of states is exceeded
+        this->stopped = true;
+    }
+    if (!this->stopped && this->nodes >= this->next_check) {
+        // Case: Check the clock (and publish the progress) only every 1024 states
+        this->stopped = this->has_deadline && std::chrono::steady_clock::now() >= this->deadline;
+        this->next_check = this->nodes + 1024;
+        this->progress_nodes.store(this->nodes, std::memory_order_relaxed);
+    }
+    return this->stopped;
+}
+
+bool ProofNumberSolverC::has_open_lines(TicTacToeBoardC& state, bool your) {
+    for (int count = 0; count < this->tiles_to_win; count++) {
+        if ((your ? state.get_your_open_lines(count) : state.get_enemy_open_lines(count)) > 0) {
+            return true;
+        }
+    }
+    return false;
+}
+
+void ProofNumberSolverC::evaluate(TicTacToeBoardC& state, Child& child) {
+    int symmetry = 0;
+    child.key = state.get_canonical_hash_key(&symmetry) ^ this->search_key;
+    child.solved = true;
+    bool current = state.get_current_player();
+    int current_threats = current ? state.get_immediate_winning_moves() : state.get_immediate_blocking_moves();
+    int other_threats = current ? state.get_immediate_blocking_moves() : state.get_immediate_winning_moves();
+    bool attacker_wins;
+    if (state.check_winner() != 0) {
+        // Case: Player of the last move won
+        attacker_wins = (state.check_winner() == this->your_symbol) == this->attacker;
+    } else if (state.check_terminated()) {
+        // Case: Draw (the attacker did not win)
+        attacker_wins = false;
+    } else if (current_threats > 0) {
+        // Case: Current player wins with the next move
+        attacker_wins = current == this->attacker;
+    } else if (other_threats > 1) {
+        // Case: Current player cannot block all threats of the other player
+        attacker_wins = current != this->attacker;
+    } else if (!this->has_open_lines(state, this->attacker)) {
+        // Case: Every line of the attacker is blocked (the attacker cannot win anymore)
+        attacker_wins = false;
+    } else {
+        // Case: Value is unknown
+        child.solved = false;
+        child.proof = 1;
+        child.disproof = 1;
+        return;
+    }
+    child.proof = attacker_wins ? 0 : PROOF_NUMBER_INFINITY;
+    child.disproof = attacker_wins ? PROOF_NUMBER_INFINITY : 0;
+}
+
+void ProofNumberSolverC::mid(TicTacToeBoardC& state, uint64_t key, uint32_t proof_threshold, uint32_t disproof_threshold, int depth, uint32_t& proof, uint32_t& disproof) {
+    this->nodes++;
+    this->max_depth = std::max(this->max_depth, depth);
+    uint64_t start_nodes = this->nodes;
+    int tiles = state.row() * state.col();
+    bool or_node = state.get_current_player() == this->attacker;
+
+    // Children are evaluated once per expansion (their proof numbers are updated from the transposition table)
+    Child* children = &this->children[static_cast<size_t>(depth) * tiles];
+    const int32_t* board = state.get_current();
+    int count = 0;
+    for (int tile = 0; tile < tiles; tile++) {
+        if (board[tile] == 0) {
+            state.push(tile);
+            this->evaluate(state, children[count]);
+            state.pop();
+            children[count++].action = tile;
+        }
+    }
+
+    while (true) {
+        // At OR nodes the attacker chooses the child with the smallest proof number,
+        // at AND nodes the defender chooses the child with the smallest disproof number
+        uint64_t proof_sum = 0, disproof_sum = 0;
+        uint32_t proof_min = PROOF_NUMBER_INFINITY, disproof_min = PROOF_NUMBER_INFINITY;
+        uint32_t best_value = PROOF_NUMBER_INFINITY, second_value = PROOF_NUMBER_INFINITY;
+        int best = -1;
+        for (int i = 0; i < count; i++) {
+            Child& child = children[i];
+            if (!child.solved) {
+                this->probe(child.key, child.proof, child.disproof);
+            }
+            proof_sum += child.proof;
+            disproof_sum += child.disproof;
+            proof_min = std::min(proof_min, child.proof);
+            disproof_min = std::min(disproof_min, child.disproof);
+            uint32_t value = or_node ? child.proof : child.disproof;
+            if (best < 0 || value < best_value) {
+                second_value = best < 0 ? PROOF_NUMBER_INFINITY : best_value;
+                best_value = value;
+                best = i;
+            } else if (value < second_value) {
+                second_value = value;
+            }
+        }
+        if (or_node) {
+            proof = proof_min;
+            disproof = static_cast<uint32_t>(std::min<uint64_t>(disproof_sum, PROOF_NUMBER_INFINITY));
+        } else {
+            proof = static_cast<uint32_t>(std::min<uint64_t>(proof_sum, PROOF_NUMBER_INFINITY));
+            disproof = disproof_min;
+        }
+        if (depth == 0) {
+            // Case: Root (progress of the current search)
+            this->progress_proof.store(proof, std::memory_order_relaxed);
+            this->progress_disproof.store(disproof, std::memory_order_relaxed);
+        }
+        if (proof >= proof_threshold || disproof >= disproof_threshold || this->is_stopped()) {
+            // Case: Thresholds are reached (or the search is stopped)
+            break;
+        }
+
+        // Thresholds of the best child: it is searched, until it is not the best child anymore
+        Child& child = children[best];
+        uint32_t child_proof_threshold, child_disproof_threshold;
+        if (or_node) {
+            child_proof_threshold = std::min<uint32_t>(proof_threshold, second_value + 1);
+            child_disproof_threshold = static_cast<uint32_t>(std::min<uint64_t>(static_cast<uint64_t>(disproof_threshold) - disproof + child.disproof, PROOF_NUMBER_INFINITY));
+        } else {
+            child_proof_threshold = static_cast<uint32_t>(std::min<uint64_t>(static_cast<uint64_t>(proof_threshold) - proof + child.proof, PROOF_NUMBER_INFINITY));
+            child_disproof_threshold = std::min<uint32_t>(disproof_threshold, second_value + 1);
+        }
+        state.push(child.action);
+        this->mid(state, child.key, child_proof_threshold, child_disproof_threshold, depth + 1, child.proof, child.disproof);
+        state.pop();
+    }
+    this->store(key, proof, disproof, this->nodes - start_nodes + 1);
+}
+
+int ProofNumberSolverC::prove(TicTacToeBoardC& state, bool your, int& action) {
+    this->attacker = your;
+    this->search_key = your ? WIN_SEARCH_KEY : LOSS_SEARCH_KEY;
+    this->progress_phase.store(your ? 0 : 1, std::memory_order_relaxed);
+    action = -1;
+    if (state.check_terminated()) {
+        // Case: Game is already over
+        return (state.check_winner() == this->your_symbol) == your && state.check_winner() != 0 ? 1 : 0;
+    }
+
+    Child root;
+    this->evaluate(state, root);
+    uint32_t proof = 0, disproof = 0;
+    this->mid(state, root.key, PROOF_NUMBER_INFINITY, PROOF_NUMBER_INFINITY, 0, proof, disproof);
+    if (proof != 0 && disproof != 0) {
+        // Case: Search was stopped
+        return PROOF_NUMBER_UNKNOWN;
+    }
+
+    // Action of the proof (OR root) or of the disproof (AND root)
+    bool or_root = state.get_current_player() == your;
+    for (int i = 0; i < state.num_actions(); i++) {
+        const Child& child = this->children[i];
+        if ((proof == 0 && (child.proof == 0 || !or_root)) || (disproof == 0 && child.disproof == 0 && !or_root)) {
+            action = child.action;
+            break;
+        }
+    }
+    return proof == 0 ? 1 : 0;
+}
+
+int ProofNumberSolverC::solve(const int32_t* board, int rows, int cols, double time_budget_ms, uint64_t max_nodes, ProofNumberStatsC* stats) {
+    std::lock_guard<std::mutex> lock(this->search_mutex);
+    std::chrono::steady_clock::time_point start = std::chrono::steady_clock::now();
+    TicTacToeBoardC state = TicTacToeBoardC(board, rows, cols, this->tiles_to_win, this->your_symbol, this->enemy_symbol, true);
+    size_t tiles = static_cast<size_t>(rows) * cols;
+    if (this->children.size() < (tiles + 1) * tiles) {
+        // Case: Larger board (children of each depth)
+        this->children.resize((tiles + 1) * tiles);
+    }
+    this->nodes = 0;
+    this->cache_hits = 0;
+    this->max_depth = 0;
+    this->max_nodes = max_nodes;
+    this->next_check = 0;
+    this->stopped = false;
+    this->has_deadline = time_budget_ms >= 0;
+    if (this->has_deadline) {
+        // Case: Search stops after the time budget
+        std::chrono::duration<double, std::milli> time_budget(time_budget_ms);
+        this->deadline = start + std::chrono::duration_cast<std::chrono::steady_clock::duration>(time_budget);
+    }
+
+    // Win of your player, otherwise win of the enemy player, otherwise draw
+    int action = -1;
+    int result = this->prove(state, true, action);
+    if (result == 0) {
+        result = this->prove(state, false, action);
+        result = result == PROOF_NUMBER_UNKNOWN ? result : -result;
+    }
+    this->progress_nodes.store(this->nodes, std::memory_order_relaxed);
+
+    if (stats != nullptr) {
+        // Case: Statistics of the search are requested
+        stats->result = result;
+        stats->action = result == PROOF_NUMBER_UNKNOWN ? -1 : action;
+        stats->nodes = this->nodes;
+        stats->cache_hits = this->cache_hits;
+        stats->cache_size = this->size;
+        stats->evictions = this->evictions;
+        stats->max_depth = this->max_depth;
+        stats->phase = this->progress_phase.load(std::memory_order_relaxed);
+        stats->proof_number = this->progress_proof.load(std::memory_order_relaxed);
+        stats->disproof_number = this->progress_disproof.load(std::memory_order_relaxed);
+        stats->elapsed_ms = std::chrono::duration<double, std::milli>(std::chrono::steady_clock::now() - start).count();
+    }
+    return result;
+}
+
+void ProofNumberSolverC::get_progress(ProofNumberStatsC* stats) {
+    stats->nodes = this->progress_nodes.load(std::memory_order_relaxed);
+    stats->phase = this->progress_phase.load(std::memory_order_relaxed);
+    stats->proof_number = this->progress_proof.load(std::memory_order_relaxed);
+    stats->disproof_number = this->progress_disproof.load(std::memory_order_relaxed);
+}
+
+void ProofNumberSolverC::clear() {
+    std::lock_guard<std::mutex> lock(this->search_mutex);
+    // Memory of the grown table is released
+    std::vector<Entry>(4 * std::min(this->max_buckets, INITIAL_BUCKETS), Entry{0, 0, 0, 0}).swap(this->table);
+    this->mask = this->table.size() / 4 - 1;
+    this->size = 0;
+    this->evictions = 0;
+}
+
+uint64_t ProofNumberSolverC::get_cache_size() {
+    return this->size;
+}
+
+uint64_t ProofNumberSolverC::get_cache_capacity() {
+    return 4 * this->max_buckets;
+}
@@ -0,0 +1,251 @@
+#ifndef PROOFNUMBER_H
+#define PROOFNUMBER_H
+
+#include "../model/boardC.h"
+#include <atomic>
+#include <chrono>
+#include <cstdint>
+#include <mutex>
+#include <vector>
+
+/* proof and disproof number of a proven (or disproven) state */
+#define PROOF_NUMBER_INFINITY 0x3FFFFFFFu
+
+/* result of a search, that could not prove the value of the state */
+#define PROOF_NUMBER_UNKNOWN 2
+
+/**
+ * @brief Statistics of a single call of ProofNumberSolverC::solve().
+ */
+struct ProofNumberStatsC {
+    /* result for your player (1: win, 0: draw, -1: loss, PROOF_NUMBER_UNKNOWN: not proven) */
+    int result = PROOF_NUMBER_UNKNOWN;
+    /* action, that reaches the result (-1 if the result is unknown or the game is over) */
+    int action = -1;
+    /* number of expanded states */
+    uint64_t nodes = 0;
+    /* number of states, that were found in the transposition table */
+    uint64_t cache_hits = 0;
+    /* number of states in the transposition table */
+    uint64_t cache_size = 0;
+    /* number of entries, that were replaced by entries of other states */
+    uint64_t evictions = 0;
+    /* maximal number of moves from the root to an expanded state */
+    int max_depth = 0;
+    /* current search (0: win of your player, 1: win of the enemy player) */
+    int phase = 0;
+    /* proof number of the root in the current search */
+    uint32_t proof_number = 0;
+    /* disproof number of the root in the current search */
+    uint32_t disproof_number = 0;
+    /* duration of the search in milliseconds */
+    double elapsed_ms = 0.0;
+};
+
+/**
+ * @brief Solver, that proves the game value of a state with depth-first proof-number search (df-pn).
+ *
+ * The value is proven with two searches: the first search proves or disproves a win of your player,
+ * the second search proves or disproves a win of the enemy player. If both wins are disproven, the state is a draw.
+ * The proof and disproof numbers are kept in a transposition table, that starts small and doubles its size
+ * up to a fixed memory limit. Afterwards the entries with the smallest amount of work are replaced first. Symmetric states share the same entry.
+ * A search, that exceeds its time budget or number of states, can be continued with the next call.
+ *
+ * Thread safety: Concurrent calls on the same object are serialized. The progress can be read during a search.
+ */
+class ProofNumberSolverC {
+    private:
+        /**
+         * @brief Entry of the transposition table (a work of 0 marks an empty entry).
+         */
+        struct Entry {
+            /* canonical zobrist hash of the state xor the key of the search */
+            uint64_t key;
+            /* proof number of the state */
+            uint32_t proof;
+            /* disproof number of the state */
+            uint32_t disproof;
+            /* number of expanded states below the state */
+            uint32_t work;
+        };
+
+        /**
+         * @brief Child of an expanded state.
+         */
+        struct Child {
+            /* encoding of the position (n*row + col) */
+            int action;
+            /* key of the child in the transposition table */
+            uint64_t key;
+            /* proof number of the child */
+            uint32_t proof;
+            /* disproof number of the child */
+            uint32_t disproof;
+            /* value of the child is known without search (terminal state or immediate win) */
+            bool solved;
+        };
+
+        /* lock of the current search (only one search per object at the same time) */
+        std::mutex search_mutex;
+        int your_symbol;
+        int enemy_symbol;
+        int tiles_to_win;
+        /* entries of all buckets (four consecutive entries per bucket) */
+        std::vector<Entry> table;
+        /* number of buckets - 1 (number of buckets is a power of two) */
+        uint64_t mask;
+        /* maximal number of buckets, that fits into the memory limit */
+        uint64_t max_buckets;
+        /* number of states in the transposition table */
+        uint64_t size = 0;
+        /* number of entries, that were replaced by entries of other states */
+        uint64_t evictions = 0;
+        /* number of states, that were found in the transposition table (current call) */
+        uint64_t cache_hits = 0;
+        /* number of expanded states (current call) */
+        uint64_t nodes = 0;
+        /* maximal number of expanded states (current call) */
+        uint64_t max_nodes = 0;
+        /* maximal number of moves from the root to an expanded state (current call) */
+        int max_depth = 0;
+        /* number of expanded states, after which the clock is checked the next time */
+        uint64_t next_check = 0;
+        /* the current call has a deadline */
+        bool has_deadline = false;
+        /* the current call exceeded its time budget or number of states */
+        bool stopped = false;
+        /* deadline of the current call */
+        std::chrono::steady_clock::time_point deadline;
+        /* player, who tries to win in the current search (true for your player) */
+        bool attacker = true;
+        /* key of the current search */
+        uint64_t search_key = 0;
+        /* children of each depth (tiles entries per depth, allocated once per board size) */
+        std::vector<Child> children;
+        /* progress of the current call, that can be read during the search */
+        std::atomic<uint64_t> progress_nodes;
+        std::atomic<uint32_t> progress_proof;
+        std::atomic<uint32_t> progress_disproof;
+        std::atomic<int> progress_phase;
+
+        /**
+         * @brief Looks up the proof and disproof number of the given key.
+         *
+         * @param key key of the state
+         * @param proof proof number of the state (output, only valid if the state was found)
+         * @param disproof disproof number of the state (output, only valid if the state was found)
+         * @return true if the state was found, otherwise false
+         */
+        bool probe(uint64_t key, uint32_t& proof, uint32_t& disproof);
+
+        /**
+         * @brief Doubles the number of buckets and moves all entries into the new buckets.
+         */
+        void grow();
+
+        /**
+         * @brief Stores the proof and disproof number of the given key. The table grows if it is filled
+         * by three quarters or the bucket is full. If the table has reached the memory limit and the bucket is full,
+         * the entry with the smallest amount of work is replaced.
+         *
+         * @param key key of the state
+         * @param proof proof number of the state
+         * @param disproof disproof number of the state
+         * @param work number of expanded states below the state
+         */
+        void store(uint64_t key, uint32_t proof, uint32_t disproof, uint64_t work);
+
+        /**
+         * @brief Checks if the current call should stop (the clock is only checked every 1024 states).
+         *
+         * @return true if the time budget or the number of states is exceeded, otherwise false
+         */
+        bool is_stopped();
+
+        /**
+         * @param state current state
+         * @param your true for your player, false for enemy player
+         * @return true if the player has a line without tiles of the other player, otherwise false
+         */
+        bool has_open_lines(TicTacToeBoardC& state, bool your);
+
+        /**
+         * @brief Computes the key and the proof and disproof number of the current state without search.
+         *
+         * @param state current state
+         * @param child key, proof and disproof number of the state (output)
+         */
+        void evaluate(TicTacToeBoardC& state, Child& child);
+
+        /**
+         * @brief Expands the current state (multiple iterative deepening) until its proof number reaches
+         * the proof threshold or its disproof number reaches the disproof threshold.
+         *
+         * @param state current state (moves are done and undone in-place)
+         * @param key key of the state
+         * @param proof_threshold threshold of the proof number
+         * @param disproof_threshold threshold of the disproof number
+         * @param depth number of moves from the root
+         * @param proof proof number of the state (output)
+         * @param disproof disproof number of the state (output)
+         */
+        void mid(TicTacToeBoardC& state, uint64_t key, uint32_t proof_threshold, uint32_t disproof_threshold, int depth, uint32_t& proof, uint32_t& disproof);
+
+        /**
+         * @brief Proves or disproves the win of the given player.
+         *
+         * @param state root state
+         * @param your true for your player, false for enemy player
+         * @param action action of the proof (output, -1 if the win is disproven or the search was stopped)
+         * @return int 1 if the win is proven, 0 if the win is disproven, PROOF_NUMBER_UNKNOWN if the search was stopped
+         */
+        int prove(TicTacToeBoardC& state, bool your, int& action);
+
+    public:
+        /**
+         * @brief Construct a new ProofNumberSolverC object
+         *
+         * @param your_symbol symbol of your player
+         * @param enemy_symbol symbol of enemy player
+         * @param tiles_to_win number of tiles to place in row, column, diagonal, anti-diagonal to win the game
+         * @param memory_limit maximal size of the transposition table in bytes
+         */
+        ProofNumberSolverC(int your_symbol, int enemy_symbol, int tiles_to_win, size_t memory_limit);
+
+        /**
+         * @brief Proves the game value of the given state for your player.
+         *
+         * @param board contiguous (row-major) matrix of the current state, where your player makes the next turn
+         * @param rows number of rows of the board
+         * @param cols number of columns of the board
+         * @param time_budget_ms time budget in milliseconds (negative for no time budget)
+         * @param max_nodes maximal number of expanded states
+         * @param stats statistics of the search (output, can be nullptr)
+         * @return int 1 (win), 0 (draw), -1 (loss) for your player or PROOF_NUMBER_UNKNOWN if the search was stopped
+         */
+        int solve(const int32_t* board, int rows, int cols, double time_budget_ms, uint64_t max_nodes, ProofNumberStatsC* stats = nullptr);
+
+        /**
+         * @brief Reads the progress of the current (or last) call of solve(), which can be done during the search.
+         *
+         * @param stats number of expanded states, current search and proof and disproof number of its root (output)
+         */
+        void get_progress(ProofNumberStatsC* stats);
+
+        /**
+         * @brief Removes all entries of the transposition table and shrinks it to its initial size
+         * (the lock of the search is acquired).
+         */
+        void clear();
+
+        /**
+         * @return uint64_t number of states in the transposition table
+         */
+        uint64_t get_cache_size();
+
+        /**
+         * @return uint64_t maximal number of states in the transposition table
+         */
+        uint64_t get_cache_capacity();
+};
+#endif
@@ -0,0 +1,181 @@
+# distutils: language = c++
+# distutils: sources = ./classic_games/tictactoe/agent/proof_numberC.cpp ./classic_games/tictactoe/model/boardC.cpp ./classic_games/tictactoe/model/layoutC.cpp
+
+from libc.stdint cimport int32_t, uint32_t, uint64_t
+from typing import Callable, Optional
+import time
+import numpy as np
+
+from classic_games.tictactoe.agent.search_stats import ProofNumberStats
+
+cdef extern from "proof_numberC.h" nogil:
+    cdef int PROOF_NUMBER_UNKNOWN
+
+    cdef cppclass ProofNumberStatsC:
+        int result
+        int action
+        uint64_t nodes
+        uint64_t cache_hits
+        uint64_t cache_size
+        uint64_t evictions
+        int max_depth
+        int phase
+        uint32_t proof_number
+        uint32_t disproof_number
+        double elapsed_ms
+
+    cdef cppclass ProofNumberSolverC:
+        ProofNumberSolverC(int, int, int, size_t)
+        int solve(const int32_t* board, int rows, int cols, double time_budget_ms, uint64_t max_nodes, ProofNumberStatsC* stats)
+        void get_progress(ProofNumberStatsC* stats)
+        void clear()
+        uint64_t get_cache_size()
+        uint64_t get_cache_capacity()
+
+
+cdef class ProofNumberSolver:
+    """
+    Solver, that proves the game value (win, draw or loss) of a state with depth-first proof-number search (df-pn).
+
+    The first search proves or disproves a win of your player, the second search a win of the enemy player.
+    The proof and disproof numbers are kept in a transposition table, so a search, that is stopped by its
+    time budget or number of states, continues with the next call of solve(). The table starts small (about 100 KB)
+    and doubles its size as states are added, until it reaches memory_limit_mb. Afterwards the entries with the
+    smallest amount of work are replaced.
+    Solved states (e.g. openings of 4x4 or 5x5 boards) can be used to seed an opening book.
+
+    Thread safety: The search runs without the GIL. Concurrent calls of solve() on the same instance are safe,
+    but run one after another. The progress can be read from another thread during the search.
+    """
+    cdef ProofNumberSolverC* obj
+
+    def __cinit__(self):
+        self.obj = NULL
+
+    def __init__(self, int your_symbol = 1, int enemy_symbol = -1, int tiles_to_win = 3, double memory_limit_mb = 256):
+        cdef size_t memory_limit = <size_t>(memory_limit_mb * 2**20) if memory_limit_mb > 0 else 0
+        assert memory_limit >= 1024, "#ERROR_PROOFNUMBERPY: memory_limit_mb should be at least 1 KiB!"
+        del self.obj
+        self.obj = new ProofNumberSolverC(your_symbol, enemy_symbol, tiles_to_win, memory_limit)
+
+    def __dealloc__(self):
+        del self.obj
+
+    def solve(self, board, time_budget_ms: Optional[float] = None, max_nodes: Optional[int] = None, callback: Optional[Callable[[ProofNumberStats], Optional[bool]]] = None, int progress_interval = 100000, bint return_stats = False):
+        """
+        Proves the game value of the given state for your player. The GIL is released during the search.
+
+        With a callback, the search is interrupted after every progress_interval expanded states and the
+        callback is called with the statistics of the search so far. The search continues (with the
+        proof numbers of the transposition table), unless the callback returns False.
+
+        Args:
+            board (ObsType): current state, where your player makes the next turn
+            time_budget_ms (Optional[float]): time budget in milliseconds. Defaults to None (no time budget)
+            max_nodes (Optional[int]): maximal number of expanded states. Defaults to None (no limit)
+            callback (Optional[Callable[[ProofNumberStats], Optional[bool]]]): function, that receives the progress.
+                Defaults to None
+            progress_interval (int): number of expanded states between two calls of the callback. Defaults to 100000
+            return_stats (bool): return the statistics of the search. Defaults to False
+
+        Returns:
+            Optional[int] | tuple[Optional[int], ProofNumberStats]: 1 (win), 0 (draw) or -1 (loss) for your player,
+                None if the value is not proven within the limits (and the statistics of the search)
+        """
+        cdef const int32_t[:, ::1] tiles = np.ascontiguousarray(board, dtype=np.int32)
+        cdef ProofNumberStatsC stats
+        cdef double budget = -1.0
+        cdef uint64_t chunk
+        cdef int result
+        if time_budget_ms is not None:
+            assert time_budget_ms >= 0, "#ERROR_PROOFNUMBERPY: time_budget_ms should be higher or equal to 0!"
+        if max_nodes is not None:
+            assert max_nodes >= 1, "#ERROR_PROOFNUMBERPY: max_nodes should be higher or equal to 1!"
+        assert progress_interval >= 1, "#ERROR_PROOFNUMBERPY: progress_interval should be higher or equal to 1!"
+
+        start = time.perf_counter()
+        remaining_nodes = max_nodes
+        nodes = cache_hits = evictions = max_depth = 0
+        while True:
+            # Each call stops after the remaining time budget or the next interval of states
+            chunk = np.iinfo(np.uint64).max if callback is None else progress_interval
+            if remaining_nodes is not None:
+                chunk = min(chunk, remaining_nodes)
+            if time_budget_ms is not None:
+                budget = max(0.0, time_budget_ms - 1000.0 * (time.perf_counter() - start))
+            with nogil:
+                result = self.obj.solve(&tiles[0, 0], tiles.shape[0], tiles.shape[1], budget, chunk, &stats)
+            nodes += stats.nodes
+            cache_hits += stats.cache_hits
+            evictions = stats.evictions
+            max_depth = max(max_depth, stats.max_depth)
+            summary = ProofNumberStats(
+                result=None if result == PROOF_NUMBER_UNKNOWN else result,
+                action=stats.action,
+                nodes=nodes,
+                cache_hits=cache_hits,
+                cache_size=stats.cache_size,
+                evictions=evictions,
+                max_depth=max_depth,
+                phase=stats.phase,
+                proof_number=stats.proof_number,
+                disproof_number=stats.disproof_number,
+                elapsed_ms=1000.0 * (time.perf_counter() - start),
+            )
+            if remaining_nodes is not None:
+                remaining_nodes -= stats.nodes
+            if result != PROOF_NUMBER_UNKNOWN or stats.nodes < chunk or (remaining_nodes is not None and remaining_nodes <= 0):
+                # Case: Value is proven (or the time budget or the number of states is exceeded)
+                break
+            if callback(summary) is False:
+                # Case: Callback stops the search
+                break
+        if not return_stats:
+            return summary.result
+        return summary.result, summary
+
+    @property
+    def progress(self) -> ProofNumberStats:
+        """
+        Returns the progress of the current (or last) call of the C++ search, which can be read from
+        another thread during solve().
+
+        Returns:
+            ProofNumberStats: number of expanded states, current search (phase) and the proof and
+                disproof number of its root
+        """
+        cdef ProofNumberStatsC stats
+        self.obj.get_progress(&stats)
+        return ProofNumberStats(
+            nodes=stats.nodes,
+            phase=stats.phase,
+            proof_number=stats.proof_number,
+            disproof_number=stats.disproof_number,
+        )
+
+    def clear(self):
+        """
+        Removes all entries of the transposition table, so that the next search starts from scratch.
+        """
+        with nogil:
+            self.obj.clear()
+
+    @property
+    def cache_size(self) -> int:
+        """
+        Returns the number of states in the transposition table.
+
+        Returns:
+            int: number of states
+        """
+        return self.obj.get_cache_size()
+
+    @property
+    def cache_capacity(self) -> int:
+        """
+        Returns the maximal number of states in the transposition table (given by the memory limit).
+
+        Returns:
+            int: maximal number of states
+        """
+        return self.obj.get_cache_capacity()
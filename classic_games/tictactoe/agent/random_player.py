@@ -30,7 +30,7 @@ class RandomPlayer(Player):
             tiles_to_win=self._tiles_to_win,
             your_start=True,
         )
-        actions = state.get_actions()
+        actions = np.flatnonzero(state.get_action_mask())
         return int(np.random.choice(actions))
 
     def act(self, board: ObsType) -> int:
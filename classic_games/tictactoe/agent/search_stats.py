@@ -0,0 +1,89 @@
+from dataclasses import dataclass, asdict, field
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class SearchStats:
+    """
+    action (int): best action of the search
+    value (float): value of the root for your player (wins are higher or equal to the number of tiles,
+        losses are lower or equal to the negative number of tiles, other values are heuristic evaluations)
+    nodes (int): number of visited states (of all threads)
+    cutoffs (int): number of states, where an action caused a beta cutoff (of all threads)
+    cache_hits (int): number of states, that were found in the cache or opening book (of all threads)
+    max_depth (int): maximal number of moves from the root to a visited state
+    completed_depth (int): maximal depth of the last completed search
+    elapsed_ms (float): duration of the search in milliseconds
+    pv (list[int]): best actions of both players from the root (principal variation)
+    """
+    action: int = -1
+    value: float = 0.0
+    nodes: int = 0
+    cutoffs: int = 0
+    cache_hits: int = 0
+    max_depth: int = 0
+    completed_depth: int = 0
+    elapsed_ms: float = 0.0
+    pv: list[int] = field(default_factory=list)
+
+    @property
+    def nodes_per_second(self) -> float:
+        """
+        Returns:
+            float: number of visited states per second (0 if the search took no measurable time)
+        """
+        if self.elapsed_ms <= 0:
+            return 0.0
+        return 1000.0 * self.nodes / self.elapsed_ms
+
+    def to_dict(self) -> dict:
+        """
+        Returns:
+            dict: dictionary representation of the dataclass.
+        """
+        return {**asdict(self), "nodes_per_second": self.nodes_per_second}
+
+
+@dataclass(frozen=True)
+class ProofNumberStats:
+    """
+    result (Optional[int]): game value for your player (1: win, 0: draw, -1: loss), None if it is not proven yet
+    action (int): action, that reaches the result (-1 if the result is unknown or the game is already over)
+    nodes (int): number of expanded states
+    cache_hits (int): number of states, that were found in the transposition table
+    cache_size (int): number of states in the transposition table
+    evictions (int): number of entries, that were replaced by entries of other states
+    max_depth (int): maximal number of moves from the root to an expanded state
+    phase (int): last search (0: win of your player, 1: win of the enemy player)
+    proof_number (int): proof number of the root in the last search
+    disproof_number (int): disproof number of the root in the last search
+    elapsed_ms (float): duration of the search in milliseconds
+    """
+    result: Optional[int] = None
+    action: int = -1
+    nodes: int = 0
+    cache_hits: int = 0
+    cache_size: int = 0
+    evictions: int = 0
+    max_depth: int = 0
+    phase: int = 0
+    proof_number: int = 0
+    disproof_number: int = 0
+    elapsed_ms: float = 0.0
+
+    @property
+    def nodes_per_second(self) -> float:
+        """
+        Returns:
+            float: number of expanded states per second (0 if the search took no measurable time)
+        """
+        if self.elapsed_ms <= 0:
+            return 0.0
+        return 1000.0 * self.nodes / self.elapsed_ms
+
+    def to_dict(self) -> dict:
+        """
+        Returns:
+            dict: dictionary representation of the dataclass.
+        """
+        return {**asdict(self), "nodes_per_second": self.nodes_per_second}
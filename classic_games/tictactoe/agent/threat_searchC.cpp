@@ -0,0 +1,385 @@
+#include "threat_searchC.h"
+#include <algorithm>
+#include <climits>
+#include <iostream>
+
+ThreatSearchC::ThreatSearchC(int your_symbol, int enemy_symbol, int tiles_to_win, int max_depth, uint64_t max_nodes) {
+    if (max_depth < 1 || max_nodes < 1) {
+        // Case: Invalid parameters
+        std::cerr << "#ERROR_THREATSEARCH: max_depth and max_nodes should be higher or equal to 1!";
+        std::abort();
+    }
+    this->your_symbol = your_symbol;
+    this->enemy_symbol = enemy_symbol;
+    this->tiles_to_win = tiles_to_win;
+    this->max_depth = max_depth;
+    this->max_nodes = max_nodes;
+}
+
+int ThreatSearchC::get_threats(TicTacToeBoardC& state, bool your) {
+    return your ? state.get_immediate_winning_moves() : state.get_immediate_blocking_moves();
+}
+
+int ThreatSearchC::get_open_lines_at(TicTacToeBoardC& state, int action, bool your, int count) {
+    return your ? state.get_your_open_lines_at(action, count) : state.get_enemy_open_lines_at(action, count);
+}
+
+int ThreatSearchC::find_threat(TicTacToeBoardC& state, bool your) {
+    const int32_t* board = state.get_current();
+    bool current = state.get_current_player() == your;
+    for (int tile = 0; tile < state.row() * state.col(); tile++) {
+        if (board[tile] == 0 && (current ? state.is_winning_action(tile) : state.is_blocking_action(tile))) {
+            return tile;
+        }
+    }
+    return -1;
+}
+
+bool ThreatSearchC::is_double_threat(TicTacToeBoardC& state, int action, bool your) {
+    // Only tiles on lines, that need two more tiles, can create threats
+    return state.get_current()[action] == 0 && get_open_lines_at(state, action, your, this->tiles_to_win - 2) > 0 && state.get_threats_after(action, your) >= 2;
+}
+
+bool ThreatSearchC::shares_line(TicTacToeBoardC& state, int action1, int action2) {
+    int cols = state.col();
+    int rows = std::abs(action1 / cols - action2 / cols), columns = std::abs(action1 % cols - action2 % cols);
+    return (rows == 0 || columns == 0 || rows == columns) && std::max(rows, columns) < this->tiles_to_win;
+}
+
+int ThreatSearchC::find_double_threats(TicTacToeBoardC& state, int action, bool your, int* tiles, int max_count) {
+    int count = 0;
+    int rows = state.row(), cols = state.col();
+    if (action < 0) {
+        // Case: All tiles
+        for (int tile = 0; tile < rows * cols && count < max_count; tile++) {
+            if (this->is_double_threat(state, tile, your)) {
+                tiles[count++] = tile;
+            }
+        }
+        return count;
+    }
+
+    // New double threat tiles share a line with the last action
+    static const int directions[4][2] = {{0, 1}, {1, 0}, {1, 1}, {1, -1}};
+    int row = action / cols, col = action % cols;
+    for (const auto& direction : directions) {
+        for (int i = 1 - this->tiles_to_win; i < this->tiles_to_win && count < max_count; i++) {
+            int r = row + i * direction[0], c = col + i * direction[1];
+            if (i != 0 && 0 <= r && r < rows && 0 <= c && c < cols && this->is_double_threat(state, r * cols + c, your)) {
+                tiles[count++] = r * cols + c;
+            }
+        }
+    }
+    return count;
+}
+
+bool ThreatSearchC::depends_on_gains(TicTacToeBoardC& state, int action) {
+    if (this->gains.empty()) {
+        // Case: First action of the attacker
+        return true;
+    }
+    for (int gain : this->gains) {
+        if (this->shares_line(state, action, gain)) {
+            return true;
+        }
+    }
+    return false;
+}
+
+void ThreatSearchC::push_gain(int action) {
+    this->gains.push_back(action);
+    this->gains_key ^= mix(action);
+}
+
+void ThreatSearchC::pop_gain() {
+    this->gains_key ^= mix(this->gains.back());
+    this->gains.pop_back();
+}
+
+uint64_t ThreatSearchC::mix(int action) {
+    // Finalizer of splitmix64
+    uint64_t z = static_cast<uint64_t>(action + 1) * 0x9E3779B97F4A7C15ULL;
+    z = (z ^ (z >> 30)) * 0xBF58476D1CE4E5B9ULL;
+    z = (z ^ (z >> 27)) * 0x94D049BB133111EBULL;
+    return z ^ (z >> 31);
+}
+
+void ThreatSearchC::prepare(TicTacToeBoardC& state) {
+    // Attacker and defender make at most two moves per action of the attacker (and one more move at the root)
+    size_t size = static_cast<size_t>(2 * this->max_depth + 4) * state.row() * state.col();
+    if (this->actions.size() != size) {
+        // Case: New size of the board
+        this->actions.assign(size, 0);
+        this->priorities.assign(size, 0);
+        this->double_threats.assign(size, 0);
+    }
+    this->results.clear();
+    this->gains.clear();
+    this->gains_key = 0;
+    this->nodes = 0;
+    this->aborted = false;
+}
+
+template <typename Priority>
+int ThreatSearchC::order_actions(TicTacToeBoardC& state, int ply, Priority priority) {
+    int tiles = state.row() * state.col();
+    int* actions = &this->actions[ply * tiles];
+    int* priorities = &this->priorities[ply * tiles];
+    const int32_t* board = state.get_current();
+    int count = 0;
+    for (int tile = 0; tile < tiles; tile++) {
+        int value = board[tile] == 0 ? priority(tile) : 0;
+        if (value <= 0) {
+            // Case: Tile is taken or irrelevant
+            continue;
+        }
+
+        // Insert the action (stable, so that equal priorities stay in row-major order)
+        int j = count++;
+        while (j > 0 && priorities[j - 1] < value) {
+            actions[j] = actions[j - 1];
+            priorities[j] = priorities[j - 1];
+            j--;
+        }
+        actions[j] = tile;
+        priorities[j] = value;
+    }
+    return count;
+}
+
+bool ThreatSearchC::attack(TicTacToeBoardC& state, int depth, int ply, int& best_action) {
+    best_action = -1;
+    if (++this->nodes > this->max_nodes) {
+        // Case: Search is too large
+        this->aborted = true;
+        return false;
+    }
+    if (state.check_terminated()) {
+        return false;
+    }
+    int k = this->tiles_to_win;
+    bool your = state.get_current_player();
+    if (get_threats(state, your) > 0) {
+        // Case: Attacker wins with the next turn
+        best_action = find_threat(state, your);
+        return true;
+    }
+    int other_threats = get_threats(state, !your);
+    if (other_threats > 1 || depth == 0) {
+        // Case: Defender wins (or the attacker has no actions left)
+        return false;
+    } else if (other_threats == 1) {
+        // Case: Attacker has to block the threat of the defender
+        int action = find_threat(state, !your);
+        state.push(action);
+        this->push_gain(action);
+        bool win = this->defend(state, depth - 1, ply + 1);
+        this->pop_gain();
+        state.pop();
+        best_action = win ? action : -1;
+        return win;
+    }
+
+    // Results of other move orders (the root needs the action, so it is always searched)
+    uint64_t hash = state.get_hash_key() ^ this->gains_key;
+    if (ply > 0) {
+        auto it = this->results.find(hash);
+        if (it != this->results.end() && depth >= it->second.first) {
+            // Case: Win is already found with less actions
+            return true;
+        } else if (it != this->results.end() && depth <= it->second.second) {
+            // Case: No win is found with more actions
+            return false;
+        }
+    }
+
+    // Actions, that create fours, are searched before actions, that create threes.
+    // After the first action, only actions on the lines of the previous actions are searched (dependent threats).
+    int count = this->order_actions(state, ply, [&](int tile) {
+        if (!this->depends_on_gains(state, tile)) {
+            return 0;
+        }
+        int fours = get_open_lines_at(state, tile, your, k - 2);
+        int threes = k >= 3 ? get_open_lines_at(state, tile, your, k - 3) : 0;
+        return fours * 64 + threes;
+    });
+    const int* actions = &this->actions[ply * state.row() * state.col()];
+    for (int i = 0; i < count; i++) {
+        int action = actions[i];
+        state.push(action);
+        // Only actions, that create a four or a double threat tile, force the defender
+        int double_threat = -1;
+        bool forcing = get_threats(state, your) > 0 || this->find_double_threats(state, action, your, &double_threat, 1) > 0;
+        this->push_gain(action);
+        bool win = forcing && this->defend(state, depth - 1, ply + 1);
+        this->pop_gain();
+        state.pop();
+        if (win) {
+            // Case: Forced win found
+            best_action = action;
+            auto& result = this->results.emplace(hash, std::make_pair(INT_MAX, -1)).first->second;
+            result.first = std::min(result.first, depth);
+            return true;
+        }
+        if (this->aborted) {
+            return false;
+        }
+    }
+    auto& result = this->results.emplace(hash, std::make_pair(INT_MAX, -1)).first->second;
+    result.second = std::max(result.second, depth);
+    return false;
+}
+
+bool ThreatSearchC::defend(TicTacToeBoardC& state, int depth, int ply) {
+    if (++this->nodes > this->max_nodes) {
+        // Case: Search is too large
+        this->aborted = true;
+        return false;
+    }
+    if (state.check_terminated()) {
+        return false;
+    }
+    int k = this->tiles_to_win;
+    bool your = state.get_current_player();
+    if (get_threats(state, your) > 0) {
+        // Case: Defender wins with the next turn
+        return false;
+    }
+    int attacker_threats = get_threats(state, !your);
+    int reply = -1;
+    if (attacker_threats > 1) {
+        // Case: Defender cannot block all fours
+        return true;
+    } else if (attacker_threats == 1) {
+        // Case: Defender has to block the four
+        int action = find_threat(state, !your);
+        state.push(action);
+        bool win = this->attack(state, depth, ply + 1, reply);
+        state.pop();
+        return win;
+    }
+    int* double_threats = &this->double_threats[ply * state.row() * state.col()];
+    int num_double_threats = this->find_double_threats(state, -1, !your, double_threats, state.row() * state.col());
+    if (num_double_threats == 0) {
+        // Case: Attacker has no threat (defender has a free action)
+        return false;
+    }
+
+    // Other actions do not change the lines of the double threat tiles (and create no four of the defender)
+    bool fours = (your ? state.get_your_open_lines(k - 2) : state.get_enemy_open_lines(k - 2)) > 0;
+    int count = this->order_actions(state, ply, [&](int tile) {
+        int value = fours ? get_open_lines_at(state, tile, your, k - 2) : 0;
+        for (int j = 0; j < num_double_threats; j++) {
+            if (this->shares_line(state, tile, double_threats[j])) {
+                return value + 1 + 2 * get_open_lines_at(state, tile, !your, k - 2);
+            }
+        }
+        return value;
+    });
+    const int* actions = &this->actions[ply * state.row() * state.col()];
+    for (int i = 0; i < count; i++) {
+        state.push(actions[i]);
+        // Actions without an own four, that leave a double threat tile, lose immediately
+        bool win = false;
+        for (int j = 0; j < num_double_threats && !win && get_threats(state, your) == 0; j++) {
+            win = this->is_double_threat(state, double_threats[j], !your);
+        }
+        win = win || this->attack(state, depth, ply + 1, reply);
+        state.pop();
+        if (!win) {
+            // Case: Defender stops the attack (or the search is too large)
+            return false;
+        }
+    }
+    return true;
+}
+
+bool ThreatSearchC::deepening(TicTacToeBoardC& state, int& best_action) {
+    // Short wins are found first (results of the previous depths are reused)
+    for (int depth = 1; depth <= this->max_depth && !this->aborted; depth++) {
+        if (this->attack(state, depth, 0, best_action)) {
+            return true;
+        }
+    }
+    return false;
+}
+
+int ThreatSearchC::winning_action(TicTacToeBoardC& state) {
+    this->prepare(state);
+    int best_action = -1;
+    this->deepening(state, best_action);
+    return best_action;
+}
+
+int ThreatSearchC::defending_action(TicTacToeBoardC& state, const int32_t* board) {
+    this->prepare(state);
+    if (state.check_terminated() || get_threats(state, true) > 0) {
+        // Case: No action possible (or your player wins with the next turn)
+        return -1;
+    } else if (get_threats(state, false) > 0) {
+        // Case: Four of the enemy player has to be blocked
+        return find_threat(state, false);
+    }
+
+    // Search the forced win of the enemy player, as if your player would not make a turn
+    int k = this->tiles_to_win;
+    TicTacToeBoardC passed = TicTacToeBoardC(board, state.row(), state.col(), k, this->your_symbol, this->enemy_symbol, false);
+    int enemy_action = -1;
+    if (!this->deepening(passed, enemy_action)) {
+        // Case: Enemy player has no forced win (or the search is too large)
+        return -1;
+    }
+
+    // Actions on the lines of the enemy player, that could become threats, and own fours
+    int count = this->order_actions(state, 0, [&](int tile) {
+        int fours = get_open_lines_at(state, tile, false, k - 2);
+        int threes = k >= 3 ? get_open_lines_at(state, tile, false, k - 3) : 0;
+        int own_fours = get_open_lines_at(state, tile, true, k - 2);
+        return (tile == enemy_action) * 4096 + fours * 64 + own_fours * 8 + threes;
+    });
+    for (int i = 0; i < count; i++) {
+        int action = this->actions[i];
+        int reply = -1;
+        state.push(action);
+        bool lost = this->attack(state, this->max_depth, 1, reply);
+        state.pop();
+        if (this->aborted) {
+            // Case: Search is too large (no reliable defense)
+            return -1;
+        } else if (!lost) {
+            // Case: Enemy player has no forced win anymore
+            return action;
+        }
+    }
+    return -1;
+}
+
+int ThreatSearchC::find_winning_action(const int32_t* board, int rows, int cols) {
+    std::lock_guard<std::mutex> lock(this->search_mutex);
+    TicTacToeBoardC state = TicTacToeBoardC(board, rows, cols, this->tiles_to_win, this->your_symbol, this->enemy_symbol, true);
+    return this->winning_action(state);
+}
+
+int ThreatSearchC::find_defending_action(const int32_t* board, int rows, int cols) {
+    std::lock_guard<std::mutex> lock(this->search_mutex);
+    TicTacToeBoardC state = TicTacToeBoardC(board, rows, cols, this->tiles_to_win, this->your_symbol, this->enemy_symbol, true);
+    return this->defending_action(state, board);
+}
+
+int ThreatSearchC::get_forced_action(const int32_t* board, int rows, int cols) {
+    std::lock_guard<std::mutex> lock(this->search_mutex);
+    TicTacToeBoardC state = TicTacToeBoardC(board, rows, cols, this->tiles_to_win, this->your_symbol, this->enemy_symbol, true);
+    int action = this->winning_action(state);
+    if (action >= 0) {
+        // Case: Forced win
+        return action;
+    }
+    uint64_t nodes = this->nodes;
+    action = this->defending_action(state, board);
+    this->nodes += nodes;
+    return action;
+}
+
+uint64_t ThreatSearchC::get_nodes() {
+    return this->nodes;
+}
@@ -0,0 +1,242 @@
+#ifndef THREATSEARCH_H
+#define THREATSEARCH_H
+
+#include "../model/boardC.h"
+#include <cstdint>
+#include <mutex>
+#include <unordered_map>
+#include <utility>
+#include <vector>
+
+/**
+ * @brief Threat-space search, which only searches forcing actions to find forced wins (and defenses against them).
+ *
+ * A threat (four) is an empty tile, that completes a line of a player. The attacker only plays actions, that create
+ * a threat or a double threat tile (three), which is an empty tile, that would create at least two threats at once.
+ * The defender only plays actions, that can stop the attack: the single action against a four, otherwise the tiles
+ * in the lines of the attacker, that need two more tiles, and actions that create an own four.
+ * After the first action, the attacker only searches actions on the lines of its previous actions (dependent threats).
+ * A found win is a proof, but the search is limited by the number of attacker actions and the number of states,
+ * so a win can be missed.
+ *
+ * Thread safety: Concurrent calls on the same object are serialized.
+ */
+class ThreatSearchC {
+    private:
+        /* lock of the current search (only one search per object at the same time) */
+        std::mutex search_mutex;
+        int your_symbol;
+        int enemy_symbol;
+        int tiles_to_win;
+        /* maximal number of actions of the attacker */
+        int max_depth;
+        /* maximal number of visited states per search */
+        uint64_t max_nodes;
+        /* number of visited states of the current search */
+        uint64_t nodes = 0;
+        /* the current search exceeded the maximal number of visited states */
+        bool aborted = false;
+        /* actions of each ply (tiles entries per ply, allocated once per board size) */
+        std::vector<int> actions;
+        /* priorities of the actions of each ply (tiles entries per ply) */
+        std::vector<int> priorities;
+        /* double threat tiles of the attacker of each ply (tiles entries per ply) */
+        std::vector<int> double_threats;
+        /* actions of the attacker in the current sequence */
+        std::vector<int> gains;
+        /* hash of the actions of the attacker in the current sequence */
+        uint64_t gains_key = 0;
+        /* results of the attacker per zobrist hash (lowest depth of a found win, highest depth without a win) */
+        std::unordered_map<uint64_t, std::pair<int, int>> results;
+
+        /**
+         * @param state current state
+         * @param your true for your player, false for enemy player
+         * @return int number of threats (fours) of the player
+         */
+        static int get_threats(TicTacToeBoardC& state, bool your);
+
+        /**
+         * @param state current state
+         * @param action encoding of the position (n*row + col)
+         * @param your true for your player, false for enemy player
+         * @param count number of tiles in the line
+         * @return int number of open lines of the player through the position with count tiles
+         */
+        static int get_open_lines_at(TicTacToeBoardC& state, int action, bool your, int count);
+
+        /**
+         * @brief Returns the first empty tile, that completes a line of the given player.
+         *
+         * @param state current state
+         * @param your true for your player, false for enemy player
+         * @return int encoding of the position (-1 if the player has no threat)
+         */
+        static int find_threat(TicTacToeBoardC& state, bool your);
+
+        /**
+         * @brief Checks if the given empty tile would create at least two threats at once for the given player.
+         *
+         * @param state current state
+         * @param action encoding of the position (n*row + col)
+         * @param your true for your player, false for enemy player
+         * @return true if the tile is a double threat tile, otherwise false
+         */
+        bool is_double_threat(TicTacToeBoardC& state, int action, bool your);
+
+        /**
+         * @param state current state
+         * @param action1 encoding of the first position (n*row + col)
+         * @param action2 encoding of the second position (n*row + col)
+         * @return true if both positions can be in the same line, otherwise false
+         */
+        bool shares_line(TicTacToeBoardC& state, int action1, int action2);
+
+        /**
+         * @brief Writes the double threat tiles of the given player on the lines through the given position.
+         * All new double threat tiles after an action are found this way.
+         *
+         * @param state current state
+         * @param action encoding of the position (n*row + col), -1 to search all tiles
+         * @param your true for your player, false for enemy player
+         * @param tiles encoding of the positions (output)
+         * @param max_count maximal number of double threat tiles to write
+         * @return int number of double threat tiles
+         */
+        int find_double_threats(TicTacToeBoardC& state, int action, bool your, int* tiles, int max_count);
+
+        /**
+         * @param state current state
+         * @param action encoding of the position (n*row + col)
+         * @return true if the position shares a line with an action of the attacker in the current sequence
+         * (or the sequence is empty), otherwise false
+         */
+        bool depends_on_gains(TicTacToeBoardC& state, int action);
+
+        /**
+         * @brief Adds the action of the attacker to the current sequence.
+         *
+         * @param action encoding of the position (n*row + col)
+         */
+        void push_gain(int action);
+
+        /**
+         * @brief Removes the last action of the attacker from the current sequence.
+         */
+        void pop_gain();
+
+        /**
+         * @param action encoding of the position (n*row + col)
+         * @return uint64_t hash of the action
+         */
+        static uint64_t mix(int action);
+
+        /**
+         * @brief Sets up the buffers of the actions for the given board size and removes the old results.
+         *
+         * @param state root state
+         */
+        void prepare(TicTacToeBoardC& state);
+
+        /**
+         * @brief Writes the actions of the given ply sorted by their priority (highest priority first).
+         * Actions with a priority of 0 are removed.
+         *
+         * @param state current state
+         * @param ply number of moves from the root
+         * @param priority function, that returns the priority of an empty tile
+         * @return int number of actions
+         */
+        template <typename Priority>
+        int order_actions(TicTacToeBoardC& state, int ply, Priority priority);
+
+        /**
+         * @brief Searches a forced win of the current player (attacker).
+         *
+         * @param state current state (moves are done and undone in-place)
+         * @param depth remaining number of actions of the attacker
+         * @param ply number of moves from the root
+         * @param best_action first action of the forced win (output, -1 if there is no win)
+         * @return true if the attacker has a forced win, otherwise false
+         */
+        bool attack(TicTacToeBoardC& state, int depth, int ply, int& best_action);
+
+        /**
+         * @brief Checks if the other player (attacker) wins against all actions of the current player (defender).
+         *
+         * @param state current state (moves are done and undone in-place)
+         * @param depth remaining number of actions of the attacker
+         * @param ply number of moves from the root
+         * @return true if the attacker has a forced win, otherwise false
+         */
+        bool defend(TicTacToeBoardC& state, int depth, int ply);
+
+        /**
+         * @brief Searches a forced win of the current player with increasing number of actions of the attacker.
+         *
+         * @param state root state
+         * @param best_action first action of the shortest forced win (output, -1 if there is no win)
+         * @return true if the current player has a forced win, otherwise false
+         */
+        bool deepening(TicTacToeBoardC& state, int& best_action);
+
+        /**
+         * @brief Searches a forced win of your player (the lock of the search should be held).
+         */
+        int winning_action(TicTacToeBoardC& state);
+
+        /**
+         * @brief Searches an action against a forced win of the enemy player (the lock of the search should be held).
+         */
+        int defending_action(TicTacToeBoardC& state, const int32_t* board);
+
+    public:
+        /**
+         * @brief Construct a new ThreatSearchC object
+         *
+         * @param your_symbol symbol of your player
+         * @param enemy_symbol symbol of enemy player
+         * @param tiles_to_win number of tiles to place in row, column, diagonal, anti-diagonal to win the game
+         * @param max_depth maximal number of actions of the attacker
+         * @param max_nodes maximal number of visited states per search
+         */
+        ThreatSearchC(int your_symbol, int enemy_symbol, int tiles_to_win, int max_depth, uint64_t max_nodes);
+
+        /**
+         * @brief Returns the first action of a forced win of your player, which only consists of threats.
+         *
+         * @param board contiguous (row-major) matrix of the current state, where your player makes the next turn
+         * @param rows number of rows of the board
+         * @param cols number of columns of the board
+         * @return int first action of the forced win (-1 if no forced win was found)
+         */
+        int find_winning_action(const int32_t* board, int rows, int cols);
+
+        /**
+         * @brief Returns an action against the forced win of the enemy player, if the enemy player would have
+         * a forced win with the next turn.
+         *
+         * @param board contiguous (row-major) matrix of the current state, where your player makes the next turn
+         * @param rows number of rows of the board
+         * @param cols number of columns of the board
+         * @return int action, after which the enemy player has no forced win
+         * (-1 if the enemy player has no forced win or no such action was found)
+         */
+        int find_defending_action(const int32_t* board, int rows, int cols);
+
+        /**
+         * @brief Returns the action of a forced win, otherwise the action against a forced win of the enemy player.
+         *
+         * @param board contiguous (row-major) matrix of the current state, where your player makes the next turn
+         * @param rows number of rows of the board
+         * @param cols number of columns of the board
+         * @return int forced action (-1 if there is no forced action)
+         */
+        int get_forced_action(const int32_t* board, int rows, int cols);
+
+        /**
+         * @return uint64_t number of visited states of the last search
+         */
+        uint64_t get_nodes();
+};
+#endif
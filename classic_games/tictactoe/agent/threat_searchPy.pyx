@@ -0,0 +1,102 @@
+# distutils: language = c++
+# distutils: sources = ./classic_games/tictactoe/agent/threat_searchC.cpp ./classic_games/tictactoe/model/boardC.cpp ./classic_games/tictactoe/model/layoutC.cpp
+
+from libc.stdint cimport int32_t, uint64_t
+import numpy as np
+
+cdef extern from "threat_searchC.h" nogil:
+    cdef cppclass ThreatSearchC:
+        ThreatSearchC(int, int, int, int, uint64_t)
+        int find_winning_action(const int32_t* board, int rows, int cols)
+        int find_defending_action(const int32_t* board, int rows, int cols)
+        int get_forced_action(const int32_t* board, int rows, int cols)
+        uint64_t get_nodes()
+
+
+cdef class ThreatSearch:
+    """
+    Threat-space search, which only searches forcing actions (fours, threes and double threats)
+    to find forced wins or forced defenses on large boards (e.g. 7x7 or larger with 4 or 5 tiles to win).
+
+    A found win is always correct, but the search is limited by the number of actions of the attacker
+    (max_depth) and the number of visited states (max_nodes), so that it can be used as a fast
+    pre-check before a full search. If no forced action is found, -1 is returned.
+
+    Thread safety: The search runs without the GIL. Concurrent calls on the same instance are safe,
+    but run one after another.
+    """
+    cdef ThreatSearchC* obj
+
+    def __cinit__(self):
+        self.obj = NULL
+
+    def __init__(self, int your_symbol = 1, int enemy_symbol = -1, int tiles_to_win = 3, int max_depth = 8, uint64_t max_nodes = 20000):
+        assert max_depth >= 1, "#ERROR_THREATSEARCHPY: max_depth should be higher or equal to 1!"
+        assert max_nodes >= 1, "#ERROR_THREATSEARCHPY: max_nodes should be higher or equal to 1!"
+        del self.obj
+        self.obj = new ThreatSearchC(your_symbol, enemy_symbol, tiles_to_win, max_depth, max_nodes)
+
+    def __dealloc__(self):
+        del self.obj
+
+    def find_winning_action(self, board) -> int:
+        """
+        Returns the first action of a forced win of your player, that only consists of threats.
+        The GIL is released during the search.
+
+        Args:
+            board (ObsType): current state, where your player makes the next turn
+
+        Returns:
+            int: first action of the forced win (-1 if no forced win was found)
+        """
+        cdef const int32_t[:, ::1] tiles = np.ascontiguousarray(board, dtype=np.int32)
+        cdef int action
+        with nogil:
+            action = self.obj.find_winning_action(&tiles[0, 0], tiles.shape[0], tiles.shape[1])
+        return action
+
+    def find_defending_action(self, board) -> int:
+        """
+        Returns an action against the forced win, that the enemy player would have with the next turn.
+        The GIL is released during the search.
+
+        Args:
+            board (ObsType): current state, where your player makes the next turn
+
+        Returns:
+            int: action, after which the enemy player has no forced win (-1 if the enemy player has
+                no forced win or no such action was found)
+        """
+        cdef const int32_t[:, ::1] tiles = np.ascontiguousarray(board, dtype=np.int32)
+        cdef int action
+        with nogil:
+            action = self.obj.find_defending_action(&tiles[0, 0], tiles.shape[0], tiles.shape[1])
+        return action
+
+    def get_forced_action(self, board) -> int:
+        """
+        Returns the action of a forced win, otherwise the action against a forced win of the enemy player.
+        The GIL is released during the search.
+
+        Args:
+            board (ObsType): current state, where your player makes the next turn
+
+        Returns:
+            int: forced action (-1 if there is no forced action)
+        """
+        cdef const int32_t[:, ::1] tiles = np.ascontiguousarray(board, dtype=np.int32)
+        cdef int action
+        with nogil:
+            action = self.obj.get_forced_action(&tiles[0, 0], tiles.shape[0], tiles.shape[1])
+        return action
+
+    @property
+    def nodes(self) -> int:
+        """
+        Returns the number of visited states of the last search.
+
+        Returns:
+            int: number of visited states
+        """
+        return self.obj.get_nodes()
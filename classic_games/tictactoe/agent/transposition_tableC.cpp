@@ -0,0 +1,189 @@
+#include "transposition_tableC.h"
+#include <cstring>
+
+/* Slots in shared memory need atomics without locks (address-free) */
+static_assert(std::atomic<uint64_t>::is_always_lock_free, "atomic<uint64_t> should be lock-free");
+
+TranspositionTableC::TranspositionTableC(size_t capacity) {
+    // Round the number of buckets up to a power of two
+    size_t buckets = 1;
+    while (2 * buckets < capacity) {
+        buckets *= 2;
+    }
+    this->capacity = 2 * buckets;
+    this->owned_slots.reset(new Slot[this->capacity]);
+    this->slots = this->owned_slots.get();
+    this->mask = buckets - 1;
+    this->clear();
+}
+
+TranspositionTableC::TranspositionTableC(void* memory, size_t bytes) {
+    // Round the number of buckets down to a power of two
+    size_t buckets = 1;
+    while (4 * buckets * sizeof(Slot) <= bytes) {
+        buckets *= 2;
+    }
+    this->capacity = 2 * buckets;
+    this->slots = static_cast<Slot*>(memory);
+    this->mask = buckets - 1;
+    this->hits = 0;
+    this->misses = 0;
+    this->evictions = 0;
+}
+
+size_t TranspositionTableC::required_bytes(size_t capacity) {
+    size_t buckets = 1;
+    while (2 * buckets < capacity) {
+        buckets *= 2;
+    }
+    return 2 * buckets * sizeof(Slot);
+}
+
+uint64_t TranspositionTableC::pack(const MiniMaxEntryC& entry) {
+    uint32_t value;
+    std::memcpy(&value, &entry.value, sizeof(value));
+    return uint64_t(value)
+        | (uint64_t(static_cast<uint16_t>(entry.action)) << 32)
+        | (uint64_t(entry.depth + 1) << 48)
+        | (uint64_t(entry.bound) << 62);
+}
+
+MiniMaxEntryC TranspositionTableC::unpack(uint64_t data) {
+    MiniMaxEntryC entry;
+    uint32_t value = static_cast<uint32_t>(data);
+    std::memcpy(&entry.value, &value, sizeof(value));
+    entry.action = static_cast<int16_t>(static_cast<uint16_t>(data >> 32));
+    entry.depth = static_cast<int16_t>((data >> 48) & 0x3FFF) - 1;
+    entry.bound = static_cast<MiniMaxBoundC>(data >> 62);
+    return entry;
+}
+
+uint64_t TranspositionTableC::read(const Slot& slot, uint64_t& key) {
+    uint64_t data = slot.data.load(std::memory_order_relaxed);
+    key = slot.key.load(std::memory_order_relaxed) ^ data;
+    return data;
+}
+
+void TranspositionTableC::write(Slot& slot, uint64_t key, uint64_t data) {
+    slot.key.store(key ^ data, std::memory_order_relaxed);
+    slot.data.store(data, std::memory_order_relaxed);
+}
+
+bool TranspositionTableC::probe(uint64_t key, MiniMaxEntryC& entry) {
+    Slot* bucket = &this->slots[2 * (key & this->mask)];
+    for (int i = 0; i < 2; i++) {
+        uint64_t slot_key;
+        uint64_t data = read(bucket[i], slot_key);
+        if (data != 0 && slot_key == key) {
+            // Case: State is in the table
+            entry = unpack(data);
+            this->hits.fetch_add(1, std::memory_order_relaxed);
+            return true;
+        }
+    }
+    this->misses.fetch_add(1, std::memory_order_relaxed);
+    return false;
+}
+
+void TranspositionTableC::store(uint64_t key, const MiniMaxEntryC& entry) {
+    if (entry.depth > TRANSPOSITION_TABLE_MAX_DEPTH) {
+        // Case: Depth does not fit into the packed entry
+        return;
+    }
+    Slot* bucket = &this->slots[2 * (key & this->mask)];
+    uint64_t key0, key1;
+    uint64_t data0 = read(bucket[0], key0);
+    uint64_t data1 = read(bucket[1], key1);
+    int depth0 = unpack(data0).depth;
+    uint64_t data = pack(entry);
+
+    if (data0 != 0 && key0 == key) {
+        // Case: State is in the depth-preferred slot
+        write(bucket[0], key, data);
+        return;
+    }
+    if (data1 != 0 && key1 == key) {
+        // Case: State is in the always-replace slot
+        if (entry.depth >= depth0) {
+            // Case: Move the state into the depth-preferred slot
+            write(bucket[1], key0, data0);
+            write(bucket[0], key, data);
+        } else {
+            write(bucket[1], key, data);
+        }
+        return;
+    }
+
+    // Case: State is not in the table
+    if (entry.depth >= depth0) {
+        // Case: Deeper search than the depth-preferred slot (keep the old entry in the always-replace slot)
+        if (data0 != 0) {
+            if (data1 != 0) {
+                this->evictions.fetch_add(1, std::memory_order_relaxed);
+            }
+            write(bucket[1], key0, data0);
+        }
+        write(bucket[0], key, data);
+    } else {
+        if (data1 != 0) {
+            this->evictions.fetch_add(1, std::memory_order_relaxed);
+        }
+        write(bucket[1], key, data);
+    }
+}
+
+size_t TranspositionTableC::export_entries(uint64_t* keys, uint64_t* data, size_t capacity) {
+    size_t count = 0;
+    for (size_t i = 0; i < this->capacity && count < capacity; i++) {
+        uint64_t key;
+        uint64_t slot_data = read(this->slots[i], key);
+        if (slot_data != 0) {
+            // Case: Slot is not empty
+            keys[count] = key;
+            data[count] = slot_data;
+            count++;
+        }
+    }
+    return count;
+}
+
+void TranspositionTableC::clear() {
+    for (size_t i = 0; i < this->capacity; i++) {
+        write(this->slots[i], 0, 0);
+    }
+    this->hits = 0;
+    this->misses = 0;
+    this->evictions = 0;
+}
+
+size_t TranspositionTableC::get_size() {
+    size_t size = 0;
+    for (size_t i = 0; i < this->capacity; i++) {
+        uint64_t key;
+        if (read(this->slots[i], key) != 0) {
+            // Case: Slot is not empty
+            size++;
+        }
+    }
+    return size;
+}
+
+size_t TranspositionTableC::get_capacity() {
+    return this->capacity;
+}
+
+uint64_t TranspositionTableC::get_hits() {
+    return this->hits;
+}
+
+uint64_t TranspositionTableC::get_misses() {
+    return this->misses;
+}
+
+uint64_t TranspositionTableC::get_evictions() {
+    return this->evictions;
+}
+
+size_t TranspositionTableC::get_bytes() {
+    return this->capacity * sizeof(Slot);
+}
@@ -0,0 +1,195 @@
+#ifndef TRANSPOSITIONTABLE_H
+#define TRANSPOSITIONTABLE_H
+
+#include <atomic>
+#include <cstddef>
+#include <cstdint>
+#include <memory>
+
+/* bound types of the values in the transposition table */
+enum class MiniMaxBoundC : uint8_t {
+    /* value is the exact minimax value */
+    EXACT = 0,
+    /* value is a lower bound of the minimax value (search failed high) */
+    LOWER = 1,
+    /* value is an upper bound of the minimax value (search failed low) */
+    UPPER = 2,
+};
+
+/**
+ * @brief Entry of the transposition table.
+ */
+struct MiniMaxEntryC {
+    /* value of the state (wins are stored relative to the state, see MiniMaxC::to_cache_value()) */
+    float value;
+    /* bound type of the value */
+    MiniMaxBoundC bound;
+    /* number of plies that were searched from the state (clamped to the number of empty tiles) */
+    int16_t depth;
+    /* best action of the state (in canonical form), -1 if there is no best action */
+    int16_t action;
+};
+
+/* maximal depth of an entry, that can be stored in the transposition table */
+#define TRANSPOSITION_TABLE_MAX_DEPTH 16382
+
+/**
+ * @brief Transposition table with a fixed capacity.
+ *
+ * The table consists of buckets with two slots. The first slot keeps the entry with the highest depth
+ * (depth-preferred) and the second slot is always replaced by newer entries (always-replace).
+ *
+ * The table can be shared by several threads without locks. Each slot stores the entry packed into
+ * 64 bits and the key xor the packed entry, so that a slot, which was written by two threads at the
+ * same time, does not match any key (lockless hashing). Concurrent stores can lose entries.
+ * The slots can also live in external (e.g. shared) memory, so that several processes use the same table.
+ */
+class TranspositionTableC {
+    private:
+        /**
+         * @brief Slot of a bucket (a packed entry of 0 marks an empty slot).
+         */
+        struct Slot {
+            /* zobrist hash of the state xor the packed entry */
+            std::atomic<uint64_t> key;
+            /* packed entry of the state */
+            std::atomic<uint64_t> data;
+        };
+
+        /* slots of all buckets (two consecutive slots per bucket) */
+        Slot* slots;
+        /* memory of the slots, if the table owns its slots (empty for external memory) */
+        std::unique_ptr<Slot[]> owned_slots;
+        /* number of slots */
+        size_t capacity;
+        /* number of buckets - 1 (number of buckets is a power of two) */
+        uint64_t mask;
+        /* number of successful lookups */
+        std::atomic<uint64_t> hits;
+        /* number of unsuccessful lookups */
+        std::atomic<uint64_t> misses;
+        /* number of entries, that were replaced by entries of other states */
+        std::atomic<uint64_t> evictions;
+
+        /**
+         * @brief Reads the key and the packed entry of the given slot.
+         *
+         * @param slot slot of a bucket
+         * @param key zobrist hash of the state (output, only valid for non-empty slots)
+         * @return uint64_t packed entry (0 if the slot is empty or was written by two threads at the same time)
+         */
+        static uint64_t read(const Slot& slot, uint64_t& key);
+
+        /**
+         * @brief Writes the key and the packed entry into the given slot.
+         *
+         * @param slot slot of a bucket
+         * @param key zobrist hash of the state
+         * @param data packed entry (0 to empty the slot)
+         */
+        static void write(Slot& slot, uint64_t key, uint64_t data);
+
+    public:
+        /**
+         * @brief Packs the entry into 64 bits (value, action, depth + 1 and bound).
+         *
+         * @param entry entry of a state (0 <= depth <= TRANSPOSITION_TABLE_MAX_DEPTH)
+         * @return uint64_t packed entry (never 0)
+         */
+        static uint64_t pack(const MiniMaxEntryC& entry);
+
+        /**
+         * @brief Unpacks the entry from 64 bits (inverse of pack()).
+         *
+         * @param data packed entry (0 for an empty slot)
+         * @return MiniMaxEntryC entry of a state (depth of -1 for an empty slot)
+         */
+        static MiniMaxEntryC unpack(uint64_t data);
+
+        /**
+         * @brief Construct a new TranspositionTableC object
+         *
+         * @param capacity maximal number of entries (rounded up to a power of two, at least 2)
+         */
+        TranspositionTableC(size_t capacity);
+
+        /**
+         * @brief Construct a new TranspositionTableC object on external memory (e.g. shared memory of several processes).
+         * The memory is not cleared, so that entries of other tables on the same memory are kept.
+         *
+         * @param memory zero-initialized or already used memory of the slots (8-byte aligned, should live as long as the table)
+         * @param bytes size of the memory (the largest power of two of slots that fits is used, at least 2 slots)
+         */
+        TranspositionTableC(void* memory, size_t bytes);
+
+        /**
+         * @brief Returns the number of bytes of the memory for the given capacity.
+         *
+         * @param capacity maximal number of entries (rounded up to a power of two, at least 2)
+         * @return size_t number of bytes of all slots
+         */
+        static size_t required_bytes(size_t capacity);
+
+        /**
+         * @brief Looks up the entry of the given state.
+         *
+         * @param key zobrist hash of the state
+         * @param entry entry of the state (output)
+         * @return true if the state is in the table, otherwise false
+         */
+        bool probe(uint64_t key, MiniMaxEntryC& entry);
+
+        /**
+         * @brief Stores the entry of the given state according to the replacement policy.
+         *
+         * @param key zobrist hash of the state
+         * @param entry entry of the state
+         */
+        void store(uint64_t key, const MiniMaxEntryC& entry);
+
+        /**
+         * @brief Writes the keys and packed entries of all stored states (should not run concurrently to a search).
+         *
+         * @param keys buffer for the zobrist hashes of the states
+         * @param data buffer for the packed entries of the states (see pack())
+         * @param capacity maximal number of entries, that fit into the buffers
+         * @return size_t number of written entries
+         */
+        size_t export_entries(uint64_t* keys, uint64_t* data, size_t capacity);
+
+        /**
+         * @brief Removes all entries and resets the statistics (should not run concurrently to a search).
+         */
+        void clear();
+
+        /**
+         * @return size_t number of stored entries (counts all slots)
+         */
+        size_t get_size();
+
+        /**
+         * @return size_t maximal number of stored entries
+         */
+        size_t get_capacity();
+
+        /**
+         * @return uint64_t number of successful lookups
+         */
+        uint64_t get_hits();
+
+        /**
+         * @return uint64_t number of unsuccessful lookups
+         */
+        uint64_t get_misses();
+
+        /**
+         * @return uint64_t number of entries, that were replaced by entries of other states
+         */
+        uint64_t get_evictions();
+
+        /**
+         * @return size_t number of bytes of all slots
+         */
+        size_t get_bytes();
+};
+#endif
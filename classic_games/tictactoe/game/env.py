@@ -150,6 +150,15 @@ class TicTacToeEnv(gym.Env):
         return self._board.get_current(), self._board.get_reward(), self._terminated, self._truncated,\
             TicTacToeEnv.metadata
 
+    def action_masks(self) -> np.ndarray:
+        """
+        Returns the mask of all possible actions of the current board (e.g. for masked policies).
+
+        Returns:
+            np.ndarray: True if the action (n*row + col) is possible of shape (H*W,)
+        """
+        return self._board.get_action_mask()
+
     def render(self):
         if self._render_mode == "human":
             if self._rule_settings.board_shape[0] > 4 and self._rule_settings.board_shape[1] > 4:
@@ -0,0 +1,130 @@
+#include "boardBatchC.h"
+#include <algorithm>
+
+TicTacToeBoardBatchC::TicTacToeBoardBatchC(
+    const int32_t* boards,
+    int size,
+    int rows,
+    int cols,
+    int tiles_to_win,
+    int your_symbol,
+    int enemy_symbol,
+    const uint8_t* your_start
+) {
+    this->size = size;
+    this->your_symbol = your_symbol;
+    this->enemy_symbol = enemy_symbol;
+    this->layout = TicTacToeLayoutC::get(rows, cols, tiles_to_win);
+    this->boards.assign(boards, boards + static_cast<size_t>(size) * this->layout->tiles);
+    this->current_players.assign(your_start, your_start + size);
+    this->winners.assign(size, 0);
+    this->empty_tiles.assign(size, 0);
+    this->line_counts.assign(static_cast<size_t>(size) * 2 * this->layout->num_lines(), 0);
+    for (int i = 0; i < size; i++) {
+        this->init_game(i);
+    }
+}
+
+void TicTacToeBoardBatchC::init_game(int index) {
+    const int32_t* board = &this->boards[static_cast<size_t>(index) * this->layout->tiles];
+    uint8_t* line_counts = &this->line_counts[static_cast<size_t>(index) * 2 * this->layout->num_lines()];
+    this->winners[index] = this->layout->count_lines(board, this->your_symbol, this->enemy_symbol, line_counts);
+    this->empty_tiles[index] = static_cast<int32_t>(std::count(board, board + this->layout->tiles, 0));
+}
+
+int TicTacToeBoardBatchC::num_games() {
+    return this->size;
+}
+
+int TicTacToeBoardBatchC::row() {
+    return this->layout->rows;
+}
+
+int TicTacToeBoardBatchC::col() {
+    return this->layout->cols;
+}
+
+const int32_t* TicTacToeBoardBatchC::get_current() {
+    return this->boards.data();
+}
+
+void TicTacToeBoardBatchC::get_current_player(uint8_t* current_players) {
+    std::copy(this->current_players.begin(), this->current_players.end(), current_players);
+}
+
+bool TicTacToeBoardBatchC::set(const int32_t* actions) {
+    int tiles = this->layout->tiles;
+
+    // Check if all actions are valid, before changing any board
+    for (int i = 0; i < this->size; i++) {
+        if (actions[i] >= tiles || (actions[i] >= 0 && this->boards[static_cast<size_t>(i) * tiles + actions[i]] != 0)) {
+            // Case: Position is out of bounds or already taken
+            return false;
+        }
+    }
+
+    for (int i = 0; i < this->size; i++) {
+        int action = actions[i];
+        if (action < 0) {
+            // Case: Game should be skipped
+            continue;
+        }
+        int player = this->current_players[i] ? 0 : 1;
+        int symbol = this->current_players[i] ? this->your_symbol : this->enemy_symbol;
+        uint8_t* line_counts = &this->line_counts[static_cast<size_t>(i) * 2 * this->layout->num_lines()];
+
+        this->boards[static_cast<size_t>(i) * tiles + action] = symbol;
+        if (this->layout->add_tile(line_counts, action, player) && this->winners[i] == 0) {
+            // Case: Only the lines through the new tile can be completed
+            this->winners[i] = symbol;
+        }
+        this->empty_tiles[i]--;
+
+        // Update the current player
+        this->current_players[i] = !this->current_players[i];
+    }
+    return true;
+}
+
+void TicTacToeBoardBatchC::check_terminated(uint8_t* terminated) {
+    for (int i = 0; i < this->size; i++) {
+        terminated[i] = this->winners[i] != 0 || this->empty_tiles[i] == 0;
+    }
+}
+
+void TicTacToeBoardBatchC::check_winner(int32_t* winners) {
+    std::copy(this->winners.begin(), this->winners.end(), winners);
+}
+
+void TicTacToeBoardBatchC::get_reward(float* rewards) {
+    for (int i = 0; i < this->size; i++) {
+        if (this->winners[i] == this->your_symbol) {
+            // Case: Player1 won the game
+            rewards[i] = 1.0;
+        } else if (this->winners[i] == this->enemy_symbol) {
+            // Case: Player2 won the game
+            rewards[i] = -1.0;
+        } else {
+            // Case: Nobody won the game
+            rewards[i] = 0.0;
+        }
+    }
+}
+
+void TicTacToeBoardBatchC::legal_mask(uint8_t* mask) {
+    for (size_t i = 0; i < this->boards.size(); i++) {
+        mask[i] = this->boards[i] == 0;
+    }
+}
+
+void TicTacToeBoardBatchC::reset(const uint8_t* reset, const uint8_t* your_start) {
+    int tiles = this->layout->tiles;
+    for (int i = 0; i < this->size; i++) {
+        if (reset[i]) {
+            // Case: Start the game with an empty board
+            std::fill(&this->boards[static_cast<size_t>(i) * tiles], &this->boards[static_cast<size_t>(i) * tiles] + tiles, 0);
+            this->current_players[i] = your_start[i] != 0;
+            this->init_game(i);
+        }
+    }
+}
@@ -0,0 +1,139 @@
+#ifndef TICTACTOEBOARDBATCH_H
+#define TICTACTOEBOARDBATCH_H
+
+#include "layoutC.h"
+#include <cstdint>
+#include <vector>
+
+class TicTacToeBoardBatchC {
+    private:
+        /* number of games */
+        int size;
+        /* tiles of all boards in (N, H, W) order (contiguous storage) */
+        std::vector<int32_t> boards;
+        /* symbol of your player on the board */
+        int your_symbol;
+        /* symbol of enemy player on the board */
+        int enemy_symbol;
+        /* which player makes the next turn (per game) */
+        std::vector<uint8_t> current_players;
+        /* current winner (per game) */
+        std::vector<int32_t> winners;
+        /* number of empty tiles (per game) */
+        std::vector<int32_t> empty_tiles;
+        /* number of tiles per line and player (2 * num_lines() entries per game) */
+        std::vector<uint8_t> line_counts;
+        /* precomputed lines for the board shape */
+        const TicTacToeLayoutC* layout;
+
+        /**
+         * @brief Sets up the winner, the number of empty tiles and the line counters of a single game.
+         *
+         * @param index index of the game
+         */
+        void init_game(int index);
+
+    public:
+        /**
+         * @brief Construct a new TicTacToeBoardBatchC object
+         *
+         * @param boards contiguous (N, H, W) matrix of all game states
+         * @param size number of games N
+         * @param rows number of rows H of each board
+         * @param cols number of columns W of each board
+         * @param tiles_to_win number of tiles to place in row, column, diagonal, anti-diagonal to win the game
+         * @param your_symbol symbol of your player
+         * @param enemy_symbol symbol of enemy player
+         * @param your_start your player starts (per game)
+         */
+        TicTacToeBoardBatchC(
+            const int32_t* boards,
+            int size,
+            int rows,
+            int cols,
+            int tiles_to_win,
+            int your_symbol,
+            int enemy_symbol,
+            const uint8_t* your_start
+        );
+
+        /**
+         * @brief Destructor of the TicTacToeBoardBatchC
+         */
+        ~TicTacToeBoardBatchC() {};
+
+        /**
+         * @return int number of games
+         */
+        int num_games();
+
+        /**
+         * @return int number of rows of each board
+         */
+        int row();
+
+        /**
+         * @return int number of columns of each board
+         */
+        int col();
+
+        /**
+         * @brief Returns the current board states.
+         *
+         * @return const int32_t* contiguous (N, H, W) board states
+         */
+        const int32_t* get_current();
+
+        /**
+         * @brief Writes the current player of each game.
+         *
+         * @param current_players buffer for N entries (1 if your player is the current player, otherwise 0)
+         */
+        void get_current_player(uint8_t* current_players);
+
+        /**
+         * @brief Sets a tile on each board according to the given actions.
+         * The actions are only applied if all of them are valid.
+         *
+         * @param actions N encodings of the positions (n*row + col), where a negative action skips the game
+         * @return true if all actions are valid, otherwise false
+         */
+        bool set(const int32_t* actions);
+
+        /**
+         * @brief Writes for each game if the board is in a terminated state.
+         *
+         * @param terminated buffer for N entries (1 if the board is terminated, otherwise 0)
+         */
+        void check_terminated(uint8_t* terminated);
+
+        /**
+         * @brief Writes the winner of each game.
+         *
+         * @param winners buffer for N entries (0 - no winner, your_symbol - your player wins, enemy_symbol - enemy player wins)
+         */
+        void check_winner(int32_t* winners);
+
+        /**
+         * @brief Writes the reward of each game (+1.0 if your player won, -1.0 if enemy player won, 0.0 otherwise).
+         *
+         * @param rewards buffer for N entries
+         */
+        void get_reward(float* rewards);
+
+        /**
+         * @brief Writes the mask of all possible actions of each game.
+         *
+         * @param mask buffer for N * H * W entries (1 if the action is possible, otherwise 0)
+         */
+        void legal_mask(uint8_t* mask);
+
+        /**
+         * @brief Resets the selected games to an empty board.
+         *
+         * @param reset N entries (non-zero if the game should be reset)
+         * @param your_start N entries (non-zero if your player starts the reset game)
+         */
+        void reset(const uint8_t* reset, const uint8_t* your_start);
+};
+#endif
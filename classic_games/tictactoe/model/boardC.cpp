@@ -1,115 +1,229 @@
 #include "boardC.h"
 #include <iostream>
 #include <cstdlib>
+#include <algorithm>
+
+void TicTacToeBoardC::init(int rows, int cols, int tiles_to_win, int your_symbol, int enemy_symbol, bool your_start) {
+    this->rows = rows;
+    this->cols = cols;
+    this->tiles_to_win = tiles_to_win;
+    this->your_symbol = your_symbol;
+    this->enemy_symbol = enemy_symbol;
+    this->current_player = your_start;
+    this->start_player = your_start;
+    this->winner = 0;
+    this->initial_board = this->board;
+    this->layout = TicTacToeLayoutC::get(rows, cols, tiles_to_win);
+    this->init_state();
+    this->moves.reserve(this->layout->tiles);
+}
 
-bool TicTacToeBoardC::is_terminated() {
-    for (const std::vector<int>& row: this->board) {
-        for (int elem : row) {
-            if (elem == 0) {
-                return false;
-            }
+void TicTacToeBoardC::init_state() {
+    this->line_counts.resize(2 * this->layout->num_lines());
+    this->winner = this->layout->count_lines(this->board.data(), this->your_symbol, this->enemy_symbol, this->line_counts.data());
+    this->winner_moves = 0;
+    this->init_features();
+
+    this->your_tiles = 0;
+    this->enemy_tiles = 0;
+    this->empty_tiles = 0;
+    std::fill(this->hash_keys, this->hash_keys + MAX_SYMMETRIES, 0);
+    for (int tile = 0; tile < this->layout->tiles; tile++) {
+        uint64_t bit = this->layout->bitboard ? uint64_t(1) << tile : 0;
+        if (this->board[tile] == this->your_symbol) {
+            this->your_tiles |= bit;
+            this->toggle_hash_keys(tile, 0);
+        } else if (this->board[tile] == this->enemy_symbol) {
+            this->enemy_tiles |= bit;
+            this->toggle_hash_keys(tile, 1);
+        } else if (this->board[tile] == 0) {
+            this->empty_tiles++;
         }
     }
-    return true;
 }
 
-bool TicTacToeBoardC::winning_move(std::tuple<int, int> pos, bool your_symbol) {
-    // Check for right inputs
-    if (std::tuple_size<decltype(pos)>::value != 2) {
-        std::cerr << "#ERROR_TICTACTOEBOARD: pos should be a tuple in form (row, col)!";
-        std::abort();
-    } else if (std::get<0>(pos) < 0 || this->row() <= std::get<0>(pos)) {
-        // Case: row position is out of bounds!
-        std::cerr << "#ERROR_TICTACTOEBOARD: row is out of bounds!";
-        std::abort();
-    } else if (std::get<1>(pos) < 0 || this->col() <= std::get<1>(pos)) {
-        std::cerr << "#ERROR_TICTACTOEBOARD: col is out of bounds!";
-        std::abort();
-    }
-
-    int row = std::get<0>(pos);
-    int col = std::get<1>(pos);
-    int symbol = 0;
-    if (your_symbol) {
-        symbol = this->your_symbol;
-    } else {
-        symbol = this->enemy_symbol;
-    }
-
-    // Check for rows
-    int count = 0;
-    for (int c = 0; c < this->col(); c++) {
-        int tile = this->board[row][c];
-        if (tile == symbol) {
-            count++;
-        } else {
-            count = 0;
+void TicTacToeBoardC::init_features() {
+    int k = this->tiles_to_win;
+    this->open_lines.assign(2 * (k + 1), 0);
+    this->threat_lines.assign(2 * this->layout->tiles, 0);
+    this->threat_tiles[0] = 0;
+    this->threat_tiles[1] = 0;
+    for (int line = 0; line < this->layout->num_lines(); line++) {
+        int your_count = this->line_counts[2 * line];
+        int enemy_count = this->line_counts[2 * line + 1];
+        if (enemy_count == 0) {
+            // Case: Line is open for your player
+            this->open_lines[your_count]++;
+            if (your_count == k - 1) {
+                this->update_line_threat(line, 0, +1);
+            }
         }
-        if (count >= this->tiles_to_win) {
-            return true;
+        if (your_count == 0) {
+            // Case: Line is open for enemy player
+            this->open_lines[k + 1 + enemy_count]++;
+            if (enemy_count == k - 1) {
+                this->update_line_threat(line, 1, +1);
+            }
         }
     }
+}
 
-    // Check for columns
-    count = 0;
-    for (int r = 0; r < this->row(); r++) {
-        int tile = this->board[r][col];
-        if (tile == symbol) {
-            count++;
-        } else {
-            count = 0;
+bool TicTacToeBoardC::add_tile(int tile, int player) {
+    int k = this->tiles_to_win;
+    int other = 1 - player;
+    int* open_lines = &this->open_lines[player * (k + 1)];
+    int* other_open_lines = &this->open_lines[other * (k + 1)];
+    bool win = false;
+    for (int i = this->layout->tile_line_offsets[tile]; i < this->layout->tile_line_offsets[tile + 1]; i++) {
+        int line = this->layout->tile_lines[i];
+        int count = this->line_counts[2 * line + player];
+        int other_count = this->line_counts[2 * line + other];
+        if (other_count == 0) {
+            // Case: Line stays open for the player
+            open_lines[count]--;
+            open_lines[count + 1]++;
+            if (count + 1 == k - 1) {
+                // Case: Line needs a single tile to be completed
+                this->update_line_threat(line, player, +1);
+            } else if (count + 1 == k) {
+                // Case: Line is completed with the threat on the tile
+                this->update_tile_threat(tile, player, -1);
+            }
+        }
+        if (count == 0) {
+            // Case: Line is closed for the other player
+            other_open_lines[other_count]--;
+            if (other_count == k - 1) {
+                // Case: Tile blocks the threat of the other player
+                this->update_tile_threat(tile, other, -1);
+            }
         }
-        if (count >= this->tiles_to_win) {
-            return true;
+        this->line_counts[2 * line + player]++;
+        if (count + 1 == k) {
+            win = true;
         }
     }
+    return win;
+}
 
-    // Check for diagonals
-    count = 0;
-    int r = row - std::min(row, col);
-    int c = col - std::min(row, col);
-    for (int i = 0; i < std::min(this->row() - r, this->col() - c); i++) {
-        int tile = this->board[r + i][c + i];
-        if (tile == symbol) {
-            count++;
-        } else {
-            count = 0;
+void TicTacToeBoardC::remove_tile(int tile, int player) {
+    int k = this->tiles_to_win;
+    int other = 1 - player;
+    int* open_lines = &this->open_lines[player * (k + 1)];
+    int* other_open_lines = &this->open_lines[other * (k + 1)];
+    for (int i = this->layout->tile_line_offsets[tile]; i < this->layout->tile_line_offsets[tile + 1]; i++) {
+        int line = this->layout->tile_lines[i];
+        int count = --this->line_counts[2 * line + player];
+        int other_count = this->line_counts[2 * line + other];
+        if (other_count == 0) {
+            // Case: Line stays open for the player
+            open_lines[count + 1]--;
+            open_lines[count]++;
+            if (count + 1 == k - 1) {
+                // Case: Line needs more than a single tile to be completed
+                this->update_line_threat(line, player, -1);
+            } else if (count + 1 == k) {
+                // Case: Line is no longer completed and the tile is the threat
+                this->update_tile_threat(tile, player, +1);
+            }
         }
-        if (count >= this->tiles_to_win) {
-            return true;
+        if (count == 0) {
+            // Case: Line is open for the other player again
+            other_open_lines[other_count]++;
+            if (other_count == k - 1) {
+                // Case: Tile is the threat of the other player again
+                this->update_tile_threat(tile, other, +1);
+            }
         }
     }
+}
 
-    // Check for anti-diagonals
-    count = 0;
-    r = row - std::min(row, this->col() - 1 - col);
-    c = col - std::min(row, this->col() - 1 - col);
-    for (int i = 0; i < std::abs(r - c) + 1; i++) {
-        int tile = this->board[r + i][c - i];
-        if (tile == symbol) {
-            count++;
-        } else {
-            count = 0;
-        }
-        if (count >= this->tiles_to_win) {
-            return true;
+void TicTacToeBoardC::update_line_threat(int line, int player, int delta) {
+    const int* line_tiles = &this->layout->line_tiles[line * this->tiles_to_win];
+    for (int i = 0; i < this->tiles_to_win; i++) {
+        if (this->board[line_tiles[i]] == 0) {
+            // Case: Only a single tile of the line is empty
+            this->update_tile_threat(line_tiles[i], player, delta);
+            return;
         }
     }
-    return false;
+}
+
+void TicTacToeBoardC::update_tile_threat(int tile, int player, int delta) {
+    int& count = this->threat_lines[2 * tile + player];
+    if (delta > 0 && count++ == 0) {
+        // Case: Tile becomes a threat
+        this->threat_tiles[player]++;
+    } else if (delta < 0 && --count == 0) {
+        // Case: Tile is no longer a threat
+        this->threat_tiles[player]--;
+    }
+}
+
+void TicTacToeBoardC::toggle_hash_keys(int tile, int player) {
+    for (int symmetry = 0; symmetry < this->layout->num_symmetries; symmetry++) {
+        int transformed_tile = this->layout->transform_tile(tile, symmetry);
+        this->hash_keys[symmetry] ^= this->layout->zobrist_keys[2 * transformed_tile + player];
+    }
+}
+
+void TicTacToeBoardC::place(int tile) {
+    uint64_t bit = this->layout->bitboard ? uint64_t(1) << tile : 0;
+    bool win = false;
+    if (this->current_player) {
+        this->board[tile] = this->your_symbol;
+        this->your_tiles |= bit;
+        this->toggle_hash_keys(tile, 0);
+        win = this->add_tile(tile, 0);
+    } else {
+        this->board[tile] = this->enemy_symbol;
+        this->enemy_tiles |= bit;
+        this->toggle_hash_keys(tile, 1);
+        win = this->add_tile(tile, 1);
+    }
+
+    if (win && this->winner == 0) {
+        // Case: Only the lines through the new tile can be completed
+        this->winner = this->board[tile];
+        this->winner_moves = static_cast<int>(this->moves.size()) + 1;
+    }
+    this->empty_tiles--;
+
+    // Update the current player
+    this->current_player = !this->current_player;
+}
+
+void TicTacToeBoardC::unplace(int tile) {
+    uint64_t bit = this->layout->bitboard ? uint64_t(1) << tile : 0;
+    if (this->board[tile] == this->your_symbol) {
+        this->your_tiles &= ~bit;
+        this->toggle_hash_keys(tile, 0);
+        this->remove_tile(tile, 0);
+    } else {
+        this->enemy_tiles &= ~bit;
+        this->toggle_hash_keys(tile, 1);
+        this->remove_tile(tile, 1);
+    }
+    this->board[tile] = 0;
+    this->empty_tiles++;
+
+    // Update the current player
+    this->current_player = !this->current_player;
+}
+
+bool TicTacToeBoardC::is_terminated() {
+    return this->empty_tiles == 0;
 }
 
 int TicTacToeBoardC::row() {
-    return static_cast<int>(this->board.size());
+    return this->rows;
 }
 
 int TicTacToeBoardC::col() {
-    return static_cast<int>(this->board[0].size());
+    return this->cols;
 }
 
 bool TicTacToeBoardC::check_terminated() {
-    // Check if the game is over (win or draw)
-    this->winner = this->check_winner();
-
     // Check if the game is finished (either someone won or all tiles are placed)
     if (this->winner || this->is_terminated()) {
         return true;
@@ -119,89 +233,175 @@ bool TicTacToeBoardC::check_terminated() {
 }
 
 int TicTacToeBoardC::check_winner() {
-    for (int i = 0; i < this->row(); i++) {
-        for (int j = 0; j < this->col(); j++) {
-            if (this->board[i][j] == 0) {
-                // Case: No tile placed
-                continue;
-            } else if (this->winning_move(std::make_tuple(i, j), true)) {
-                // Case: Your player won
-                return this->your_symbol;
-            } else if (this->winning_move(std::make_tuple(i, j), false)) {
-                // Case: Enemy player won
-                return this->enemy_symbol;
-            }
-        }
-    }
-    return 0;
+    return this->winner;
 }
 
-std::vector<std::vector<int>> TicTacToeBoardC::get_current() {
-    return this->board;
+const int32_t* TicTacToeBoardC::get_current() {
+    return this->board.data();
 }
 
-std::vector<std::vector<std::vector<int>>> TicTacToeBoardC::get_successors() {
-    std::vector<std::vector<std::vector<int>>> successors;
-    std::vector<int> actions = this->get_actions();
-    std::vector<std::vector<int>> current_board = this->board;
-    for (int action : actions) {
+void TicTacToeBoardC::get_successors(int32_t* successors) {
+    for (int action : this->get_actions()) {
         // Create the successor state
-        this->set(action);
+        this->push(action);
 
-        // Append the successor state into the list of successors
-        successors.push_back(this->board);
+        // Copy the successor state into the buffer of successors
+        std::copy(this->board.begin(), this->board.end(), successors);
+        successors += this->board.size();
 
         // Reset the board
-        this->current_player = !this->current_player;
-        this->board = current_board;
-        this->history.pop_back();
+        this->pop();
+    }
+}
+
+void TicTacToeBoardC::get_history(int32_t* history) {
+    // Replay all moves from the initial board
+    bool current_player = this->start_player;
+    std::copy(this->initial_board.begin(), this->initial_board.end(), history);
+    for (uint16_t action : this->moves) {
+        std::copy(history, history + this->board.size(), history + this->board.size());
+        history += this->board.size();
+        history[action] = current_player ? this->your_symbol : this->enemy_symbol;
+        current_player = !current_player;
+    }
+}
+
+const uint16_t* TicTacToeBoardC::get_moves() {
+    return this->moves.data();
+}
+
+uint64_t TicTacToeBoardC::get_hash_key() {
+    return this->hash_keys[0] ^ (this->current_player ? 0 : this->layout->zobrist_enemy_turn);
+}
+
+uint64_t TicTacToeBoardC::get_canonical_hash_key(int* symmetry) {
+    *symmetry = 0;
+    for (int i = 1; i < this->layout->num_symmetries; i++) {
+        if (this->hash_keys[i] < this->hash_keys[*symmetry]) {
+            // Case: Transformed board has a smaller hash
+            *symmetry = i;
+        }
+    }
+    return this->hash_keys[*symmetry] ^ (this->current_player ? 0 : this->layout->zobrist_enemy_turn);
+}
+
+int TicTacToeBoardC::num_symmetries() {
+    return this->layout->num_symmetries;
+}
+
+int TicTacToeBoardC::get_canonical_symmetry() {
+    int best = 0;
+    for (int symmetry = 1; symmetry < this->layout->num_symmetries; symmetry++) {
+        // Compare the transformed boards tile by tile until they differ
+        for (int tile = 0; tile < this->layout->tiles; tile++) {
+            int32_t value = this->board[this->layout->inverse_transform_tile(tile, symmetry)];
+            int32_t best_value = this->board[this->layout->inverse_transform_tile(tile, best)];
+            if (value != best_value) {
+                if (value < best_value) {
+                    // Case: Transformed board is smaller than the best one
+                    best = symmetry;
+                }
+                break;
+            }
+        }
     }
-    return successors;
+    return best;
 }
 
-std::vector<std::vector<std::vector<int>>> TicTacToeBoardC::get_history() {
-    return this->history;
+int TicTacToeBoardC::get_canonical(int32_t* canonical) {
+    int symmetry = this->get_canonical_symmetry();
+    for (int tile = 0; tile < this->layout->tiles; tile++) {
+        canonical[this->layout->transform_tile(tile, symmetry)] = this->board[tile];
+    }
+    return symmetry;
+}
+
+int TicTacToeBoardC::transform_action(int action, int symmetry) {
+    return this->layout->transform_tile(action, symmetry);
+}
+
+int TicTacToeBoardC::inverse_transform_action(int action, int symmetry) {
+    return this->layout->inverse_transform_tile(action, symmetry);
 }
 
 std::vector<int> TicTacToeBoardC::get_actions() {
-    // Flatten the vector
-    std::vector<int> board_vec;
-    for (int i = 0; i < static_cast<int>(this->board.size()); i++) {
-        for (int j = 0; j < static_cast<int>(this->board[i].size()); j++) {
-            board_vec.push_back(this->board[i][j]);
+    if (this->layout->bitboard) {
+        // Case: Collect all empty tiles of the bitboard
+        std::vector<int> actions;
+        uint64_t empty_tiles = this->layout->full_mask & ~(this->your_tiles | this->enemy_tiles);
+        actions.reserve(popcount(empty_tiles));
+        while (empty_tiles) {
+            actions.push_back(lowest_bit(empty_tiles));
+            empty_tiles &= empty_tiles - 1;
         }
+        return actions;
     }
+
     // Get all possible actions
     std::vector<int> actions;
-    for (int i = 0; i < static_cast<int>(board_vec.size()); i++) {
-        if (board_vec[i] == 0) {
+    actions.reserve(this->empty_tiles);
+    for (int i = 0; i < static_cast<int>(this->board.size()); i++) {
+        if (this->board[i] == 0) {
             actions.push_back(i);
         }
     }
     return actions;
 }
 
+void TicTacToeBoardC::get_action_mask(uint8_t* mask) {
+    if (this->layout->bitboard) {
+        // Case: Read the empty tiles from the bitboard
+        uint64_t empty_tiles = this->layout->full_mask & ~(this->your_tiles | this->enemy_tiles);
+        for (int i = 0; i < this->layout->tiles; i++) {
+            mask[i] = (empty_tiles >> i) & 1;
+        }
+        return;
+    }
+
+    for (int i = 0; i < static_cast<int>(this->board.size()); i++) {
+        mask[i] = this->board[i] == 0;
+    }
+}
+
+int TicTacToeBoardC::get_actions(int* actions) {
+    int count = 0;
+    if (this->layout->bitboard) {
+        // Case: Collect all empty tiles of the bitboard
+        uint64_t empty_tiles = this->layout->full_mask & ~(this->your_tiles | this->enemy_tiles);
+        while (empty_tiles) {
+            actions[count++] = lowest_bit(empty_tiles);
+            empty_tiles &= empty_tiles - 1;
+        }
+        return count;
+    }
+
+    for (int i = 0; i < static_cast<int>(this->board.size()); i++) {
+        if (this->board[i] == 0) {
+            actions[count++] = i;
+        }
+    }
+    return count;
+}
+
+int TicTacToeBoardC::num_actions() {
+    return this->empty_tiles;
+}
+
 bool TicTacToeBoardC::get_current_player() {
     return this->current_player;
 }
 
 void TicTacToeBoardC::set(int action) {
-    int row = action / this->row();
-    int col = action % this->col();
+    this->push(action);
+}
 
-    if (this->board[row][col] == 0) {
+void TicTacToeBoardC::push(int action) {
+    if (0 <= action && action < this->layout->tiles && this->board[action] == 0) {
         // Case: Position is empty
-        if (this->current_player) {
-            this->board[row][col] = this->your_symbol;
-        } else {
-            this->board[row][col] = this->enemy_symbol;
-        }
-
-        // Update the current player
-        this->current_player = !this->current_player;
+        this->place(action);
 
         // Update the history
-        this->history.push_back(this->board);
+        this->moves.push_back(static_cast<uint16_t>(action));
     } else {
         // Case: Position is already taken
         std::cerr << "#ERROR_TICTACTOEBOARD: action is invalid!";
@@ -209,6 +409,29 @@ void TicTacToeBoardC::set(int action) {
     }
 }
 
+int TicTacToeBoardC::pop() {
+    if (this->moves.empty()) {
+        // Case: No move to undo
+        std::cerr << "#ERROR_TICTACTOEBOARD: there is no move to undo!";
+        std::abort();
+    }
+    int action = static_cast<int>(this->moves.back());
+    if (this->winner != 0 && this->winner_moves == static_cast<int>(this->moves.size())) {
+        // Case: Last move decided the winner
+        this->winner = 0;
+    }
+
+    // Update the history
+    this->moves.pop_back();
+
+    this->unplace(action);
+    return action;
+}
+
+int TicTacToeBoardC::num_moves() {
+    return static_cast<int>(this->moves.size());
+}
+
 float TicTacToeBoardC::get_reward() {
     if (this->winner == this->your_symbol) {
         // Case: Player1 won the game
@@ -233,20 +456,23 @@ float TicTacToeBoardC::get_reward() {
 //################################
 
 int TicTacToeBoardC::get_your_corner_tiles() {
+    if (this->layout->bitboard) {
+        return popcount(this->your_tiles & this->layout->corner_mask);
+    }
     int counter = 0;
-    if (this->board[0][0] == this->your_symbol) {
+    if (this->board[0] == this->your_symbol) {
         // Case: top left corner
         counter++;
     }
-    if (this->board[0][this->col()-1] == this->your_symbol) {
+    if (this->board[this->col()-1] == this->your_symbol) {
         // Case: top right corner
         counter++;
     }
-    if (this->board[this->row()-1][0] == this->your_symbol) {
+    if (this->board[(this->row()-1) * this->col()] == this->your_symbol) {
         // Case: bottom left corner
         counter++;
     }
-    if (this->board[this->row()-1][this->col()-1] == this->your_symbol) {
+    if (this->board[this->row() * this->col() - 1] == this->your_symbol) {
         // Case: bottom right corner
         counter++;
     }
@@ -254,20 +480,23 @@ int TicTacToeBoardC::get_your_corner_tiles() {
 }
 
 int TicTacToeBoardC::get_enemy_corner_tiles() {
+    if (this->layout->bitboard) {
+        return popcount(this->enemy_tiles & this->layout->corner_mask);
+    }
     int counter = 0;
-    if (this->board[0][0] == this->enemy_symbol) {
+    if (this->board[0] == this->enemy_symbol) {
         // Case: top left corner
         counter++;
     }
-    if (this->board[0][this->col()-1] == this->enemy_symbol) {
+    if (this->board[this->col()-1] == this->enemy_symbol) {
         // Case: top right corner
         counter++;
     }
-    if (this->board[this->row()-1][0] == this->enemy_symbol) {
+    if (this->board[(this->row()-1) * this->col()] == this->enemy_symbol) {
         // Case: bottom left corner
         counter++;
     }
-    if (this->board[this->row()-1][this->col()-1] == this->enemy_symbol) {
+    if (this->board[this->row() * this->col() - 1] == this->enemy_symbol) {
         // Case: bottom right corner
         counter++;
     }
@@ -275,10 +504,13 @@ int TicTacToeBoardC::get_enemy_corner_tiles() {
 }
 
 int TicTacToeBoardC::get_your_middle_tiles() {
+    if (this->layout->bitboard) {
+        return popcount(this->your_tiles & this->layout->middle_mask);
+    }
     int counter = 0;
     for (int i = 1; i < this->row()-1; i++) {
         for (int j = 1; j < this->col()-1; j++) {
-            if (this->board[i][j] == this->your_symbol) {
+            if (this->board[i * this->col() + j] == this->your_symbol) {
                 counter++;
             }
         }
@@ -287,10 +519,13 @@ int TicTacToeBoardC::get_your_middle_tiles() {
 }
 
 int TicTacToeBoardC::get_enemy_middle_tiles() {
+    if (this->layout->bitboard) {
+        return popcount(this->enemy_tiles & this->layout->middle_mask);
+    }
     int counter = 0;
     for (int i = 1; i < this->row()-1; i++) {
         for (int j = 1; j < this->col()-1; j++) {
-            if (this->board[i][j] == this->enemy_symbol) {
+            if (this->board[i * this->col() + j] == this->enemy_symbol) {
                 counter++;
             }
         }
@@ -298,40 +533,59 @@ int TicTacToeBoardC::get_enemy_middle_tiles() {
     return counter;
 }
 
-int TicTacToeBoardC::get_immediate_winning_moves() {
-    int winning_moves = 0;
-    for (int i = 0; i < this->row(); i++) {
-        for (int j = 0; j < this->col(); j++) {
-            if (this->board[i][j] == 0) {
-                // Case: Check if you would win if you place your symbol on this tile
-                this->board[i][j] = this->your_symbol;
-                if (this->winning_move(std::make_tuple(i, j), true)) {
-                    // Case: Your player won
-                    winning_moves++;
-                }
-                // Reset the move
-                this->board[i][j] = 0;
-            }
-        }
+int TicTacToeBoardC::get_your_open_lines(int count) {
+    return this->open_lines[count];
+}
+
+int TicTacToeBoardC::get_enemy_open_lines(int count) {
+    return this->open_lines[this->tiles_to_win + 1 + count];
+}
+
+int TicTacToeBoardC::get_your_open_lines_at(int action, int count) {
+    int lines = 0;
+    for (int i = this->layout->tile_line_offsets[action]; i < this->layout->tile_line_offsets[action + 1]; i++) {
+        int line = this->layout->tile_lines[i];
+        lines += this->line_counts[2 * line] == count && this->line_counts[2 * line + 1] == 0;
     }
-    return winning_moves;
+    return lines;
 }
 
-int TicTacToeBoardC::get_immediate_blocking_moves() {
-    int blocking_moves = 0;
-    for (int i = 0; i < this->row(); i++) {
-        for (int j = 0; j < this->col(); j++) {
-            if (this->board[i][j] == 0) {
-                // Case: Check if you would win if you place your symbol on this tile
-                this->board[i][j] = this->enemy_symbol;
-                if (this->winning_move(std::make_tuple(i, j), false)) {
-                    // Case: Your player won
-                    blocking_moves++;
-                }
-                // Reset the move
-                this->board[i][j] = 0;
-            }
-        }
+int TicTacToeBoardC::get_enemy_open_lines_at(int action, int count) {
+    int lines = 0;
+    for (int i = this->layout->tile_line_offsets[action]; i < this->layout->tile_line_offsets[action + 1]; i++) {
+        int line = this->layout->tile_lines[i];
+        lines += this->line_counts[2 * line + 1] == count && this->line_counts[2 * line] == 0;
     }
-    return blocking_moves;
+    return lines;
+}
+
+int TicTacToeBoardC::get_threats_after(int action, bool your) {
+    // Place the tile only in the lines (without the history, hashes and winner)
+    int player = your ? 0 : 1;
+    this->board[action] = your ? this->your_symbol : this->enemy_symbol;
+    this->add_tile(action, player);
+    int threats = this->threat_tiles[player];
+    this->remove_tile(action, player);
+    this->board[action] = 0;
+    return threats;
+}
+
+int TicTacToeBoardC::get_immediate_winning_moves() {
+    return this->threat_tiles[0];
+}
+
+int TicTacToeBoardC::get_immediate_blocking_moves() {
+    return this->threat_tiles[1];
+}
+
+bool TicTacToeBoardC::is_winning_action(int action) {
+    return this->threat_lines[2 * action + (this->current_player ? 0 : 1)] > 0;
+}
+
+bool TicTacToeBoardC::is_blocking_action(int action) {
+    return this->threat_lines[2 * action + (this->current_player ? 1 : 0)] > 0;
+}
+
+int TicTacToeBoardC::get_action_lines(int action) {
+    return this->layout->tile_line_offsets[action + 1] - this->layout->tile_line_offsets[action];
 }
@@ -1,13 +1,18 @@
 #ifndef TICTACTOEBOARD_H
 #define TICTACTOEBOARD_H
 
+#include "layoutC.h"
+#include <cstdint>
 #include <vector>
-#include <tuple>
 
 class TicTacToeBoardC {
     private:
-        /* */
-        std::vector<std::vector<int>> board;
+        /* tiles of the board in row-major order (contiguous storage) */
+        std::vector<int32_t> board;
+        /* number of rows of the board */
+        int rows;
+        /* number of columns of the board */
+        int cols;
         /* number of places that one player needs to win the game */
         int tiles_to_win;
         /* symbol of your player on the board */
@@ -16,10 +21,35 @@ class TicTacToeBoardC {
         int enemy_symbol;
         /* which player makes the next turn */
         bool current_player;
-        /* current winner of the game */
+        /* current winner of the game (updated with each placed tile) */
         int winner;
-        /* list of boards which moves are done from beginning */
-        std::vector<std::vector<std::vector<int>>> history;
+        /* board at the beginning (before any move was done) */
+        std::vector<int32_t> initial_board;
+        /* which player made the first turn from beginning */
+        bool start_player;
+        /* list of actions which are done from beginning (the history of boards is rebuilt on demand) */
+        std::vector<uint16_t> moves;
+        /* number of moves after which the winner was decided (0 if the initial board is already won) */
+        int winner_moves;
+        /* precomputed lines (and masks) for the board shape */
+        const TicTacToeLayoutC* layout;
+        /* bitboard of your tiles (only used in bitboard mode) */
+        uint64_t your_tiles;
+        /* bitboard of enemy tiles (only used in bitboard mode) */
+        uint64_t enemy_tiles;
+
+        /* number of tiles per line and player (your tiles at 2*line, enemy tiles at 2*line+1) */
+        std::vector<uint8_t> line_counts;
+        /* number of empty tiles on the board */
+        int empty_tiles;
+        /* number of lines with count tiles of a player and no tile of the other player (your lines at count, enemy lines at tiles_to_win + 1 + count) */
+        std::vector<int> open_lines;
+        /* number of lines through an empty tile, that a player completes with the tile (your lines at 2*tile, enemy lines at 2*tile+1) */
+        std::vector<int> threat_lines;
+        /* number of empty tiles, that complete a line of a player (your tiles at 0, enemy tiles at 1) */
+        int threat_tiles[2];
+        /* zobrist hash of the tiles after applying each symmetry (the first entry belongs to the board itself) */
+        uint64_t hash_keys[MAX_SYMMETRIES];
 
         /**
          * @brief Checks if the board is full (no action are possible anymore).
@@ -29,17 +59,112 @@ class TicTacToeBoardC {
         bool is_terminated();
 
         /**
-         * @brief Checks if the given player have n tiles on the row, column, diagonal or anti-diagonal for the given position.
+         * @brief Sets up the remaining attributes of the board after the tiles are copied.
+         * 
+         * @param rows number of rows of the board
+         * @param cols number of columns of the board
+         * @param tiles_to_win number of tiles to place in row, column, diagonal, anti-diagonal to win the game
+         * @param your_symbol symbol of your player
+         * @param enemy_symbol symbol of enemy player
+         * @param your_start your player starts
+         */
+        void init(int rows, int cols, int tiles_to_win, int your_symbol, int enemy_symbol, bool your_start);
+
+        /**
+         * @brief Sets up the bitboards, line counters and the winner from the current board.
+         */
+        void init_state();
+
+        /**
+         * @brief Sets up the open lines and threats from the line counters.
+         */
+        void init_features();
+
+        /**
+         * @brief Adds a tile of the given player to all lines through the tile and updates the open lines and threats.
+         * The tile should already be on the board.
+         * 
+         * @param tile index of the tile (n*row + col)
+         * @param player 0 for your player, 1 for enemy player
+         * @return true if the player owns all tiles of a line through the tile afterwards
+         */
+        bool add_tile(int tile, int player);
+
+        /**
+         * @brief Removes a tile of the given player from all lines through the tile and updates the open lines and threats.
+         * The tile should still be on the board.
+         * 
+         * @param tile index of the tile (n*row + col)
+         * @param player 0 for your player, 1 for enemy player
+         */
+        void remove_tile(int tile, int player);
+
+        /**
+         * @brief Adds or removes the threat of the given player on the empty tile of the given line.
+         * 
+         * @param line index of a line with tiles_to_win - 1 tiles of the player and no tile of the other player
+         * @param player 0 for your player, 1 for enemy player
+         * @param delta +1 to add the threat, -1 to remove the threat
+         */
+        void update_line_threat(int line, int player, int delta);
+
+        /**
+         * @brief Adds or removes a threat of the given player on the given tile.
+         * 
+         * @param tile index of the empty tile (n*row + col)
+         * @param player 0 for your player, 1 for enemy player
+         * @param delta +1 to add the threat, -1 to remove the threat
+         */
+        void update_tile_threat(int tile, int player, int delta);
+
+        /**
+         * @brief Places the tile of the current player and updates the bitboards, line counters and winner.
+         * 
+         * @param tile index of the tile (n*row + col)
+         */
+        void place(int tile);
+
+        /**
+         * @brief Adds or removes the tile of the given player to all zobrist hashes.
          * 
-         * @param pos position of the board (row, col)
-         * @param your_symbol Should it be checked for your player (:= True) or for the enemy (:= False).
+         * @param tile index of the tile (n*row + col)
+         * @param player 0 for your player, 1 for enemy player
+         */
+        void toggle_hash_keys(int tile, int player);
+
+        /**
+         * @brief Removes the tile at the given position and restores the bitboards and line counters.
          * 
-         * @return true, if we have n tiles in the row, column diagonal or anti diagonal
+         * @param tile index of the tile (n*row + col)
          */
-        bool winning_move(std::tuple<int, int> pos, bool your_symbol);
+        void unplace(int tile);
 
     public:
         
+        /**
+         * @brief Construct a new TicTacToeBoardC object
+         * 
+         * @param board contiguous (row-major) matrix of the game state with rows * cols tiles
+         * @param rows number of rows of the board
+         * @param cols number of columns of the board
+         * @param tiles_to_win number of tiles to place in row, column, diagonal, anti-diagonal to win the game
+         * @param your_symbol symbol of your player
+         * @param enemy_symbol symbol of enemy player
+         * @param your_start your player starts
+         */
+        TicTacToeBoardC(
+            const int32_t* board,
+            int rows,
+            int cols,
+            int tiles_to_win, 
+            int your_symbol, 
+            int enemy_symbol, 
+            bool your_start
+        ) {
+            this->board.assign(board, board + rows * cols);
+            this->init(rows, cols, tiles_to_win, your_symbol, enemy_symbol, your_start);
+        };
+
         /**
          * @brief Construct a new TicTacToeBoardC object
          * 
@@ -50,19 +175,16 @@ class TicTacToeBoardC {
          * @param your_start your player starts
          */
         TicTacToeBoardC(
-            std::vector<std::vector<int>> board, 
+            const std::vector<std::vector<int>>& board, 
             int tiles_to_win, 
             int your_symbol, 
             int enemy_symbol, 
             bool your_start
         ) {
-            this->board = board;
-            this->tiles_to_win = tiles_to_win;
-            this->your_symbol = your_symbol;
-            this->enemy_symbol = enemy_symbol;
-            this->current_player = your_start;
-            this->winner = 0;
-            this->history.push_back(this->board);
+            for (const std::vector<int>& row : board) {
+                this->board.insert(this->board.end(), row.begin(), row.end());
+            }
+            this->init(static_cast<int>(board.size()), static_cast<int>(board[0].size()), tiles_to_win, your_symbol, enemy_symbol, your_start);
         };
 
         /**
@@ -100,23 +222,83 @@ class TicTacToeBoardC {
         /**
          * @brief Returns the current board state.
          * 
-         * @return std::vector<std::vector<int>> current board state
+         * @return const int32_t* contiguous (row-major) board state with row() * col() tiles
+         */
+        const int32_t* get_current();
+
+        /**
+         * @brief Writes all successor boards, if we take a single action from the current board.
+         * 
+         * @param successors contiguous buffer for num_actions() * row() * col() tiles
+         */
+        void get_successors(int32_t* successors);
+
+        /**
+         * @brief Writes the entire history of changes on the board, by replaying all moves from the beginning.
+         * 
+         * @param history contiguous buffer for (num_moves() + 1) * row() * col() tiles
+         */
+        void get_history(int32_t* history);
+
+        /**
+         * @brief Returns all actions which are done from beginning.
+         * 
+         * @return const uint16_t* list of num_moves() actions
          */
-        std::vector<std::vector<int>> get_current();
+        const uint16_t* get_moves();
 
         /**
-         * @brief Returns all successor boards, if we take a single action from the current board.
+         * @return uint64_t zobrist hash of the board (including the player to move)
+         */
+        uint64_t get_hash_key();
+
+        /**
+         * @brief Returns the zobrist hash, which is the same for all boards that are equivalent 
+         * under rotation and reflection.
          * 
-         * @return std::vector<std::vector<std::vector<int>>> list of successor boards
+         * @param symmetry index of the symmetry, which maps the current board to the hashed board (output)
+         * @return uint64_t canonical zobrist hash of the board (including the player to move)
          */
-        std::vector<std::vector<std::vector<int>>> get_successors();
+        uint64_t get_canonical_hash_key(int* symmetry);
 
         /**
-         * @brief Returns the entire history of changes on the board.
+         * @return int number of symmetries (rotations and reflections) of the board
+         */
+        int num_symmetries();
+
+        /**
+         * @brief Returns the symmetry, which maps the current board to its canonical form.
+         * The canonical form is the lexicographically smallest board of all equivalent boards.
          * 
-         * @return std::vector<std::vector<std::vector<int>>> history of changes of the board
+         * @return int index of the symmetry
          */
-        std::vector<std::vector<std::vector<int>>> get_history();
+        int get_canonical_symmetry();
+
+        /**
+         * @brief Writes the canonical form of the current board.
+         * 
+         * @param canonical contiguous buffer for row() * col() tiles
+         * @return int index of the symmetry, which maps the current board to the canonical board
+         */
+        int get_canonical(int32_t* canonical);
+
+        /**
+         * @brief Maps an action of the current board to the action of the transformed board.
+         * 
+         * @param action encoding of the position (n*row + col)
+         * @param symmetry index of the symmetry
+         * @return int action on the transformed board
+         */
+        int transform_action(int action, int symmetry);
+
+        /**
+         * @brief Maps an action of the transformed board back to the action of the current board.
+         * 
+         * @param action encoding of the position (n*row + col) on the transformed board
+         * @param symmetry index of the symmetry
+         * @return int action on the current board
+         */
+        int inverse_transform_action(int action, int symmetry);
         
         /**
          * @brief Returns all possible actions of the board.
@@ -124,6 +306,26 @@ class TicTacToeBoardC {
          * @return std::vector<int> list of actions
          */
         std::vector<int> get_actions();
+
+        /**
+         * @brief Writes all possible actions of the board (without allocating memory).
+         * 
+         * @param actions buffer for num_actions() actions
+         * @return int number of actions
+         */
+        int get_actions(int* actions);
+
+        /**
+         * @brief Writes the mask of all possible actions of the board.
+         * 
+         * @param mask buffer for row() * col() entries (1 if the action is possible, otherwise 0)
+         */
+        void get_action_mask(uint8_t* mask);
+
+        /**
+         * @return int number of possible actions of the board
+         */
+        int num_actions();
         
         /**
          * @brief Returns the current player as bool.
@@ -139,6 +341,25 @@ class TicTacToeBoardC {
          */
         void set(int action);
 
+        /**
+         * @brief Makes a move in-place (same as set), which can be undone with pop().
+         * 
+         * @param action Encoding of the position (n*row + col), where the tile needs to be placed
+         */
+        void push(int action);
+
+        /**
+         * @brief Undoes the last move in-place.
+         * 
+         * @return int action of the undone move
+         */
+        int pop();
+
+        /**
+         * @return int number of moves done since the beginning
+         */
+        int num_moves();
+
         /**
          * @brief Returns a reward of (...)
          *      - +1.0 if your player won
@@ -173,6 +394,43 @@ class TicTacToeBoardC {
          */
         int get_enemy_middle_tiles();
 
+        /**
+         * @param count number of tiles in the line (0 <= count <= tiles_to_win)
+         * @return int number of lines with count of your tiles and no enemy tile
+         */
+        int get_your_open_lines(int count);
+
+        /**
+         * @param count number of tiles in the line (0 <= count <= tiles_to_win)
+         * @return int number of lines with count of enemy tiles and no tile of your player
+         */
+        int get_enemy_open_lines(int count);
+
+        /**
+         * @param action encoding of the position (n*row + col)
+         * @param count number of tiles in the line (0 <= count <= tiles_to_win)
+         * @return int number of lines through the position with count of your tiles and no enemy tile
+         */
+        int get_your_open_lines_at(int action, int count);
+
+        /**
+         * @param action encoding of the position (n*row + col)
+         * @param count number of tiles in the line (0 <= count <= tiles_to_win)
+         * @return int number of lines through the position with count of enemy tiles and no tile of your player
+         */
+        int get_enemy_open_lines_at(int action, int count);
+
+        /**
+         * @brief Returns the number of tiles, that complete a line of the given player, if the player would place
+         * a tile on the given position (the board is the same afterwards). The player can be the player, who does
+         * not make the next turn.
+         * 
+         * @param action encoding of the position (n*row + col) of an empty tile
+         * @param your true for your player, false for enemy player
+         * @return int number of tiles, where the next move of the player would refer to a win
+         */
+        int get_threats_after(int action, bool your);
+
         /**
          * @return int number of tiles, where an immediate move (next turn) refers to a win for your player.
          */
@@ -182,5 +440,23 @@ class TicTacToeBoardC {
          * @return int number of tiles, where an immediate move (next turn) refers to a block for a win of the enemy player.
          */
         int get_immediate_blocking_moves();
+
+        /**
+         * @param action encoding of the position (n*row + col) of an empty tile
+         * @return true if the current player wins by placing a tile on the position, otherwise false
+         */
+        bool is_winning_action(int action);
+
+        /**
+         * @param action encoding of the position (n*row + col) of an empty tile
+         * @return true if the other player would win by placing a tile on the position, otherwise false
+         */
+        bool is_blocking_action(int action);
+
+        /**
+         * @param action encoding of the position (n*row + col)
+         * @return int number of lines (of tiles_to_win tiles) that go through the position
+         */
+        int get_action_lines(int action);
 };
 #endif
\ No newline at end of file
@@ -1,46 +1,114 @@
 # distutils: language = c++
-# distutils: sources = ./classic_games/tictactoe/model/boardC.cpp
+# distutils: sources = ./classic_games/tictactoe/model/boardC.cpp ./classic_games/tictactoe/model/boardBatchC.cpp ./classic_games/tictactoe/model/layoutC.cpp
 
+from cpython.buffer cimport PyBUF_WRITABLE
+from libc.stdint cimport int32_t, uint8_t, uint16_t, uint64_t
+from libc.string cimport memcpy
 from libcpp.vector cimport vector
 import numpy as np
 
-cdef extern from "boardC.h":
+cdef extern from "boardC.h" nogil:
     cdef cppclass TicTacToeBoardC:
-        TicTacToeBoardC(vector[vector[int]], int, int, int, bint)
+        TicTacToeBoardC(const int32_t*, int, int, int, int, int, bint)
         int row()
         int col()
         bint check_terminated()
         int check_winner()
-        vector[vector[int]] get_current()
-        vector[vector[vector[int]]] get_successors()
-        vector[vector[vector[int]]] get_history()
+        const int32_t* get_current()
+        void get_successors(int32_t* successors)
+        void get_history(int32_t* history)
+        const uint16_t* get_moves()
+        uint64_t get_hash_key()
+        uint64_t get_canonical_hash_key(int* symmetry)
+        int num_symmetries()
+        int get_canonical(int32_t* canonical)
+        int transform_action(int action, int symmetry)
+        int inverse_transform_action(int action, int symmetry)
         vector[int] get_actions()
+        void get_action_mask(uint8_t* mask)
+        int num_actions()
         bint get_current_player()
         void set(int action)
+        void push(int action)
+        int pop()
+        int num_moves()
         float get_reward()
         int get_your_corner_tiles()
         int get_enemy_corner_tiles()
         int get_your_middle_tiles()
         int get_enemy_middle_tiles()
+        int get_your_open_lines(int count)
+        int get_enemy_open_lines(int count)
         int get_immediate_winning_moves()
         int get_immediate_blocking_moves()
 
+cdef extern from "boardBatchC.h" nogil:
+    cdef cppclass TicTacToeBoardBatchC:
+        TicTacToeBoardBatchC(const int32_t*, int, int, int, int, int, int, const uint8_t*)
+        int num_games()
+        int row()
+        int col()
+        const int32_t* get_current()
+        void get_current_player(uint8_t* current_players)
+        bint set(const int32_t* actions)
+        void check_terminated(uint8_t* terminated)
+        void check_winner(int32_t* winners)
+        void get_reward(float* rewards)
+        void legal_mask(uint8_t* mask)
+        void reset(const uint8_t* reset, const uint8_t* your_start)
+
 cdef class TicTacToeBoard:
+    """
+    Board of a single TicTacToe game.
+
+    Thread safety: Methods, that loop over the board, run without the GIL. An instance should not be
+    changed by one thread, while other threads use it. Different instances can be used by different threads.
+    """
     cdef TicTacToeBoardC* obj
+    cdef Py_ssize_t shape[2]
+    cdef Py_ssize_t strides[2]
+    cdef int tiles_to_win
+
+    def __cinit__(self, board, int tiles_to_win = 3, int your_symbol = 1, int enemy_symbol = -1, bint your_start = True):
+        # Contiguous int32 arrays are used without any conversion
+        cdef const int32_t[:, ::1] tiles = np.ascontiguousarray(board, dtype=np.int32)
 
-    def __cinit__(self, vector[vector[int]] board, int tiles_to_win = 3, int your_symbol = 1, int enemy_symbol = -1, bint your_start = True):
-        assert board.size() == board[0].size(), "#ERROR_BOARDPY: height and width should be the same!"
-        assert board.size() >= 3, "#ERROR_BOARDPY: height and width should be at least 3!"
+        assert tiles.shape[0] == tiles.shape[1], "#ERROR_BOARDPY: height and width should be the same!"
+        assert tiles.shape[0] >= 3, "#ERROR_BOARDPY: height and width should be at least 3!"
         assert tiles_to_win >= 3, "#ERROR_BOARDPY: number of tiles to win should be at least 3!"
-        assert tiles_to_win <= board.size(), "#ERROR_BOARDPY: number of tiles cannot be longer than one dimension!"
+        assert tiles_to_win <= tiles.shape[0], "#ERROR_BOARDPY: number of tiles cannot be longer than one dimension!"
         assert your_symbol != 0 and enemy_symbol != 0, "#ERROR_BOARDPY: symbol of you and enemy cannot be 0!"
         assert your_symbol != enemy_symbol, "#ERROR_BOARDPY: symbol of you and enemy cannot be the same!"
-        
-        self.obj = new TicTacToeBoardC(board, tiles_to_win, your_symbol, enemy_symbol, your_start)
+
+        self.obj = new TicTacToeBoardC(&tiles[0, 0], tiles.shape[0], tiles.shape[1], tiles_to_win, your_symbol, enemy_symbol, your_start)
+        self.tiles_to_win = tiles_to_win
+        self.shape[0] = tiles.shape[0]
+        self.shape[1] = tiles.shape[1]
+        self.strides[0] = tiles.shape[1] * sizeof(int32_t)
+        self.strides[1] = sizeof(int32_t)
     
     def __dealloc__(self):
         del self.obj
 
+    def __getbuffer__(self, Py_buffer* buffer, int flags):
+        # Exports the current board state as read-only (H, W) int32 buffer (e.g. for np.asarray(board))
+        if flags & PyBUF_WRITABLE:
+            raise BufferError("#ERROR_BOARDPY: board can only be exported as read-only buffer!")
+        buffer.buf = <void*> self.obj.get_current()
+        buffer.format = "i"
+        buffer.internal = NULL
+        buffer.itemsize = sizeof(int32_t)
+        buffer.len = self.shape[0] * self.shape[1] * sizeof(int32_t)
+        buffer.ndim = 2
+        buffer.obj = self
+        buffer.readonly = 1
+        buffer.shape = self.shape
+        buffer.strides = self.strides
+        buffer.suboffsets = NULL
+
+    def __releasebuffer__(self, Py_buffer* buffer):
+        pass
+
     @property
     def row(self) -> int:
         return self.obj.row()
@@ -74,37 +142,131 @@ cdef class TicTacToeBoard:
         Returns:
             np.ndarray: current board state
         """
-        # Get the current board state
-        cdef vector[vector[int]] current = self.obj.get_current()
+        # Copy the contiguous board state with a single memcpy
+        return np.array(self, dtype=np.int32)
 
-        # Convert std::vector<std::vector<int>> into np.ndarray
-        return np.array([[current[i][j] for j in range(len(current[i]))] for i in range(len(current))])
-
-    def get_successors(self) -> list[np.ndarray]:
+    def get_successors(self) -> np.ndarray:
         """
         Returns the successor boards, if we take an action from the current board.
 
         Returns:
-            list[np.ndarray]: list of successor boards
+            np.ndarray: successor boards of shape (N, H, W)
         """
-        # Get the successor board states
-        cdef vector[vector[vector[int]]] successors = self.obj.get_successors()
-
-        # Convert std::vector<std::vector<std::vector<int>>> into list[np.ndarray]
-        return [np.array([[successors[i][j][k] for k in range(len(successors[i][j]))] for j in range(len(successors[i]))]) for i in range(len(successors))]
+        successors = np.empty((self.obj.num_actions(), self.shape[0], self.shape[1]), dtype=np.int32)
+        cdef int32_t[:, :, ::1] buffer = successors
+        if buffer.shape[0] > 0:
+            # Case: C++ writes the successor states directly into the array
+            with nogil:
+                self.obj.get_successors(&buffer[0, 0, 0])
+        return successors
 
-    def get_history(self) -> list[np.ndarray]:
+    def get_history(self) -> np.ndarray:
         """
         Returns the entire history of changes on the board.
 
         Returns:
-            list[np.ndarray]: history of changes of the board
+            np.ndarray: history of changes of the board of shape (T, H, W)
+        """
+        # C++ replays the moves directly into the array
+        history = np.empty((self.obj.num_moves() + 1, self.shape[0], self.shape[1]), dtype=np.int32)
+        cdef int32_t[:, :, ::1] buffer = history
+        with nogil:
+            self.obj.get_history(&buffer[0, 0, 0])
+        return history
+
+    def get_moves(self) -> np.ndarray:
+        """
+        Returns all actions which are done from the beginning.
+
+        Returns:
+            np.ndarray: list of actions of shape (T - 1,)
+        """
+        moves = np.empty(self.obj.num_moves(), dtype=np.uint16)
+        cdef uint16_t[::1] buffer = moves
+        if buffer.shape[0] > 0:
+            memcpy(&buffer[0], self.obj.get_moves(), buffer.shape[0] * sizeof(uint16_t))
+        return moves
+
+    @property
+    def hash_key(self) -> int:
+        """
+        Returns the (incrementally updated) 64-bit zobrist hash of the current board and the player to move.
+
+        Returns:
+            int: zobrist hash of the current board
+        """
+        return self.obj.get_hash_key()
+
+    def get_canonical_hash_key(self) -> tuple[int, int]:
+        """
+        Returns the 64-bit zobrist hash, which is the same for all boards that are equivalent
+        under rotation and reflection.
+
+        Returns:
+            tuple[int, int]: canonical zobrist hash and the symmetry, which maps the current board to the hashed board
+        """
+        cdef int symmetry = 0
+        cdef uint64_t key = self.obj.get_canonical_hash_key(&symmetry)
+        return key, symmetry
+
+    @property
+    def num_symmetries(self) -> int:
+        return self.obj.num_symmetries()
+
+    def get_canonical(self) -> tuple[np.ndarray, int]:
+        """
+        Returns the canonical form of the current board, which is the same for all boards
+        that are equivalent under rotation and reflection.
+
+        Returns:
+            tuple[np.ndarray, int]: canonical board and the symmetry, which maps the current board to it
+        """
+        canonical = np.empty((self.shape[0], self.shape[1]), dtype=np.int32)
+        cdef int32_t[:, ::1] buffer = canonical
+        cdef int symmetry
+        with nogil:
+            symmetry = self.obj.get_canonical(&buffer[0, 0])
+        return canonical, symmetry
+
+    def get_canonical_key(self) -> tuple[bytes, int]:
+        """
+        Returns a hashable key of the canonical form of the current board (e.g. for caches and lookup tables).
+
+        Returns:
+            tuple[bytes, int]: canonical key and the symmetry, which maps the current board to the canonical board
+        """
+        canonical, symmetry = self.get_canonical()
+        return canonical.tobytes(), symmetry
+
+    def transform_action(self, action: int, symmetry: int) -> int:
+        """
+        Maps an action of the current board to the action of the transformed (e.g. canonical) board.
+
+        Args:
+            action (int): Encoding of the position (n*row + col)
+            symmetry (int): index of the symmetry
+
+        Returns:
+            int: action on the transformed board
         """
-        # Get the history
-        cdef vector[vector[vector[int]]] history = self.obj.get_history()
+        assert 0 <= action < self.shape[0] * self.shape[1], "#ERROR_BOARDPY: action is invalid!"
+        assert 0 <= symmetry < self.obj.num_symmetries(), "#ERROR_BOARDPY: symmetry is invalid!"
+        return self.obj.transform_action(action, symmetry)
 
-        # Convert std::vector<std::vector<std::vector<int>>> into list[np.ndarray]
-        return [np.array([[history[i][j][k] for k in range(len(history[i][j]))] for j in range(len(history[i]))]) for i in range(len(history))]
+    def inverse_transform_action(self, action: int, symmetry: int) -> int:
+        """
+        Maps an action of the transformed (e.g. canonical) board back to the action of the current board.
+
+        Args:
+            action (int): Encoding of the position (n*row + col) on the transformed board
+            symmetry (int): index of the symmetry
+
+        Returns:
+            int: action on the current board
+        """
+        assert 0 <= action < self.shape[0] * self.shape[1], "#ERROR_BOARDPY: action is invalid!"
+        assert 0 <= symmetry < self.obj.num_symmetries(), "#ERROR_BOARDPY: symmetry is invalid!"
+        return self.obj.inverse_transform_action(action, symmetry)
     
     def get_actions(self) -> list[int]:
         """
@@ -118,6 +280,24 @@ cdef class TicTacToeBoard:
 
         # Convert std::vector<int> into list[int]
         return [actions[i] for i in range(len(actions))]
+
+    def get_action_mask(self, out = None) -> np.ndarray:
+        """
+        Returns the mask of all possible actions of the board.
+
+        Args:
+            out (np.ndarray, optional): bool or uint8 array of shape (H*W,), where the mask is written into
+
+        Returns:
+            np.ndarray: True if the action (n*row + col) is possible of shape (H*W,)
+        """
+        if out is None:
+            out = np.empty(self.shape[0] * self.shape[1], dtype=bool)
+        cdef uint8_t[::1] buffer = out.view(np.uint8)
+        assert buffer.shape[0] == self.shape[0] * self.shape[1], "#ERROR_BOARDPY: mask should have H*W entries!"
+        with nogil:
+            self.obj.get_action_mask(&buffer[0])
+        return out
     
     def get_current_player(self) -> bool:
         """
@@ -136,6 +316,26 @@ cdef class TicTacToeBoard:
             action (int): Encoding of the position (n*row + col), where the tile needs to be placed
         """
         self.obj.set(action)
+
+    def push(self, action: int):
+        """
+        Makes a move in-place (same as set()), which can be undone with pop().
+
+        Args:
+            action (int): Encoding of the position (n*row + col), where the tile needs to be placed
+        """
+        assert 0 <= action < self.shape[0] * self.shape[1] and self.obj.get_current()[action] == 0, "#ERROR_BOARDPY: action is invalid!"
+        self.obj.push(action)
+
+    def pop(self) -> int:
+        """
+        Undoes the last move in-place.
+
+        Returns:
+            int: action of the undone move
+        """
+        assert self.obj.num_moves() > 0, "#ERROR_BOARDPY: there is no move to undo!"
+        return self.obj.pop()
     
     def get_reward(self) -> float:
         """
@@ -181,6 +381,28 @@ cdef class TicTacToeBoard:
         """
         return self.obj.get_enemy_middle_tiles()
     
+    def get_your_open_lines(self, count: int) -> int:
+        """
+        Args:
+            count (int): number of tiles in the line (0 <= count <= tiles_to_win)
+
+        Returns:
+            int: number of lines with count of your tiles and no enemy tile
+        """
+        assert 0 <= count <= self.tiles_to_win, "#ERROR_BOARDPY: count is invalid!"
+        return self.obj.get_your_open_lines(count)
+
+    def get_enemy_open_lines(self, count: int) -> int:
+        """
+        Args:
+            count (int): number of tiles in the line (0 <= count <= tiles_to_win)
+
+        Returns:
+            int: number of lines with count of enemy tiles and no tile of your player
+        """
+        assert 0 <= count <= self.tiles_to_win, "#ERROR_BOARDPY: count is invalid!"
+        return self.obj.get_enemy_open_lines(count)
+
     def get_immediate_winning_moves(self) -> int:
         """
         Returns:
@@ -194,3 +416,197 @@ cdef class TicTacToeBoard:
             int: number of tiles, where an immediate move (next turn) refers to a block for a win of the enemy player.
         """
         return self.obj.get_immediate_blocking_moves()
+
+
+cdef class TicTacToeBoardBatch:
+    """
+    Boards of N TicTacToe games with the same shape, which are updated together.
+
+    Thread safety: All methods over the N games run without the GIL. An instance should not be
+    changed by one thread, while other threads use it. Different instances can be used by different threads.
+    """
+    cdef TicTacToeBoardBatchC* obj
+    cdef Py_ssize_t shape[3]
+    cdef Py_ssize_t strides[3]
+
+    def __cinit__(self, boards, int tiles_to_win = 3, int your_symbol = 1, int enemy_symbol = -1, your_start = True):
+        # Contiguous int32 arrays are used without any conversion
+        cdef const int32_t[:, :, ::1] tiles = np.ascontiguousarray(boards, dtype=np.int32)
+
+        assert tiles.shape[0] >= 1, "#ERROR_BOARDPY: number of boards should be at least 1!"
+        assert tiles.shape[1] == tiles.shape[2], "#ERROR_BOARDPY: height and width should be the same!"
+        assert tiles.shape[1] >= 3, "#ERROR_BOARDPY: height and width should be at least 3!"
+        assert tiles_to_win >= 3, "#ERROR_BOARDPY: number of tiles to win should be at least 3!"
+        assert tiles_to_win <= tiles.shape[1], "#ERROR_BOARDPY: number of tiles cannot be longer than one dimension!"
+        assert your_symbol != 0 and enemy_symbol != 0, "#ERROR_BOARDPY: symbol of you and enemy cannot be 0!"
+        assert your_symbol != enemy_symbol, "#ERROR_BOARDPY: symbol of you and enemy cannot be the same!"
+
+        cdef const uint8_t[::1] starts = np.ascontiguousarray(np.broadcast_to(your_start, (tiles.shape[0],)), dtype=np.uint8)
+
+        with nogil:
+            self.obj = new TicTacToeBoardBatchC(&tiles[0, 0, 0], tiles.shape[0], tiles.shape[1], tiles.shape[2], tiles_to_win, your_symbol, enemy_symbol, &starts[0])
+        self.shape[0] = tiles.shape[0]
+        self.shape[1] = tiles.shape[1]
+        self.shape[2] = tiles.shape[2]
+        self.strides[0] = tiles.shape[1] * tiles.shape[2] * sizeof(int32_t)
+        self.strides[1] = tiles.shape[2] * sizeof(int32_t)
+        self.strides[2] = sizeof(int32_t)
+
+    def __dealloc__(self):
+        del self.obj
+
+    def __getbuffer__(self, Py_buffer* buffer, int flags):
+        # Exports the current board states as read-only (N, H, W) int32 buffer (e.g. for np.asarray(batch))
+        if flags & PyBUF_WRITABLE:
+            raise BufferError("#ERROR_BOARDPY: boards can only be exported as read-only buffer!")
+        buffer.buf = <void*> self.obj.get_current()
+        buffer.format = "i"
+        buffer.internal = NULL
+        buffer.itemsize = sizeof(int32_t)
+        buffer.len = self.shape[0] * self.shape[1] * self.shape[2] * sizeof(int32_t)
+        buffer.ndim = 3
+        buffer.obj = self
+        buffer.readonly = 1
+        buffer.shape = self.shape
+        buffer.strides = self.strides
+        buffer.suboffsets = NULL
+
+    def __releasebuffer__(self, Py_buffer* buffer):
+        pass
+
+    def __len__(self) -> int:
+        return self.obj.num_games()
+
+    @property
+    def size(self) -> int:
+        return self.obj.num_games()
+
+    @property
+    def row(self) -> int:
+        return self.obj.row()
+
+    @property
+    def col(self) -> int:
+        return self.obj.col()
+
+    def get_current(self) -> np.ndarray:
+        """
+        Returns the current board states.
+
+        Returns:
+            np.ndarray: current board states of shape (N, H, W)
+        """
+        return np.array(self, dtype=np.int32)
+
+    def get_current_player(self) -> np.ndarray:
+        """
+        Returns the current player of each game.
+
+        Returns:
+            np.ndarray: True if your player is the current player otherwise False of shape (N,)
+        """
+        current_players = np.empty(self.shape[0], dtype=np.uint8)
+        cdef uint8_t[::1] buffer = current_players
+        with nogil:
+            self.obj.get_current_player(&buffer[0])
+        return current_players.view(bool)
+
+    def set(self, actions):
+        """
+        Sets a tile on each board according to the given actions.
+
+        Args:
+            actions (np.ndarray): Encodings of the positions (n*row + col) of shape (N,), where a negative action skips the game
+        """
+        cdef const int32_t[::1] buffer = np.ascontiguousarray(actions, dtype=np.int32)
+        assert buffer.shape[0] == self.shape[0], "#ERROR_BOARDPY: number of actions should be the same as the number of boards!"
+        cdef bint valid
+        with nogil:
+            valid = self.obj.set(&buffer[0])
+        assert valid, "#ERROR_BOARDPY: action is invalid!"
+
+    def check_terminated(self) -> np.ndarray:
+        """
+        Returns True for each board in a terminated state.
+
+        Returns:
+            np.ndarray: True if the board is terminated state of shape (N,)
+        """
+        terminated = np.empty(self.shape[0], dtype=np.uint8)
+        cdef uint8_t[::1] buffer = terminated
+        with nogil:
+            self.obj.check_terminated(&buffer[0])
+        return terminated.view(bool)
+
+    def check_winner(self) -> np.ndarray:
+        """
+        Returns the winner of each board.
+
+        Returns:
+            np.ndarray: 0 - no winner, your_symbol - your player wins, enemy_symbol - enemy player wins of shape (N,)
+        """
+        winners = np.empty(self.shape[0], dtype=np.int32)
+        cdef int32_t[::1] buffer = winners
+        with nogil:
+            self.obj.check_winner(&buffer[0])
+        return winners
+
+    def get_reward(self) -> np.ndarray:
+        """
+        Returns a reward for each board of (...)
+            - +1.0 if you won
+            - -1.0 if enemy won
+            - 0.0 if nobody won
+
+        Returns:
+            np.ndarray: reward values of the current states of shape (N,)
+        """
+        rewards = np.empty(self.shape[0], dtype=np.float32)
+        cdef float[::1] buffer = rewards
+        with nogil:
+            self.obj.get_reward(&buffer[0])
+        return rewards
+
+    def legal_mask(self, out = None) -> np.ndarray:
+        """
+        Returns the mask of all possible actions of each board.
+
+        Args:
+            out (np.ndarray, optional): bool or uint8 array of shape (N, H*W), where the mask is written into
+
+        Returns:
+            np.ndarray: True if the action (n*row + col) is possible of shape (N, H*W)
+        """
+        if out is None:
+            out = np.empty((self.shape[0], self.shape[1] * self.shape[2]), dtype=bool)
+        cdef uint8_t[:, ::1] buffer = out.view(np.uint8)
+        assert buffer.shape[0] == self.shape[0] and buffer.shape[1] == self.shape[1] * self.shape[2], \
+            "#ERROR_BOARDPY: mask should have the shape (N, H*W)!"
+        with nogil:
+            self.obj.legal_mask(&buffer[0, 0])
+        return out
+
+    def get_action_mask(self, out = None) -> np.ndarray:
+        """
+        Returns the mask of all possible actions of each board (same as legal_mask()).
+
+        Args:
+            out (np.ndarray, optional): bool or uint8 array of shape (N, H*W), where the mask is written into
+
+        Returns:
+            np.ndarray: True if the action (n*row + col) is possible of shape (N, H*W)
+        """
+        return self.legal_mask(out)
+
+    def reset(self, mask = True, your_start = True):
+        """
+        Resets the selected boards to an empty board.
+
+        Args:
+            mask (np.ndarray): True if the board should be reset of shape (N,)
+            your_start (np.ndarray): True if your player starts the reset game of shape (N,)
+        """
+        cdef const uint8_t[::1] resets = np.ascontiguousarray(np.broadcast_to(mask, (self.shape[0],)), dtype=np.uint8)
+        cdef const uint8_t[::1] starts = np.ascontiguousarray(np.broadcast_to(your_start, (self.shape[0],)), dtype=np.uint8)
+        with nogil:
+            self.obj.reset(&resets[0], &starts[0])
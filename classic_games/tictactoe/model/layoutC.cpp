@@ -0,0 +1,197 @@
+#include "layoutC.h"
+#include <algorithm>
+#include <map>
+#include <memory>
+#include <mutex>
+#include <tuple>
+#include <utility>
+
+TicTacToeLayoutC::TicTacToeLayoutC(int rows, int cols, int tiles_to_win) {
+    this->rows = rows;
+    this->cols = cols;
+    this->tiles_to_win = tiles_to_win;
+    this->tiles = rows * cols;
+    this->bitboard = this->tiles <= BITBOARD_MAX_TILES;
+    this->full_mask = 0;
+    this->corner_mask = 0;
+    this->middle_mask = 0;
+
+    if (this->bitboard) {
+        for (int i = 0; i < rows; i++) {
+            for (int j = 0; j < cols; j++) {
+                uint64_t bit = uint64_t(1) << (i * cols + j);
+                this->full_mask |= bit;
+                if ((i == 0 || i == rows - 1) && (j == 0 || j == cols - 1)) {
+                    // Case: Tile is a corner
+                    this->corner_mask |= bit;
+                } else if (0 < i && i < rows - 1 && 0 < j && j < cols - 1) {
+                    // Case: Tile is in the middle
+                    this->middle_mask |= bit;
+                }
+            }
+        }
+    }
+
+    // Collect all lines of the board
+    for (int i = 0; i < rows; i++) {
+        for (int j = 0; j < cols; j++) {
+            if (j + tiles_to_win <= cols) {
+                // Case: Line in the row
+                this->add_line(i, j, 0, 1);
+            }
+            if (i + tiles_to_win <= rows) {
+                // Case: Line in the column
+                this->add_line(i, j, 1, 0);
+            }
+            if (i + tiles_to_win <= rows && j + tiles_to_win <= cols) {
+                // Case: Line in the diagonal
+                this->add_line(i, j, 1, 1);
+            }
+            if (i + tiles_to_win <= rows && j - tiles_to_win + 1 >= 0) {
+                // Case: Line in the anti-diagonal
+                this->add_line(i, j, 1, -1);
+            }
+        }
+    }
+
+    // Build the index of all lines that go through a tile
+    std::vector<int> counts(this->tiles, 0);
+    for (int tile : this->line_tiles) {
+        counts[tile]++;
+    }
+    this->tile_line_offsets.assign(this->tiles + 1, 0);
+    for (int tile = 0; tile < this->tiles; tile++) {
+        this->tile_line_offsets[tile + 1] = this->tile_line_offsets[tile] + counts[tile];
+    }
+    this->tile_lines.assign(this->line_tiles.size(), 0);
+    std::vector<int> positions(this->tile_line_offsets.begin(), this->tile_line_offsets.end() - 1);
+    for (int line = 0; line < this->num_lines(); line++) {
+        for (int i = 0; i < tiles_to_win; i++) {
+            int tile = this->line_tiles[line * tiles_to_win + i];
+            this->tile_lines[positions[tile]++] = line;
+        }
+    }
+
+    // Collect all symmetries of the board
+    this->num_symmetries = 0;
+    this->add_symmetry([&](int i, int j) { return std::make_pair(i, j); });
+    this->add_symmetry([&](int i, int j) { return std::make_pair(rows - 1 - i, cols - 1 - j); });
+    this->add_symmetry([&](int i, int j) { return std::make_pair(i, cols - 1 - j); });
+    this->add_symmetry([&](int i, int j) { return std::make_pair(rows - 1 - i, j); });
+    if (rows == cols) {
+        // Case: Rotations by 90 degrees and reflections at the diagonals are only possible on square boards
+        this->add_symmetry([&](int i, int j) { return std::make_pair(j, cols - 1 - i); });
+        this->add_symmetry([&](int i, int j) { return std::make_pair(rows - 1 - j, i); });
+        this->add_symmetry([&](int i, int j) { return std::make_pair(j, i); });
+        this->add_symmetry([&](int i, int j) { return std::make_pair(rows - 1 - j, cols - 1 - i); });
+    }
+
+    // Generate the keys for zobrist hashing (fixed seed, so that hashes are the same in each run)
+    uint64_t seed = 0x9e3779b97f4a7c15ULL ^ (uint64_t(rows) << 32) ^ (uint64_t(cols) << 16) ^ uint64_t(tiles_to_win);
+    this->zobrist_keys.resize(2 * this->tiles);
+    for (uint64_t& key : this->zobrist_keys) {
+        key = splitmix64(seed);
+    }
+    this->zobrist_enemy_turn = splitmix64(seed);
+}
+
+uint64_t TicTacToeLayoutC::splitmix64(uint64_t& state) {
+    uint64_t z = (state += 0x9e3779b97f4a7c15ULL);
+    z = (z ^ (z >> 30)) * 0xbf58476d1ce4e5b9ULL;
+    z = (z ^ (z >> 27)) * 0x94d049bb133111ebULL;
+    return z ^ (z >> 31);
+}
+
+template <typename Map>
+void TicTacToeLayoutC::add_symmetry(Map map) {
+    int offset = this->num_symmetries * this->tiles;
+    this->symmetries.resize(offset + this->tiles);
+    this->inverse_symmetries.resize(offset + this->tiles);
+    for (int i = 0; i < this->rows; i++) {
+        for (int j = 0; j < this->cols; j++) {
+            std::pair<int, int> position = map(i, j);
+            int tile = i * this->cols + j;
+            int transformed_tile = position.first * this->cols + position.second;
+            this->symmetries[offset + tile] = transformed_tile;
+            this->inverse_symmetries[offset + transformed_tile] = tile;
+        }
+    }
+    this->num_symmetries++;
+}
+
+void TicTacToeLayoutC::add_line(int row, int col, int d_row, int d_col) {
+    uint64_t mask = 0;
+    for (int i = 0; i < this->tiles_to_win; i++) {
+        int tile = (row + i * d_row) * this->cols + (col + i * d_col);
+        this->line_tiles.push_back(tile);
+        if (this->bitboard) {
+            mask |= uint64_t(1) << tile;
+        }
+    }
+    this->line_masks.push_back(mask);
+}
+
+int TicTacToeLayoutC::num_lines() const {
+    return static_cast<int>(this->line_masks.size());
+}
+
+int TicTacToeLayoutC::count_lines(const int32_t* board, int your_symbol, int enemy_symbol, uint8_t* line_counts) const {
+    std::fill(line_counts, line_counts + 2 * this->num_lines(), 0);
+    bool your_line = false;
+    bool enemy_line = false;
+    for (int tile = 0; tile < this->tiles; tile++) {
+        if (board[tile] == your_symbol) {
+            your_line |= this->add_tile(line_counts, tile, 0);
+        } else if (board[tile] == enemy_symbol) {
+            enemy_line |= this->add_tile(line_counts, tile, 1);
+        }
+    }
+
+    if (your_line) {
+        // Case: Your player won
+        return your_symbol;
+    } else if (enemy_line) {
+        // Case: Enemy player won
+        return enemy_symbol;
+    }
+    return 0;
+}
+
+bool TicTacToeLayoutC::add_tile(uint8_t* line_counts, int tile, int player) const {
+    bool win = false;
+    for (int i = this->tile_line_offsets[tile]; i < this->tile_line_offsets[tile + 1]; i++) {
+        uint8_t& count = line_counts[2 * this->tile_lines[i] + player];
+        count++;
+        if (count == this->tiles_to_win) {
+            win = true;
+        }
+    }
+    return win;
+}
+
+void TicTacToeLayoutC::remove_tile(uint8_t* line_counts, int tile, int player) const {
+    for (int i = this->tile_line_offsets[tile]; i < this->tile_line_offsets[tile + 1]; i++) {
+        line_counts[2 * this->tile_lines[i] + player]--;
+    }
+}
+
+int TicTacToeLayoutC::transform_tile(int tile, int symmetry) const {
+    return this->symmetries[symmetry * this->tiles + tile];
+}
+
+int TicTacToeLayoutC::inverse_transform_tile(int tile, int symmetry) const {
+    return this->inverse_symmetries[symmetry * this->tiles + tile];
+}
+
+const TicTacToeLayoutC* TicTacToeLayoutC::get(int rows, int cols, int tiles_to_win) {
+    static std::mutex mutex;
+    static std::map<std::tuple<int, int, int>, std::unique_ptr<TicTacToeLayoutC>> layouts;
+
+    std::lock_guard<std::mutex> lock(mutex);
+    std::unique_ptr<TicTacToeLayoutC>& layout = layouts[std::make_tuple(rows, cols, tiles_to_win)];
+    if (!layout) {
+        // Case: Layout is used the first time
+        layout.reset(new TicTacToeLayoutC(rows, cols, tiles_to_win));
+    }
+    return layout.get();
+}
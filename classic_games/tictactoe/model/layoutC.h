@@ -0,0 +1,183 @@
+#ifndef TICTACTOELAYOUT_H
+#define TICTACTOELAYOUT_H
+
+#include <cstdint>
+#include <vector>
+
+#if defined(_MSC_VER)
+#include <intrin.h>
+#endif
+
+/* maximal number of tiles, that can be represented by a single bitboard */
+#define BITBOARD_MAX_TILES 64
+
+/* maximal number of symmetries (rotations and reflections) of a board */
+#define MAX_SYMMETRIES 8
+
+/**
+ * @brief Returns the number of set bits of the given bitboard.
+ *
+ * @param mask bitboard
+ * @return int number of set bits
+ */
+inline int popcount(uint64_t mask) {
+#if defined(_MSC_VER)
+    return static_cast<int>(__popcnt64(mask));
+#else
+    return __builtin_popcountll(mask);
+#endif
+}
+
+/**
+ * @brief Returns the index of the lowest set bit of the given (non-empty) bitboard.
+ *
+ * @param mask bitboard (should not be 0)
+ * @return int index of the lowest set bit
+ */
+inline int lowest_bit(uint64_t mask) {
+#if defined(_MSC_VER)
+    unsigned long index;
+    _BitScanForward64(&index, mask);
+    return static_cast<int>(index);
+#else
+    return __builtin_ctzll(mask);
+#endif
+}
+
+/**
+ * @brief Precomputed tables for a (board_shape, tiles_to_win) pair.
+ *
+ * A line is a set of tiles_to_win consecutive tiles in a row, column, diagonal or anti-diagonal.
+ * A player wins the game, if he owns all tiles of a single line. Tiles are indexed with
+ * the action encoding (n*row + col).
+ */
+class TicTacToeLayoutC {
+    private:
+        /**
+         * @brief Construct a new TicTacToeLayoutC object. Use TicTacToeLayoutC::get() instead.
+         *
+         * @param rows number of rows of the board
+         * @param cols number of columns of the board
+         * @param tiles_to_win number of tiles to place in row, column, diagonal, anti-diagonal to win the game
+         */
+        TicTacToeLayoutC(int rows, int cols, int tiles_to_win);
+
+        /**
+         * @brief Adds the line which starts at (row, col) and goes in direction (d_row, d_col).
+         */
+        void add_line(int row, int col, int d_row, int d_col);
+
+        /**
+         * @brief Adds the symmetry which maps the tile (row, col) to (map(row, col)).
+         */
+        template <typename Map>
+        void add_symmetry(Map map);
+
+        /**
+         * @brief Returns the next pseudo-random number of the splitmix64 generator.
+         *
+         * @param state state of the generator (updated in-place)
+         * @return uint64_t pseudo-random number
+         */
+        static uint64_t splitmix64(uint64_t& state);
+
+    public:
+        /* number of rows of the board */
+        int rows;
+        /* number of columns of the board */
+        int cols;
+        /* number of places that one player needs to win the game */
+        int tiles_to_win;
+        /* number of tiles of the board (rows * cols) */
+        int tiles;
+        /* true if the board fits into a single bitboard */
+        bool bitboard;
+        /* bitboard with all tiles set */
+        uint64_t full_mask;
+        /* bitboard with all corner tiles set */
+        uint64_t corner_mask;
+        /* bitboard with all middle (non-border) tiles set */
+        uint64_t middle_mask;
+        /* tile indices of each line (tiles_to_win entries per line) */
+        std::vector<int> line_tiles;
+        /* bitboard of each line (only used in bitboard mode) */
+        std::vector<uint64_t> line_masks;
+        /* offsets into tile_lines for each tile (tiles + 1 entries) */
+        std::vector<int> tile_line_offsets;
+        /* indices of the lines that go through a tile */
+        std::vector<int> tile_lines;
+        /* number of symmetries (rotations and reflections) of the board (8 for square boards, otherwise 4) */
+        int num_symmetries;
+        /* tile after applying a symmetry (tiles entries per symmetry, the first symmetry is the identity) */
+        std::vector<int> symmetries;
+        /* tile before applying a symmetry (tiles entries per symmetry) */
+        std::vector<int> inverse_symmetries;
+        /* random keys of each tile and player for zobrist hashing (your key at 2*tile, enemy key at 2*tile+1) */
+        std::vector<uint64_t> zobrist_keys;
+        /* random key for zobrist hashing, if the enemy player makes the next turn */
+        uint64_t zobrist_enemy_turn;
+
+        /**
+         * @return int number of lines of the board
+         */
+        int num_lines() const;
+
+        /**
+         * @brief Sets up the counters of all lines from the given board.
+         *
+         * @param board contiguous (row-major) board with tiles entries
+         * @param your_symbol symbol of your player
+         * @param enemy_symbol symbol of enemy player
+         * @param line_counts number of tiles per line and player (2 * num_lines() entries)
+         * @return int symbol of the player, who owns all tiles of a line (your player first), otherwise 0
+         */
+        int count_lines(const int32_t* board, int your_symbol, int enemy_symbol, uint8_t* line_counts) const;
+
+        /**
+         * @brief Adds a tile of the given player to the counters of all lines that go through the tile.
+         *
+         * @param line_counts number of tiles per line and player (2 * num_lines() entries)
+         * @param tile index of the tile (n*row + col)
+         * @param player 0 for your player, 1 for enemy player
+         * @return true if the player owns all tiles of a line through the tile afterwards
+         */
+        bool add_tile(uint8_t* line_counts, int tile, int player) const;
+
+        /**
+         * @brief Removes a tile of the given player from the counters of all lines that go through the tile.
+         *
+         * @param line_counts number of tiles per line and player (2 * num_lines() entries)
+         * @param tile index of the tile (n*row + col)
+         * @param player 0 for your player, 1 for enemy player
+         */
+        void remove_tile(uint8_t* line_counts, int tile, int player) const;
+
+        /**
+         * @brief Maps a tile to its position after applying the given symmetry.
+         *
+         * @param tile index of the tile (n*row + col)
+         * @param symmetry index of the symmetry (0 <= symmetry < num_symmetries)
+         * @return int index of the transformed tile
+         */
+        int transform_tile(int tile, int symmetry) const;
+
+        /**
+         * @brief Maps a transformed tile back to its position before applying the given symmetry.
+         *
+         * @param tile index of the transformed tile (n*row + col)
+         * @param symmetry index of the symmetry (0 <= symmetry < num_symmetries)
+         * @return int index of the original tile
+         */
+        int inverse_transform_tile(int tile, int symmetry) const;
+
+        /**
+         * @brief Returns the (cached) layout for the given board shape and number of tiles to win.
+         *
+         * @param rows number of rows of the board
+         * @param cols number of columns of the board
+         * @param tiles_to_win number of tiles to place in row, column, diagonal, anti-diagonal to win the game
+         * @return const TicTacToeLayoutC* precomputed layout
+         */
+        static const TicTacToeLayoutC* get(int rows, int cols, int tiles_to_win);
+};
+#endif
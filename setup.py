@@ -13,8 +13,11 @@ sys.argv = [sys.argv[0]] + unknown
 std = args.std
 
 extensions = [
-    Extension("classic_games.tictactoe.model.board", sources=["classic_games/tictactoe/model/boardPy.pyx", "classic_games/tictactoe/model/boardC.cpp"], extra_compile_args=[f"/std:{std}"]),
-    Extension("classic_games.tictactoe.agent.min_max", sources=["classic_games/tictactoe/agent/min_maxPy.pyx", "classic_games/tictactoe/agent/min_maxC.cpp", "classic_games/tictactoe/model/boardC.cpp", "classic_games/util/hasher.cpp"], extra_compile_args=[f"/std:{std}"]),
+    Extension("classic_games.tictactoe.model.board", sources=["classic_games/tictactoe/model/boardPy.pyx", "classic_games/tictactoe/model/boardC.cpp", "classic_games/tictactoe/model/boardBatchC.cpp", "classic_games/tictactoe/model/layoutC.cpp"], extra_compile_args=[f"/std:{std}"]),
+    Extension("classic_games.tictactoe.agent.min_max", sources=["classic_games/tictactoe/agent/min_maxPy.pyx", "classic_games/tictactoe/agent/min_maxC.cpp", "classic_games/tictactoe/agent/opening_bookC.cpp", "classic_games/tictactoe/agent/transposition_tableC.cpp", "classic_games/tictactoe/model/boardC.cpp", "classic_games/tictactoe/model/layoutC.cpp"], extra_compile_args=[f"/std:{std}"]),
+    Extension("classic_games.tictactoe.agent.mcts", sources=["classic_games/tictactoe/agent/mctsPy.pyx", "classic_games/tictactoe/agent/mctsC.cpp", "classic_games/tictactoe/model/boardC.cpp", "classic_games/tictactoe/model/layoutC.cpp"], extra_compile_args=[f"/std:{std}"]),
+    Extension("classic_games.tictactoe.agent.threat_search", sources=["classic_games/tictactoe/agent/threat_searchPy.pyx", "classic_games/tictactoe/agent/threat_searchC.cpp", "classic_games/tictactoe/model/boardC.cpp", "classic_games/tictactoe/model/layoutC.cpp"], extra_compile_args=[f"/std:{std}"]),
+    Extension("classic_games.tictactoe.agent.proof_number", sources=["classic_games/tictactoe/agent/proof_numberPy.pyx", "classic_games/tictactoe/agent/proof_numberC.cpp", "classic_games/tictactoe/model/boardC.cpp", "classic_games/tictactoe/model/layoutC.cpp"], extra_compile_args=[f"/std:{std}"]),
 ]
 
 # Load the requirements from requirements.txt
@@ -0,0 +1,156 @@
+import time
+import unittest
+import numpy as np
+
+from classic_games.tictactoe.agent.mcts import MCTS
+
+
+class TestMCTS(unittest.TestCase):
+    """
+    Tests the (cython) class MCTS.
+    """
+
+    def setUp(self):
+        # Your player wins with action 7
+        self.board3x3 = np.array([
+            [-1, 1, -1],
+            [-1, 1, 0],
+            [0, 0, 1],
+        ])
+        # Your player has to block action 5
+        self.board3x3_2 = np.array([
+            [1, 0, 0],
+            [-1, -1, 0],
+            [0, 0, 0],
+        ])
+        # Terminated board
+        self.terminated_board3x3 = np.array([
+            [1, 1, 1],
+            [-1, -1, 0],
+            [0, 0, 0],
+        ])
+
+        self.mcts3x3 = MCTS(
+            your_symbol=1,
+            enemy_symbol=-1,
+            tiles_to_win=3,
+            iterations=2000,
+            seed=0,
+        )
+
+    def test_get_best_action(self):
+        """
+        Tests the method get_best_action().
+        """
+        self.assertEqual(7, self.mcts3x3.get_best_action(self.board3x3))
+        self.assertEqual(2000, self.mcts3x3.iterations)
+        self.assertEqual(5, self.mcts3x3.get_best_action(self.board3x3_2))
+        self.assertEqual(-1, self.mcts3x3.get_best_action(self.terminated_board3x3))
+        self.assertEqual(0, self.mcts3x3.iterations)
+
+        # Block the open three of the enemy player
+        board = np.zeros((5, 5), dtype=int)
+        board[4, 2:] = -1
+        board[0, 0] = board[1, 1] = 1
+        mcts = MCTS(your_symbol=1, enemy_symbol=-1, tiles_to_win=4, iterations=5000, seed=0)
+        self.assertEqual(21, mcts.get_best_action(board))
+
+    def test_get_best_action_with_seed(self):
+        """
+        Tests the method get_best_action() with the same seed (same search).
+        """
+        mcts1 = MCTS(your_symbol=1, enemy_symbol=-1, tiles_to_win=3, iterations=500, seed=42)
+        mcts2 = MCTS(your_symbol=1, enemy_symbol=-1, tiles_to_win=3, iterations=500, seed=42)
+        board = np.zeros((3, 3), dtype=int)
+        self.assertEqual(mcts1.get_best_action(board), mcts2.get_best_action(board))
+        self.assertEqual(mcts1.tree_size, mcts2.tree_size)
+
+    def test_get_best_action_with_time_budget(self):
+        """
+        Tests the method get_best_action() under a time budget.
+        """
+        mcts = MCTS(your_symbol=1, enemy_symbol=-1, tiles_to_win=4, iterations=None, seed=0)
+        start_time = time.time()
+        action = mcts.get_best_action(np.zeros((7, 7), dtype=np.int32), time_budget_ms=50)
+        end_time = time.time()
+        self.assertIn(action, range(49))
+        self.assertLessEqual(1, mcts.iterations)
+        self.assertLessEqual(end_time - start_time, 0.5)
+
+        # Iterations stop the search before the time budget is exceeded
+        self.assertEqual(7, self.mcts3x3.get_best_action(self.board3x3, time_budget_ms=10000))
+        self.assertEqual(2000, self.mcts3x3.iterations)
+
+        # Search without a limit needs a time budget
+        with self.assertRaises(AssertionError):
+            mcts.get_best_action(np.zeros((7, 7), dtype=np.int32))
+
+    def test_get_best_action_with_threads(self):
+        """
+        Tests the method get_best_action() with several threads (iterations are shared by all threads).
+        """
+        mcts = MCTS(your_symbol=1, enemy_symbol=-1, tiles_to_win=3, iterations=2000, num_threads=4, seed=0)
+        self.assertEqual(4, mcts.num_threads)
+        self.assertEqual(7, mcts.get_best_action(self.board3x3))
+        self.assertEqual(2000, mcts.iterations)
+        self.assertEqual(5, mcts.get_best_action(self.board3x3_2))
+        self.assertEqual(5, mcts.get_best_action(self.board3x3_2, time_budget_ms=1000))
+
+    def test_get_best_action_with_tree_reuse(self):
+        """
+        Tests the method get_best_action() with tree reuse between the moves.
+        """
+        board = np.zeros((3, 3), dtype=int)
+        action = self.mcts3x3.get_best_action(board)
+        self.assertEqual(2000, self.mcts3x3.root_visits)
+
+        # Next board is reached with your action and an enemy action (subtree is reused)
+        board.flat[action] = 1
+        board.flat[np.flatnonzero(board.ravel() == 0)[0]] = -1
+        self.mcts3x3.get_best_action(board)
+        self.assertEqual(2000, self.mcts3x3.iterations)
+        self.assertLess(2000, self.mcts3x3.root_visits)
+
+        # Unrelated board (new tree)
+        self.mcts3x3.get_best_action(self.board3x3_2)
+        self.assertEqual(2000, self.mcts3x3.root_visits)
+
+        # Without tree reuse
+        mcts = MCTS(your_symbol=1, enemy_symbol=-1, tiles_to_win=3, iterations=2000, reuse_tree=False, seed=0)
+        mcts.get_best_action(self.board3x3_2)
+        mcts.get_best_action(self.board3x3_2)
+        self.assertEqual(2000, mcts.root_visits)
+
+    def test_get_best_action_with_max_nodes(self):
+        """
+        Tests the method get_best_action() with a limited size of the tree.
+        """
+        mcts = MCTS(your_symbol=1, enemy_symbol=-1, tiles_to_win=3, iterations=2000, max_nodes=100, seed=0)
+        self.assertEqual(7, mcts.get_best_action(self.board3x3))
+        self.assertEqual(5, mcts.get_best_action(self.board3x3_2))
+        self.assertLessEqual(mcts.tree_size, 100)
+
+    def test_clear(self):
+        """
+        Tests the method clear().
+        """
+        self.mcts3x3.get_best_action(self.board3x3_2)
+        self.assertLess(0, self.mcts3x3.tree_size)
+        self.mcts3x3.clear()
+        self.assertEqual(0, self.mcts3x3.tree_size)
+        self.assertEqual(0, self.mcts3x3.root_visits)
+
+    def test_invalid_parameters(self):
+        """
+        Tests the constructor with invalid parameters.
+        """
+        with self.assertRaises(AssertionError):
+            MCTS(iterations=0)
+        with self.assertRaises(AssertionError):
+            MCTS(exploration=-1.0)
+        with self.assertRaises(AssertionError):
+            MCTS(num_threads=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
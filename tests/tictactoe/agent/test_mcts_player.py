@@ -0,0 +1,103 @@
+import unittest
+import numpy as np
+
+from classic_games.tictactoe.agent.mcts_player import MCTSPlayer
+
+
+class TestMCTSPlayer(unittest.TestCase):
+    """
+    Tests the class MCTSPlayer.
+    """
+
+    def setUp(self):
+        self.player = MCTSPlayer(
+            your_symbol=1,
+            enemy_symbol=-1,
+            tiles_to_win=3,
+            seed=0,
+            iterations=2000,
+        )
+
+        # Winning state board
+        self.board = np.array([
+            [-1, 1, -1],
+            [-1, 1, 0],
+            [0, 0, 1],
+        ])
+
+        # Blocking state board
+        self.board2 = np.array([
+            [1, 0, 0],
+            [-1, -1, 0],
+            [0, 0, 0],
+        ])
+
+    def test_init(self):
+        """
+        Tests the constructor without a limit of the iterations and a time budget.
+        """
+        with self.assertRaises(AssertionError):
+            MCTSPlayer(your_symbol=1, enemy_symbol=-1, tiles_to_win=3, iterations=None, time_budget_ms=None)
+
+    def test_name(self):
+        """
+        Tests the property name.
+        """
+        self.assertEqual("MCTS Player", self.player.name)
+
+    def test_start(self):
+        """
+        Tests the method start().
+        """
+        self.assertEqual(7, self.player.start(self.board))
+        self.assertEqual(5, self.player.start(self.board2))
+
+    def test_act(self):
+        """
+        Tests the method act().
+        """
+        self.assertEqual(7, self.player.act(self.board))  # should call start() first
+        self.assertEqual(5, self.player.act(self.board2))  # should now call act()
+
+    def test_act_with_time_budget(self):
+        """
+        Tests the method act() with a time budget per move.
+        """
+        player = MCTSPlayer(your_symbol=1, enemy_symbol=-1, tiles_to_win=3, seed=0, iterations=None, time_budget_ms=100)
+        self.assertEqual(7, player.act(self.board))
+        self.assertEqual(5, player.act(self.board2))
+
+    def test_reset(self):
+        """
+        Tests the method reset().
+        """
+        self.player.act(self.board)
+        self.player.reset(seed=0)
+        self.assertEqual(5, self.player.act(self.board2))
+
+    def test_act_with_threat_search(self):
+        """
+        Tests the method act() with the threat-space search as pre-check.
+        """
+        # Your player wins with a sequence of fours
+        board = np.zeros((9, 9), dtype=int)
+        board[[2, 2, 2, 4, 5, 3], [2, 3, 4, 4, 4, 6]] = 1
+        board[[2, 2, 6, 0, 8, 0], [1, 5, 4, 0, 8, 8]] = -1
+        player = MCTSPlayer(your_symbol=1, enemy_symbol=-1, tiles_to_win=5, seed=0, iterations=100, threat_search=True)
+        self.assertEqual(31, player.act(board))
+
+        # Your player blocks the open three of the enemy player
+        board = np.zeros((9, 9), dtype=int)
+        board[4, 3:6] = -1
+        board[[0, 8], [0, 8]] = 1
+        self.assertIn(player.act(board), [37, 38, 42, 43])
+
+    def test_end(self):
+        """
+        Tests the method end().
+        """
+        pass
+
+
+if __name__ == "__main__":
+    unittest.main()
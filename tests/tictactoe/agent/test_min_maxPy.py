@@ -1,5 +1,8 @@
+import os
+import tempfile
 import time
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 
 from classic_games.tictactoe.agent.min_max import MiniMax
@@ -56,6 +59,134 @@ class TestMiniMax(unittest.TestCase):
         self.assertEqual(0, self.minimax4x4.get_best_action(self.empty_board4x4))
         self.assertEqual(3, self.minimax4x4.get_best_action(self.board4x4))
 
+    def test_get_best_action_with_evaluation(self):
+        """
+        Tests the method get_best_action() with a maximal depth, where the states are evaluated by their features.
+        """
+        # Block the open three of the enemy player
+        board = np.zeros((5, 5), dtype=int)
+        board[4, 2:] = -1
+        board[0, 0] = board[1, 1] = 1
+        minimax = MiniMax(your_symbol=1, enemy_symbol=-1, tiles_to_win=4, max_depth=1)
+        self.assertEqual(21, minimax.get_best_action(board))
+
+        # Extend your own line
+        board = np.zeros((5, 5), dtype=int)
+        board[2, 1:3] = 1
+        board[0, 0] = -1
+        self.assertEqual(13, minimax.get_best_action(board))
+
+    def test_get_best_action_with_stats(self):
+        """
+        Tests the method get_best_action() with the statistics of the search.
+        """
+        action, stats = self.minimax3x3.get_best_action(self.empty_board3x3, return_stats=True)
+        self.assertEqual(0, action)
+        self.assertEqual(0, stats.action)
+        self.assertEqual(0.0, stats.value)
+        self.assertEqual(self.minimax3x3.nodes, stats.nodes)
+        self.assertLess(0, stats.cutoffs)
+        self.assertLess(0, stats.cache_hits)
+        self.assertEqual(9, stats.max_depth)
+        self.assertEqual(9, stats.completed_depth)
+        self.assertLessEqual(0.0, stats.elapsed_ms)
+        self.assertEqual(9, len(stats.pv))
+        self.assertEqual(0, stats.pv[0])
+        self.assertEqual(9, len(set(stats.pv)))
+
+        # Your player wins with the next action (value 2 * 9 - 1)
+        action, stats = self.minimax3x3.get_best_action(self.board3x3, return_stats=True)
+        self.assertEqual(7, action)
+        self.assertEqual(17.0, stats.value)
+        self.assertEqual([7], stats.pv)
+
+        # Depth-limited search
+        action, stats = self.minimax4x4.get_best_action(self.board4x4, time_budget_ms=10000, return_stats=True)
+        self.assertEqual(3, action)
+        self.assertEqual(8, stats.completed_depth)
+        self.assertLessEqual(len(stats.pv), 8)
+        self.assertEqual(3, stats.pv[0])
+
+        # Without statistics only the action is returned
+        self.assertEqual(7, self.minimax3x3.get_best_action(self.board3x3))
+
+    def test_get_best_actions(self):
+        """
+        Tests the method get_best_actions() (same actions as get_best_action() for each board).
+        """
+        boards = np.array([self.empty_board3x3, self.board3x3, np.array([[1, 1, 1], [-1, -1, 0], [0, 0, 0]])])
+        actions = self.minimax3x3.get_best_actions(boards)
+        self.assertEqual((3,), actions.shape)
+        np.testing.assert_array_equal([0, 7, -1], actions)
+
+        # Several workers share the cache
+        boards = np.array([self.empty_board4x4, self.board4x4] * 4)
+        minimax4x4 = MiniMax(your_symbol=1, enemy_symbol=-1, tiles_to_win=4, max_depth=8, num_threads=4)
+        np.testing.assert_array_equal([0, 3] * 4, minimax4x4.get_best_actions(boards))
+        np.testing.assert_array_equal([0, 3] * 4, minimax4x4.get_best_actions(boards, num_workers=2))
+        np.testing.assert_array_equal([0, 3] * 4, minimax4x4.get_best_actions(boards, time_budget_ms=1000))
+        self.assertLess(0, minimax4x4.get_cache_stats()["size"])
+
+        # No boards
+        self.assertEqual((0,), self.minimax3x3.get_best_actions(np.zeros((0, 3, 3))).shape)
+        with self.assertRaises(AssertionError):
+            self.minimax3x3.get_best_actions(boards, num_workers=0)
+
+    def test_get_action_values(self):
+        """
+        Tests the method get_action_values().
+        """
+        # All actions lead to a draw
+        values = self.minimax3x3.get_action_values(self.empty_board3x3)
+        self.assertEqual((9,), values.shape)
+        np.testing.assert_array_equal(np.zeros(9), values)
+
+        # Action 7 wins immediately, action 6 draws and action 5 loses after the next enemy action
+        values = self.minimax3x3.get_action_values(self.board3x3)
+        self.assertTrue(np.all(np.isnan(values[[0, 1, 2, 3, 4, 8]])))
+        self.assertEqual(17.0, values[7])
+        self.assertEqual(0.0, values[6])
+        self.assertEqual(-16.0, values[5])
+        self.assertEqual(int(np.nanargmax(values)), self.minimax3x3.get_best_action(self.board3x3))
+
+        # Same values with several threads and with a time budget
+        minimax3x3 = MiniMax(your_symbol=1, enemy_symbol=-1, tiles_to_win=3, num_threads=4)
+        np.testing.assert_array_equal(values, minimax3x3.get_action_values(self.board3x3))
+        np.testing.assert_array_equal(values, minimax3x3.get_action_values(self.board3x3, time_budget_ms=10000))
+
+        # Values of each successor state match a search from the successor
+        minimax = MiniMax(your_symbol=-1, enemy_symbol=1, tiles_to_win=3)
+        # (action 7 ends the game, other values are one ply later from the root)
+        for action in [5, 6]:
+            board = self.board3x3.copy().ravel()
+            board[action] = 1
+            _, stats = minimax.get_best_action(board.reshape(3, 3), return_stats=True)
+            self.assertEqual(-stats.value + np.sign(stats.value), values[action])
+
+        # Terminated board has no actions
+        values = self.minimax3x3.get_action_values(np.array([[1, 1, 1], [-1, -1, 0], [0, 0, 0]]))
+        self.assertTrue(np.all(np.isnan(values)))
+
+    def test_get_best_action_with_time_budget(self):
+        """
+        Tests the method get_best_action() with iterative deepening under a time budget.
+        """
+        # Enough time to complete all depths
+        self.assertEqual(0, self.minimax3x3.get_best_action(self.empty_board3x3, time_budget_ms=10000))
+        self.assertEqual(9, self.minimax3x3.completed_depth)
+        self.assertEqual(3, self.minimax4x4.get_best_action(self.board4x4, time_budget_ms=10000))
+        self.assertEqual(8, self.minimax4x4.completed_depth)
+
+        # Not enough time to complete all depths
+        minimax = MiniMax(your_symbol=1, enemy_symbol=-1, tiles_to_win=4)
+        start_time = time.time()
+        action = minimax.get_best_action(np.zeros((5, 5), dtype=np.int32), time_budget_ms=50)
+        end_time = time.time()
+        self.assertIn(action, range(25))
+        self.assertLessEqual(1, minimax.completed_depth)
+        self.assertLess(minimax.completed_depth, 25)
+        self.assertLessEqual(end_time - start_time, 0.5)
+
     def test_get_best_action_with_cache(self):
         """
         Tests the method get_best_action() by using the cache for already evaluated states.
@@ -68,6 +199,162 @@ class TestMiniMax(unittest.TestCase):
         self.assertEqual(action1, action2)
         self.assertLessEqual(end_time - start_time, 0.1)  # check if second call took less than 0.1 seconds of time
 
+    def test_get_best_action_with_transpositions(self):
+        """
+        Tests the method get_best_action() by reusing the transposition table of previous searches.
+        """
+        board = self.empty_board3x3.copy().flatten()
+        for action, symbol in [(4, -1), (0, 1), (8, -1)]:
+            board[action] = symbol
+            state = board.reshape(3, 3)
+            fresh_minimax3x3 = MiniMax(your_symbol=1, enemy_symbol=-1, tiles_to_win=3)
+            self.assertEqual(fresh_minimax3x3.get_best_action(state), self.minimax3x3.get_best_action(state))
+
+    def test_get_best_action_with_move_ordering(self):
+        """
+        Tests the method get_best_action() with and without move ordering.
+        """
+        board4x4 = np.array([
+            [0, 0, 0, 0],
+            [0, -1, 0, 0],
+            [0, 0, 1, 0],
+            [0, 0, 0, 0],
+        ])
+        minimax = MiniMax(your_symbol=1, enemy_symbol=-1, tiles_to_win=3, move_ordering=True)
+        unordered_minimax = MiniMax(your_symbol=1, enemy_symbol=-1, tiles_to_win=3, move_ordering=False)
+
+        # Same actions, but less visited states
+        self.assertEqual(unordered_minimax.get_best_action(board4x4), minimax.get_best_action(board4x4))
+        self.assertLess(minimax.nodes, unordered_minimax.nodes)
+        self.assertLess(0, minimax.nodes)
+
+    def test_get_best_action_with_threads(self):
+        """
+        Tests the method get_best_action() with several threads (same actions as with a single thread).
+        """
+        minimax3x3 = MiniMax(your_symbol=1, enemy_symbol=-1, tiles_to_win=3, num_threads=4)
+        self.assertEqual(4, minimax3x3.num_threads)
+        self.assertEqual(0, minimax3x3.get_best_action(self.empty_board3x3))
+        self.assertEqual(7, minimax3x3.get_best_action(self.board3x3))
+
+        minimax4x4 = MiniMax(your_symbol=1, enemy_symbol=-1, tiles_to_win=4, max_depth=8, num_threads=4)
+        self.assertEqual(0, minimax4x4.get_best_action(self.empty_board4x4))
+        self.assertEqual(3, minimax4x4.get_best_action(self.board4x4))
+        self.assertEqual(3, minimax4x4.get_best_action(self.board4x4, time_budget_ms=1000))
+
+    def test_clone(self):
+        """
+        Tests the method clone() by searching with several clones (and the same instance) at the same time.
+        """
+        clone = self.minimax4x4.clone()
+        self.assertEqual(3, clone.get_best_action(self.board4x4))
+        # Clone shares the cache with the original instance
+        self.assertEqual(clone.get_cache_stats(), self.minimax4x4.get_cache_stats())
+
+        boards = [self.board4x4, self.empty_board4x4] * 4
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            cloned_actions = list(executor.map(lambda board: self.minimax4x4.clone().get_best_action(board), boards))
+            shared_actions = list(executor.map(self.minimax4x4.get_best_action, boards))
+        self.assertEqual([3, 0] * 4, cloned_actions)
+        self.assertEqual([3, 0] * 4, shared_actions)
+
+    def test_book(self):
+        """
+        Tests the methods save_book(), load_book() and close_book().
+        """
+        self.assertEqual(3, self.minimax4x4.get_best_action(self.board4x4))
+        nodes = self.minimax4x4.nodes
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "minimax.book")
+            size = self.minimax4x4.save_book(path)
+            self.assertEqual(self.minimax4x4.get_cache_stats()["size"], size)
+
+            # New instance finds the solved states in the book
+            minimax = MiniMax(your_symbol=1, enemy_symbol=-1, tiles_to_win=4, max_depth=8)
+            minimax.load_book(path)
+            self.assertEqual(3, minimax.get_best_action(self.board4x4))
+            self.assertLess(minimax.nodes, nodes)
+            self.assertEqual(size, minimax.get_book_stats()["size"])
+            self.assertLess(0, minimax.get_book_stats()["hits"])
+
+            minimax.close_book()
+            self.assertEqual({"size": 0, "hits": 0}, minimax.get_book_stats())
+
+            # Book of another number of tiles to win
+            with self.assertRaises(AssertionError):
+                self.minimax3x3.load_book(path)
+
+    def test_shared_cache(self):
+        """
+        Tests the method create_shared_cache() with two instances on the same shared memory.
+        """
+        memory = MiniMax.create_shared_cache(cache_size=2**10)
+        try:
+            minimax1 = MiniMax(your_symbol=1, enemy_symbol=-1, tiles_to_win=3, shared_cache=memory.name)
+            minimax2 = MiniMax(your_symbol=1, enemy_symbol=-1, tiles_to_win=3, shared_cache=memory.name)
+            self.assertEqual(2**10, minimax1.get_cache_stats()["capacity"])
+
+            self.assertEqual(0, minimax1.get_best_action(self.empty_board3x3))
+            self.assertEqual(minimax1.get_cache_stats()["size"], minimax2.get_cache_stats()["size"])
+
+            # Second instance uses the entries of the first instance
+            self.assertEqual(0, minimax2.get_best_action(self.empty_board3x3))
+            self.assertLess(minimax2.nodes, minimax1.nodes)
+            self.assertEqual(0, minimax2.get_cache_stats()["misses"])
+            del minimax1, minimax2
+        finally:
+            memory.close()
+            memory.unlink()
+
+    def test_get_cache_stats(self):
+        """
+        Tests the methods get_cache_stats() and clear_cache().
+        """
+        self.minimax3x3.get_best_action(self.empty_board3x3)
+        stats = self.minimax3x3.get_cache_stats()
+        self.assertLess(0, stats["size"])
+        self.assertLess(0, stats["misses"])
+        self.assertEqual(2**16, stats["capacity"])
+        self.assertLessEqual(stats["size"], stats["capacity"])
+        self.assertLessEqual(stats["capacity"] * 16, stats["bytes"])
+
+        # Second search only uses the entries of the first search
+        self.minimax3x3.get_best_action(self.empty_board3x3)
+        self.assertLess(stats["hits"], self.minimax3x3.get_cache_stats()["hits"])
+        self.assertEqual(stats["misses"], self.minimax3x3.get_cache_stats()["misses"])
+
+        # Small cache replaces old entries
+        minimax = MiniMax(your_symbol=1, enemy_symbol=-1, tiles_to_win=3, cache_size=8)
+        self.assertEqual(0, minimax.get_best_action(self.empty_board3x3))
+        stats = minimax.get_cache_stats()
+        self.assertEqual(8, stats["capacity"])
+        self.assertLessEqual(stats["size"], stats["capacity"])
+        self.assertLess(0, stats["evictions"])
+
+        minimax.clear_cache()
+        self.assertEqual(
+            {"size": 0, "capacity": 8, "hits": 0, "misses": 0, "evictions": 0, "bytes": stats["bytes"]},
+            minimax.get_cache_stats()
+        )
+
+    def test_get_best_action_with_symmetries(self):
+        """
+        Tests the method get_best_action() by using the cache for rotated and reflected states.
+        """
+        action = self.minimax4x4.get_best_action(self.board4x4)
+        self.assertEqual(3, action)
+
+        # Same tile on the rotated board
+        rotated_board4x4 = np.rot90(self.board4x4)
+        action_board4x4 = np.zeros(16, dtype=int)
+        action_board4x4[action] = 1
+        rotated_action = int(np.flatnonzero(np.rot90(action_board4x4.reshape(4, 4)))[0])
+
+        start_time = time.time()
+        self.assertEqual(rotated_action, self.minimax4x4.get_best_action(rotated_board4x4))
+        end_time = time.time()
+        self.assertLessEqual(end_time - start_time, 0.1)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -68,6 +68,32 @@ class TestMinMaxPlayer(unittest.TestCase):
         self.assertEqual(5, action2)
         self.assertEqual(7, action3)
 
+    def test_act_with_time_budget(self):
+        """
+        Tests the method act() with a time budget per move.
+        """
+        player = MinMaxPlayer(your_symbol=1, enemy_symbol=-1, tiles_to_win=3, time_budget_ms=1000)
+        self.assertEqual(4, player.act(self.board))
+        self.assertEqual(5, player.act(self.board2))
+        self.assertEqual(7, player.act(self.board3))
+
+    def test_act_with_threat_search(self):
+        """
+        Tests the method act() with the threat-space search as pre-check.
+        """
+        # Your player wins with a sequence of fours
+        board = np.zeros((9, 9), dtype=int)
+        board[[2, 2, 2, 4, 5, 3], [2, 3, 4, 4, 4, 6]] = 1
+        board[[2, 2, 6, 0, 8, 0], [1, 5, 4, 0, 8, 8]] = -1
+        player = MinMaxPlayer(your_symbol=1, enemy_symbol=-1, tiles_to_win=5, max_depth=1, threat_search=True)
+        self.assertEqual(31, player.act(board))
+
+        # Your player blocks the open three of the enemy player
+        board = np.zeros((9, 9), dtype=int)
+        board[4, 3:6] = -1
+        board[[0, 8], [0, 8]] = 1
+        self.assertIn(player.act(board), [37, 38, 42, 43])
+
     def test_end(self):
         """
         Tests the method end().
@@ -0,0 +1,148 @@
+import threading
+import unittest
+import numpy as np
+
+from classic_games.tictactoe.agent.proof_number import ProofNumberSolver
+
+
+class TestProofNumberSolver(unittest.TestCase):
+    """
+    Tests the (cython) class ProofNumberSolver.
+    """
+
+    def setUp(self):
+        # Your player wins with action 7
+        self.board_win = np.array([
+            [-1, 1, -1],
+            [-1, 1, 0],
+            [0, 0, 1],
+        ])
+
+        # Enemy player has two threats (your player loses)
+        self.board_loss = np.array([
+            [-1, -1, 0],
+            [-1, 1, 1],
+            [0, 0, 0],
+        ])
+
+        # Enemy player has already won
+        self.board_terminated = np.array([
+            [-1, -1, -1],
+            [1, 1, 0],
+            [0, 0, 0],
+        ])
+
+        self.solver3x3 = ProofNumberSolver(your_symbol=1, enemy_symbol=-1, tiles_to_win=3, memory_limit_mb=1)
+        self.solver4x4 = ProofNumberSolver(your_symbol=1, enemy_symbol=-1, tiles_to_win=4, memory_limit_mb=16)
+
+    def test_init(self):
+        """
+        Tests the constructor with invalid parameters.
+        """
+        with self.assertRaises(AssertionError):
+            ProofNumberSolver(memory_limit_mb=0)
+        with self.assertRaises(AssertionError):
+            ProofNumberSolver(memory_limit_mb=-1)
+
+    def test_solve(self):
+        """
+        Tests the method solve().
+        """
+        result, stats = self.solver3x3.solve(np.zeros((3, 3), dtype=int), return_stats=True)
+        self.assertEqual(0, result)
+        self.assertEqual(4, stats.action)
+        self.assertLess(0, stats.nodes)
+        self.assertLess(0, stats.cache_size)
+        self.assertEqual(1, stats.phase)
+
+        result, stats = self.solver3x3.solve(self.board_win, return_stats=True)
+        self.assertEqual(1, result)
+        self.assertEqual(7, stats.action)
+        self.assertEqual(0, stats.proof_number)
+
+        self.assertEqual(-1, self.solver3x3.solve(self.board_loss))
+        self.assertEqual(-1, self.solver3x3.solve(self.board_terminated))
+
+        # First player wins on a 4x4 board with three tiles in a row
+        solver = ProofNumberSolver(your_symbol=1, enemy_symbol=-1, tiles_to_win=3, memory_limit_mb=1)
+        self.assertEqual(1, solver.solve(np.zeros((4, 4), dtype=int)))
+
+        # Enemy player can always block four tiles in a row on a 4x4 board
+        self.assertEqual(0, self.solver4x4.solve(np.zeros((4, 4), dtype=int)))
+
+    def test_solve_with_limits(self):
+        """
+        Tests the method solve() with a time budget and maximal number of states.
+        """
+        board = np.zeros((4, 4), dtype=int)
+        result, stats = self.solver4x4.solve(board, max_nodes=100, return_stats=True)
+        self.assertIsNone(result)
+        self.assertEqual(-1, stats.action)
+        self.assertEqual(100, stats.nodes)
+
+        # Search continues with the proof numbers of the transposition table
+        self.assertEqual(0, self.solver4x4.solve(board, time_budget_ms=60000))
+
+        self.solver4x4.clear()
+        self.assertIsNone(self.solver4x4.solve(board, time_budget_ms=0))
+
+        with self.assertRaises(AssertionError):
+            self.solver4x4.solve(board, time_budget_ms=-1)
+        with self.assertRaises(AssertionError):
+            self.solver4x4.solve(board, max_nodes=0)
+        with self.assertRaises(AssertionError):
+            self.solver4x4.solve(board, callback=lambda stats: None, progress_interval=0)
+
+    def test_solve_with_callback(self):
+        """
+        Tests the method solve() with a callback.
+        """
+        board = np.zeros((4, 4), dtype=int)
+        progress = []
+        result = self.solver4x4.solve(board, callback=progress.append, progress_interval=1000)
+        self.assertEqual(0, result)
+        self.assertLess(1, len(progress))
+        self.assertTrue(all(stats.result is None for stats in progress))
+        self.assertTrue(all(a.nodes < b.nodes for a, b in zip(progress, progress[1:])))
+
+        # Callback stops the search
+        self.solver4x4.clear()
+        progress = []
+        result, stats = self.solver4x4.solve(board, callback=lambda stats: progress.append(stats) or False, progress_interval=1000, return_stats=True)
+        self.assertIsNone(result)
+        self.assertEqual(1, len(progress))
+        self.assertEqual(1000, stats.nodes)
+
+    def test_progress(self):
+        """
+        Tests the property progress during a search in another thread.
+        """
+        board = np.zeros((4, 4), dtype=int)
+        thread = threading.Thread(target=self.solver4x4.solve, args=(board,))
+        thread.start()
+        progress = self.solver4x4.progress
+        thread.join()
+        self.assertLessEqual(0, progress.nodes)
+        self.assertLess(0, self.solver4x4.progress.nodes)
+        self.assertIn(self.solver4x4.progress.phase, [0, 1])
+
+    def test_cache(self):
+        """
+        Tests the properties cache_size, cache_capacity and the method clear().
+        """
+        self.assertEqual(0, self.solver3x3.cache_size)
+        self.assertLess(0, self.solver3x3.cache_capacity)
+
+        # Capacity is given by the memory limit (the table grows up to it)
+        self.assertEqual(2 * self.solver3x3.cache_capacity, ProofNumberSolver(memory_limit_mb=2).cache_capacity)
+
+        self.solver3x3.solve(np.zeros((3, 3), dtype=int))
+        self.assertLess(0, self.solver3x3.cache_size)
+        self.assertLessEqual(self.solver3x3.cache_size, self.solver3x3.cache_capacity)
+
+        self.solver3x3.clear()
+        self.assertEqual(0, self.solver3x3.cache_size)
+
+
+if __name__ == '__main__':
+    unittest.main()
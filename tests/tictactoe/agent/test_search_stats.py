@@ -0,0 +1,111 @@
+import unittest
+
+from classic_games.tictactoe.agent.search_stats import ProofNumberStats, SearchStats
+
+
+class TestSearchStats(unittest.TestCase):
+    """
+    Tests the class SearchStats.
+    """
+
+    def setUp(self):
+        self.empty_stats = SearchStats()
+        self.stats = SearchStats(
+            action=4,
+            value=1.5,
+            nodes=2000,
+            cutoffs=300,
+            cache_hits=100,
+            max_depth=6,
+            completed_depth=5,
+            elapsed_ms=4.0,
+            pv=[4, 0, 8],
+        )
+
+    def test_nodes_per_second(self):
+        """
+        Tests the property nodes_per_second.
+        """
+        self.assertEqual(0.0, self.empty_stats.nodes_per_second)
+        self.assertEqual(500000.0, self.stats.nodes_per_second)
+
+    def test_to_dict(self):
+        """
+        Tests the method to_dict().
+        """
+        empty_stats = self.empty_stats.to_dict()
+        stats = self.stats.to_dict()
+
+        self.assertEqual(-1, empty_stats["action"])
+        self.assertEqual(0, empty_stats["nodes"])
+        self.assertEqual([], empty_stats["pv"])
+        self.assertEqual(0.0, empty_stats["nodes_per_second"])
+
+        self.assertEqual(self.stats.action, stats["action"])
+        self.assertEqual(self.stats.value, stats["value"])
+        self.assertEqual(self.stats.nodes, stats["nodes"])
+        self.assertEqual(self.stats.cutoffs, stats["cutoffs"])
+        self.assertEqual(self.stats.cache_hits, stats["cache_hits"])
+        self.assertEqual(self.stats.max_depth, stats["max_depth"])
+        self.assertEqual(self.stats.completed_depth, stats["completed_depth"])
+        self.assertEqual(self.stats.elapsed_ms, stats["elapsed_ms"])
+        self.assertEqual(self.stats.pv, stats["pv"])
+        self.assertEqual(self.stats.nodes_per_second, stats["nodes_per_second"])
+
+
+class TestProofNumberStats(unittest.TestCase):
+    """
+    Tests the class ProofNumberStats.
+    """
+
+    def setUp(self):
+        self.empty_stats = ProofNumberStats()
+        self.stats = ProofNumberStats(
+            result=0,
+            action=4,
+            nodes=1000,
+            cache_hits=200,
+            cache_size=500,
+            evictions=10,
+            max_depth=8,
+            phase=1,
+            proof_number=1073741823,
+            disproof_number=0,
+            elapsed_ms=2.0,
+        )
+
+    def test_nodes_per_second(self):
+        """
+        Tests the property nodes_per_second.
+        """
+        self.assertEqual(0.0, self.empty_stats.nodes_per_second)
+        self.assertEqual(500000.0, self.stats.nodes_per_second)
+
+    def test_to_dict(self):
+        """
+        Tests the method to_dict().
+        """
+        empty_stats = self.empty_stats.to_dict()
+        stats = self.stats.to_dict()
+
+        self.assertIsNone(empty_stats["result"])
+        self.assertEqual(-1, empty_stats["action"])
+        self.assertEqual(0, empty_stats["nodes"])
+        self.assertEqual(0.0, empty_stats["nodes_per_second"])
+
+        self.assertEqual(self.stats.result, stats["result"])
+        self.assertEqual(self.stats.action, stats["action"])
+        self.assertEqual(self.stats.nodes, stats["nodes"])
+        self.assertEqual(self.stats.cache_hits, stats["cache_hits"])
+        self.assertEqual(self.stats.cache_size, stats["cache_size"])
+        self.assertEqual(self.stats.evictions, stats["evictions"])
+        self.assertEqual(self.stats.max_depth, stats["max_depth"])
+        self.assertEqual(self.stats.phase, stats["phase"])
+        self.assertEqual(self.stats.proof_number, stats["proof_number"])
+        self.assertEqual(self.stats.disproof_number, stats["disproof_number"])
+        self.assertEqual(self.stats.elapsed_ms, stats["elapsed_ms"])
+        self.assertEqual(self.stats.nodes_per_second, stats["nodes_per_second"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+import numpy as np
+
+from classic_games.tictactoe.agent.threat_search import ThreatSearch
+
+
+class TestThreatSearch(unittest.TestCase):
+    """
+    Tests the (cython) class ThreatSearch.
+    """
+
+    def setUp(self):
+        # Your player wins with action 25 (two open threes at once)
+        self.board7x7 = np.zeros((7, 7), dtype=int)
+        self.board7x7[3, 2:4] = 1
+        self.board7x7[4:6, 4] = 1
+        self.board7x7[[0, 0, 6, 6], [0, 6, 0, 6]] = -1
+
+        # Your player wins with action 31 (sequence of fours)
+        self.board9x9 = np.zeros((9, 9), dtype=int)
+        self.board9x9[[2, 2, 2, 4, 5, 3], [2, 3, 4, 4, 4, 6]] = 1
+        self.board9x9[[2, 2, 6, 0, 8, 0], [1, 5, 4, 0, 8, 8]] = -1
+
+        # Open three of the enemy player
+        self.board9x9_2 = np.zeros((9, 9), dtype=int)
+        self.board9x9_2[4, 3:6] = 1
+        self.board9x9_2[[0, 8], [0, 8]] = -1
+
+        self.threat_search7x7 = ThreatSearch(your_symbol=1, enemy_symbol=-1, tiles_to_win=4)
+        self.threat_search9x9 = ThreatSearch(your_symbol=1, enemy_symbol=-1, tiles_to_win=5)
+
+    def test_find_winning_action(self):
+        """
+        Tests the method find_winning_action().
+        """
+        self.assertEqual(25, self.threat_search7x7.find_winning_action(self.board7x7))
+        self.assertEqual(31, self.threat_search9x9.find_winning_action(self.board9x9))
+        self.assertEqual(38, self.threat_search9x9.find_winning_action(self.board9x9_2))
+        self.assertLess(0, self.threat_search9x9.nodes)
+
+        # No forced win with a single tile
+        board = np.zeros((9, 9), dtype=int)
+        board[4, 4] = 1
+        board[0, 0] = -1
+        self.assertEqual(-1, self.threat_search9x9.find_winning_action(board))
+
+    def test_find_defending_action(self):
+        """
+        Tests the method find_defending_action().
+        """
+        threat_search = ThreatSearch(your_symbol=-1, enemy_symbol=1, tiles_to_win=5)
+        action = threat_search.find_defending_action(self.board9x9_2)
+        self.assertIn(action, [37, 38, 42, 43])
+
+        # Enemy player has no forced win after the action
+        board = self.board9x9_2.copy()
+        board.flat[action] = -1
+        self.assertEqual(-1, self.threat_search9x9.find_winning_action(board))
+
+        # Enemy player has no forced win
+        self.assertEqual(-1, self.threat_search9x9.find_defending_action(self.board9x9))
+
+    def test_get_forced_action(self):
+        """
+        Tests the method get_forced_action().
+        """
+        self.assertEqual(31, self.threat_search9x9.get_forced_action(self.board9x9))
+        threat_search = ThreatSearch(your_symbol=-1, enemy_symbol=1, tiles_to_win=5)
+        self.assertIn(threat_search.get_forced_action(self.board9x9_2), [37, 38, 42, 43])
+        self.assertEqual(-1, self.threat_search9x9.get_forced_action(np.zeros((9, 9), dtype=int)))
+
+    def test_max_nodes(self):
+        """
+        Tests the search with a limited number of visited states.
+        """
+        threat_search = ThreatSearch(your_symbol=1, enemy_symbol=-1, tiles_to_win=5, max_nodes=1)
+        self.assertEqual(-1, threat_search.find_winning_action(self.board9x9))
+        self.assertLessEqual(threat_search.nodes, 2)
+
+    def test_invalid_parameters(self):
+        """
+        Tests the constructor with invalid parameters.
+        """
+        with self.assertRaises(AssertionError):
+            ThreatSearch(max_depth=0)
+        with self.assertRaises(AssertionError):
+            ThreatSearch(max_nodes=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -42,6 +42,15 @@ class TestTicTacToeV0(unittest.TestCase):
         self.assertEqual(1, info["your_symbol"])
         self.assertEqual(-1, info["enemy_symbol"])
 
+    def test_action_masks(self):
+        """
+        Tests the method action_masks().
+        """
+        observation, info = self.env.reset(seed=10)
+        action_masks = self.env.unwrapped.action_masks()
+
+        np.testing.assert_array_equal(observation.flatten() == 0, action_masks)
+
     def test_step(self):
         """
         Tests the method step().
@@ -1,7 +1,7 @@
 import unittest
 import numpy as np
 
-from classic_games.tictactoe.model.board import TicTacToeBoard
+from classic_games.tictactoe.model.board import TicTacToeBoard, TicTacToeBoardBatch
 
 
 class TestTicTacToeBoard(unittest.TestCase):
@@ -104,6 +104,26 @@ class TestTicTacToeBoard(unittest.TestCase):
         np.testing.assert_array_equal(np.array([[1, 1, -1, 1], [1, -1, 1, 1], [-1, 1, -1, -1], [1, -1, 1, -1]]),
                                       self.terminated_board4x4.get_current())
 
+    def test_buffer(self):
+        """
+        Tests the (read-only) buffer protocol of the board.
+        """
+        view = np.asarray(self.board3x3)
+        self.assertEqual(np.int32, view.dtype)
+        self.assertFalse(view.flags.writeable)
+        np.testing.assert_array_equal(np.array([[0, 1, 0], [1, -1, 1], [-1, 1, -1]]), view)
+
+        # Check if the view follows the changes of the board
+        self.board3x3.set(0)
+        np.testing.assert_array_equal(np.array([[-1, 1, 0], [1, -1, 1], [-1, 1, -1]]), view)
+
+        # Check if the board does not share the memory with the given array
+        board = np.zeros((3, 3), dtype=np.int32)
+        state = TicTacToeBoard(board)
+        state.set(4)
+        self.assertEqual(0, board[1, 1])
+        self.assertEqual(1, state.get_current()[1, 1])
+
     def test_get_successors(self):
         """
         Tests the method get_successors().
@@ -155,6 +175,61 @@ class TestTicTacToeBoard(unittest.TestCase):
         np.testing.assert_array_equal(np.array([[1, 1, 1, -1], [1, -1, 1, 0], [-1, -1, -1, 0], [1, 0, 0, 0]]),
                                       self.board4x4.get_history()[2])
 
+    def test_get_moves(self):
+        """
+        Tests the method get_moves().
+        """
+        self.assertEqual(0, len(self.board4x4.get_moves()))
+        self.board4x4.set(3)
+        self.board4x4.set(12)
+        self.board4x4.set(7)
+        np.testing.assert_array_equal(np.array([3, 12, 7]), self.board4x4.get_moves())
+        self.board4x4.pop()
+        np.testing.assert_array_equal(np.array([3, 12]), self.board4x4.get_moves())
+
+    def test_get_canonical(self):
+        """
+        Tests the methods get_canonical(), get_canonical_key(), transform_action() and inverse_transform_action().
+        """
+        canonical, symmetry = self.board3x3.get_canonical()
+        self.assertEqual(8, self.board3x3.num_symmetries)
+        for k in range(4):
+            for board in (np.rot90(self.board3x3.get_current(), k), np.fliplr(np.rot90(self.board3x3.get_current(), k))):
+                state = TicTacToeBoard(board=board, your_start=False)
+                other_canonical, other_symmetry = state.get_canonical()
+                np.testing.assert_array_equal(canonical, other_canonical)
+                self.assertEqual(self.board3x3.get_canonical_key()[0], state.get_canonical_key()[0])
+
+                # Actions on the canonical board are mapped back to the same tile
+                for action in state.get_actions():
+                    canonical_action = state.transform_action(action, other_symmetry)
+                    self.assertEqual(0, canonical.flatten()[canonical_action])
+                    self.assertEqual(action, state.inverse_transform_action(canonical_action, other_symmetry))
+
+    def test_hash_key(self):
+        """
+        Tests the property hash_key and the method get_canonical_hash_key().
+        """
+        hash_key = self.board4x4.hash_key
+
+        # Incremental hash is the same as the hash of a new board
+        self.board4x4.push(7)
+        state = TicTacToeBoard(board=self.board4x4.get_current(), tiles_to_win=4, your_start=True)
+        self.assertEqual(state.hash_key, self.board4x4.hash_key)
+        self.assertNotEqual(hash_key, self.board4x4.hash_key)
+        self.board4x4.pop()
+        self.assertEqual(hash_key, self.board4x4.hash_key)
+
+        # Player to move is part of the hash
+        state = TicTacToeBoard(board=self.board4x4.get_current(), tiles_to_win=4, your_start=True)
+        self.assertNotEqual(hash_key, state.hash_key)
+
+        # Equivalent boards have the same canonical hash
+        canonical_hash_key, _ = self.board3x3.get_canonical_hash_key()
+        for k in range(4):
+            state = TicTacToeBoard(board=np.fliplr(np.rot90(self.board3x3.get_current(), k)), your_start=False)
+            self.assertEqual(canonical_hash_key, state.get_canonical_hash_key()[0])
+
     def test_get_actions(self):
         """
         Tests the method get_actions().
@@ -168,6 +243,22 @@ class TestTicTacToeBoard(unittest.TestCase):
         self.assertEqual([3, 7, 11, 12, 13, 14, 15], actions4x4)
         self.assertEqual([], empty_actions4x4)
 
+    def test_get_action_mask(self):
+        """
+        Tests the method get_action_mask().
+        """
+        mask3x3 = self.board3x3.get_action_mask()
+        mask4x4 = self.board4x4.get_action_mask()
+        self.assertEqual(bool, mask3x3.dtype)
+        np.testing.assert_array_equal(np.flatnonzero(mask3x3), self.board3x3.get_actions())
+        np.testing.assert_array_equal(np.flatnonzero(mask4x4), self.board4x4.get_actions())
+        self.assertFalse(self.terminated_board3x3.get_action_mask().any())
+
+        # Write the mask into a preallocated array
+        out = np.ones(9, dtype=np.uint8)
+        self.assertIs(out, self.terminated_board3x3.get_action_mask(out))
+        np.testing.assert_array_equal(np.zeros(9), out)
+
     def test_get_current_player(self):
         """
         Tests the method get_current_player().
@@ -195,6 +286,42 @@ class TestTicTacToeBoard(unittest.TestCase):
         np.testing.assert_array_equal(np.array([[1, 1, 1, -1], [1, -1, 1, 0], [-1, -1, -1, 0], [0, 0, 0, 0]]),
                                       self.board4x4.get_current())
 
+    def test_push(self):
+        """
+        Tests the method push().
+        """
+        self.board3x3.push(0)
+        self.assertTrue(self.board3x3.get_current_player())
+        self.assertEqual(2, len(self.board3x3.get_history()))
+        np.testing.assert_array_equal(np.array([[-1, 1, 0], [1, -1, 1], [-1, 1, -1]]), self.board3x3.get_current())
+        self.assertTrue(self.board3x3.check_terminated())
+        self.assertEqual(-1, self.board3x3.check_winner())
+
+        # Occupied and out-of-range tiles
+        self.assertRaises(AssertionError, self.board4x4.push, 0)
+        self.assertRaises(AssertionError, self.board4x4.push, -1)
+        self.assertRaises(AssertionError, self.board4x4.push, 16)
+
+    def test_pop(self):
+        """
+        Tests the method pop().
+        """
+        self.board4x4.push(3)
+        self.board4x4.push(15)
+        self.board4x4.push(11)
+        self.assertEqual(-1, self.board4x4.check_winner())
+
+        self.assertEqual(11, self.board4x4.pop())
+        self.assertEqual(0, self.board4x4.check_winner())
+        self.assertFalse(self.board4x4.check_terminated())
+        self.assertFalse(self.board4x4.get_current_player())
+        self.assertEqual(15, self.board4x4.pop())
+        self.assertEqual(3, self.board4x4.pop())
+        self.assertEqual(1, len(self.board4x4.get_history()))
+        np.testing.assert_array_equal(np.array([[1, 1, 1, 0], [1, -1, 1, 0], [-1, -1, -1, 0], [0, 0, 0, 0]]),
+                                      self.board4x4.get_current())
+        self.assertRaises(AssertionError, self.board4x4.pop)
+
     def test_get_reward(self):
         """
         Tests the method get_reward().
@@ -246,6 +373,28 @@ class TestTicTacToeBoard(unittest.TestCase):
         self.assertEqual(3, self.board4x4.get_enemy_middle_tiles())
         self.assertEqual(2, self.terminated_board4x4.get_enemy_middle_tiles())
 
+    def test_get_open_lines(self):
+        """
+        Tests the methods get_your_open_lines() and get_enemy_open_lines().
+        """
+        self.assertEqual([0, 1, 0, 0], [self.board3x3.get_your_open_lines(count) for count in range(4)])
+        self.assertEqual([0, 0, 2, 0], [self.board3x3.get_enemy_open_lines(count) for count in range(4)])
+
+        # Open lines are updated with each move
+        self.board3x3.push(0)
+        self.assertEqual([0, 0, 0, 0], [self.board3x3.get_your_open_lines(count) for count in range(4)])
+        self.assertEqual([0, 0, 1, 1], [self.board3x3.get_enemy_open_lines(count) for count in range(4)])
+        self.assertEqual(1, self.board3x3.get_immediate_blocking_moves())
+        self.board3x3.pop()
+        self.assertEqual([0, 1, 0, 0], [self.board3x3.get_your_open_lines(count) for count in range(4)])
+        self.assertEqual([0, 0, 2, 0], [self.board3x3.get_enemy_open_lines(count) for count in range(4)])
+        self.assertEqual(2, self.board3x3.get_immediate_blocking_moves())
+
+        # Empty board
+        board = TicTacToeBoard(board=np.zeros((4, 4)), tiles_to_win=3)
+        self.assertEqual(24, board.get_your_open_lines(0))
+        self.assertEqual(24, board.get_enemy_open_lines(0))
+
     def test_get_immediate_winning_moves(self):
         """
         Tests the method get_immediate_winning_moves().
@@ -265,3 +414,118 @@ class TestTicTacToeBoard(unittest.TestCase):
 
         self.assertEqual(2, immediate_blocking_moves3x3)
         self.assertEqual(1, immediate_blocking_moves4x4)
+
+    def test_large_boards(self):
+        """
+        Tests the methods check_winner(), get_actions() and get_immediate_winning_moves() for boards with
+        (8x8) and without (9x9) bitboard representation.
+        """
+        for n in (8, 9):
+            board = np.zeros((n, n), dtype=np.int32)
+            board[n - 4, 3:7] = [0, -1, -1, -1]
+            board[n - 1, n - 1] = 1
+            board[n - 1, 0] = 1
+            state = TicTacToeBoard(board=board, tiles_to_win=4, your_start=True)
+            self.assertEqual(n * n - 5, len(state.get_actions()))
+            self.assertEqual(0, state.check_winner())
+            self.assertEqual(0, state.get_immediate_winning_moves())
+            self.assertEqual(2, state.get_immediate_blocking_moves())
+            self.assertEqual(2, state.get_your_corner_tiles())
+
+            state.set(n * n - 2)
+            state.set((n - 4) * n + 3)
+            self.assertEqual(n * n - 7, len(state.get_actions()))
+            self.assertTrue(state.check_terminated())
+            self.assertEqual(-1, state.check_winner())
+
+
+class TestTicTacToeBoardBatch(unittest.TestCase):
+    """
+    Tests the (cython) class TicTacToeBoardBatch.
+    """
+
+    def setUp(self):
+        # Non-terminated, terminated and empty board (3x3)
+        self.boards3x3 = np.array([
+            [
+                [0, 1, 0],
+                [1, -1, 1],
+                [-1, 1, -1]
+            ],
+            [
+                [1, 1, 1],
+                [1, -1, 1],
+                [-1, 1, -1]
+            ],
+            [
+                [0, 0, 0],
+                [0, 0, 0],
+                [0, 0, 0]
+            ],
+        ])
+        self.batch3x3 = TicTacToeBoardBatch(boards=self.boards3x3, your_start=[False, False, True])
+
+    def test_get_current(self):
+        """
+        Tests the method get_current() and the buffer protocol.
+        """
+        np.testing.assert_array_equal(self.boards3x3, self.batch3x3.get_current())
+        np.testing.assert_array_equal(self.boards3x3, np.asarray(self.batch3x3))
+        self.assertEqual(3, len(self.batch3x3))
+        self.assertEqual(3, self.batch3x3.row)
+        self.assertEqual(3, self.batch3x3.col)
+
+    def test_set(self):
+        """
+        Tests the method set().
+        """
+        self.batch3x3.set([2, -1, 4])
+        boards = self.batch3x3.get_current()
+
+        self.assertEqual(-1, boards[0, 0, 2])
+        np.testing.assert_array_equal(self.boards3x3[1], boards[1])
+        self.assertEqual(1, boards[2, 1, 1])
+        np.testing.assert_array_equal([True, False, False], self.batch3x3.get_current_player())
+
+        # Invalid actions does not change any board
+        with self.assertRaises(AssertionError):
+            self.batch3x3.set([0, -1, 4])
+        np.testing.assert_array_equal(boards, self.batch3x3.get_current())
+
+    def test_check_terminated(self):
+        """
+        Tests the methods check_terminated(), check_winner() and get_reward().
+        """
+        np.testing.assert_array_equal([False, True, False], self.batch3x3.check_terminated())
+        np.testing.assert_array_equal([0, 1, 0], self.batch3x3.check_winner())
+        np.testing.assert_array_equal([0.0, 1.0, 0.0], self.batch3x3.get_reward())
+
+        self.batch3x3.set([0, -1, -1])
+        np.testing.assert_array_equal([True, True, False], self.batch3x3.check_terminated())
+        np.testing.assert_array_equal([-1, 1, 0], self.batch3x3.check_winner())
+        np.testing.assert_array_equal([-1.0, 1.0, 0.0], self.batch3x3.get_reward())
+
+    def test_legal_mask(self):
+        """
+        Tests the method legal_mask().
+        """
+        mask = self.batch3x3.legal_mask()
+
+        self.assertEqual((3, 9), mask.shape)
+        np.testing.assert_array_equal(self.boards3x3.reshape(3, 9) == 0, mask)
+
+        # Write the mask into a preallocated array
+        out = np.zeros((3, 9), dtype=bool)
+        self.assertIs(out, self.batch3x3.get_action_mask(out))
+        np.testing.assert_array_equal(mask, out)
+
+    def test_reset(self):
+        """
+        Tests the method reset().
+        """
+        self.batch3x3.reset([False, True, False], your_start=False)
+
+        np.testing.assert_array_equal(self.boards3x3[0], self.batch3x3.get_current()[0])
+        np.testing.assert_array_equal(np.zeros((3, 3)), self.batch3x3.get_current()[1])
+        np.testing.assert_array_equal([False, False, False], self.batch3x3.check_terminated())
+        np.testing.assert_array_equal([False, False, True], self.batch3x3.get_current_player())